@@ -11,6 +11,11 @@ import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
 import plotly.graph_objects as go
 
+try:
+    from streamlit_autorefresh import st_autorefresh
+except ImportError:
+    st_autorefresh = None
+
 from UD_draft_model.app.draft import Draft, TeamSummary
 from UD_draft_model.app.get_credentials import Credentials, get_headers
 import UD_draft_model.scrapers.scrape_site.scrape_league_data as scrape_site
@@ -370,6 +375,14 @@ if __name__ == "__main__":
         if not draft_initialized or draft.df_final_players is None:
             raise Exception("Draft not initialized or players dataframe is None")
 
+        # Reruns at the event source's polling interval so the picks it
+        # queued are shown without sending a request on each rerun. Stops
+        # once the draft is complete and the source is cleared.
+        if draft.event_source is not None and st_autorefresh is not None:
+            st_autorefresh(
+                interval=int(draft.event_source.interval * 1000), key="draft_events"
+            )
+
         df = filter_avail_players([c1_0_0, c1_0_1, c1_0_2], draft)
         display_current_next_pick(draft.df_cur_pick, c1_0_3)
         c1.dataframe(df)
@@ -5,6 +5,7 @@ import numpy as np
 from UD_draft_model.app.save_session_state import SaveSessionState
 import UD_draft_model.data_processing.prepare_drafts as prepare_drafts
 import UD_draft_model.scrapers.scrape_site.scrape_league_data as scrape_site
+import UD_draft_model.scrapers.scrape_site.draft_events as draft_events
 from UD_draft_model.modeling.model_version import ModelVersion
 import UD_draft_model.data_processing.add_features as add_features
 
@@ -193,11 +194,19 @@ class Draft(SaveSessionState):
         self.initialize_session_state("df_board", None)
         self.initialize_session_state("df_cur_pick", None)
         self.initialize_session_state("df_final_players", None)
+        self.initialize_session_state("last_pick_number", 0)
+
+        # Delivers the picks of the live draft between reruns
+        self.initialize_session_state("event_source", None)
 
         if self.draft_params == draft_params:
             self.new_draft_selected = False
         else:
+            if self.event_source is not None:
+                self.event_source.stop()
+
             # Need to re-initialize these when a new draft is selected
+            self.event_source = None
             self.team_summary = None
             self.df_draft = None
             self.df_entries = None
@@ -205,6 +214,7 @@ class Draft(SaveSessionState):
             self.df_board = None
             self.df_cur_pick = None
             self.df_final_players = None
+            self.last_pick_number = 0
 
             self.new_draft_selected = True
 
@@ -212,6 +222,11 @@ class Draft(SaveSessionState):
         self.headers = headers
         self.model = model
 
+        # Shares one draft request between the entries and picks pulled on
+        # the same run. Not stored in session_state so every rerun gets
+        # fresh picks.
+        self.draft_detail = None
+
     @staticmethod
     def get_players(headers: dict, params: dict) -> pd.DataFrame:
         # These should be initialized upon opening the app
@@ -235,21 +250,64 @@ class Draft(SaveSessionState):
         return df_players
 
     @staticmethod
-    def get_draft_entries(headers: dict, params: dict) -> pd.DataFrame:
+    def get_draft_detail(headers: dict, params: dict) -> scrape_site.DraftsDetail:
         draft_id = [params["draft_id"]]
         draft_detail = scrape_site.DraftsDetail(draft_id, headers)
+
+        return draft_detail
+
+    @staticmethod
+    def get_draft_entries(
+        headers: dict, params: dict, draft_detail: scrape_site.DraftsDetail = None
+    ) -> pd.DataFrame:
+        if draft_detail is None:
+            draft_detail = Draft.get_draft_detail(headers, params)
+
         df_entries = draft_detail.create_df_draft_entries()
 
         return df_entries
 
     @staticmethod
-    def get_draft(headers: dict, params: dict) -> pd.DataFrame:
-        draft_id = [params["draft_id"]]
-        draft_detail = scrape_site.DraftsDetail(draft_id, headers)
+    def get_draft(
+        headers: dict, params: dict, draft_detail: scrape_site.DraftsDetail = None
+    ) -> pd.DataFrame:
+        if draft_detail is None:
+            draft_detail = Draft.get_draft_detail(headers, params)
+
         df_draft = draft_detail.create_df_drafts()
 
         return df_draft
 
+    @staticmethod
+    def get_new_picks(
+        headers: dict,
+        params: dict,
+        after_number: int,
+        draft_detail: scrape_site.DraftsDetail = None,
+    ) -> pd.DataFrame:
+        if draft_detail is None:
+            draft_detail = Draft.get_draft_detail(headers, params)
+
+        df_new_picks = draft_detail.create_df_new_picks(after_number)
+
+        return df_new_picks
+
+    @staticmethod
+    def get_event_picks(
+        headers: dict, params: dict, event_source: draft_events.DraftEventSource
+    ) -> pd.DataFrame:
+        """
+        Creates a df of the picks the event source has delivered since the
+        last call. No request is sent to the API.
+        """
+
+        picks = event_source.get_picks()
+        draft_detail = Draft.get_draft_detail(headers, params)
+
+        df_new_picks = draft_detail.create_df_picks(params["draft_id"], picks)
+
+        return df_new_picks
+
     @staticmethod
     def add_user_next_pick_number(
         df_board: pd.DataFrame, draft_entry_id: str
@@ -459,6 +517,46 @@ class Draft(SaveSessionState):
 
         return df
 
+    @staticmethod
+    def update_board_picks(
+        df_board: pd.DataFrame, df_new_picks: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Updates the draft board with only the selections made since the last
+        update. Rows are matched on the pick number rather than merging every
+        pick onto the board.
+
+        Parameters
+        ----------
+        df_board : pd.DataFrame
+            Draft board containing each pick number for every entry.
+        df_new_picks : pd.DataFrame
+            Draft selections made since the board was last updated.
+
+        Returns
+        -------
+        pd.DataFrame
+            Draft board that contains the player selection made at each pick.
+        """
+
+        merge_vars = ["draft_id", "draft_entry_id", "number"]
+        pick_vars = [var for var in df_new_picks.columns if var not in merge_vars]
+
+        columns = list(df_board.columns)
+        columns += [var for var in pick_vars if var not in columns]
+
+        df = df_board.set_index("number")
+        for var in pick_vars:
+            if var not in df.columns:
+                df[var] = pd.Series(None, index=df.index, dtype="object")
+
+        df_new = df_new_picks.set_index("number")[pick_vars]
+        df.loc[df_new.index, pick_vars] = df_new
+
+        df = df.reset_index()[columns]
+
+        return df
+
     @staticmethod
     def get_current_pick(df_board: pd.DataFrame) -> pd.DataFrame:
         """
@@ -671,28 +769,101 @@ class Draft(SaveSessionState):
 
         if self.df_board is None or self.new_draft_selected == True:
             self.df_players = self.get_players(self.headers, self.draft_params)
-            self.df_entries = self.get_draft_entries(self.headers, self.draft_params)
+
+            # Picks are pulled from the same response in update_draft_attrs
+            self.draft_detail = self.get_draft_detail(self.headers, self.draft_params)
+            self.df_entries = self.get_draft_entries(
+                self.headers, self.draft_params, self.draft_detail
+            )
             self.df_board = self.create_draft_board(self.df_entries, self.draft_params)
 
+            # The new board doesn't have any picks on it yet
+            self.df_draft = None
+            self.last_pick_number = 0
+
+            if self.event_source is not None:
+                self.event_source.stop()
+                self.event_source = None
+
+    def update_event_source(self) -> None:
+        """
+        Starts an event source after the last pick on the board so picks made
+        between reruns are queued rather than re-requested. The source is
+        stopped once the board is full.
+
+        Sources stop themselves once the app stops reading their picks (see
+        DraftEventSource.idle_timeout) so a closed session doesn't leave its
+        thread running.
+        """
+
+        if self.last_pick_number >= len(self.df_board):
+            if self.event_source is not None:
+                self.event_source.stop()
+                self.event_source = None
+            return
+
+        if self.event_source is None or not self.event_source.running:
+            # Makes sure the old source's thread exits before it's replaced
+            if self.event_source is not None:
+                self.event_source.stop()
+
+            self.event_source = draft_events.create_event_source(
+                self.draft_params["draft_id"],
+                self.headers,
+                after_number=self.last_pick_number,
+                num_picks=len(self.df_board),
+            ).start()
+
     def update_draft_attrs(self) -> None:
         """
-        Updates draft attrs.
+        Updates draft attrs with the picks made since the last update. Only
+        the new picks are parsed, appended to df_draft and placed on the board.
+
+        New picks are taken from the event source while it's running.
+        Otherwise, the draft is requested to catch up and the event source is
+        (re)started after the last pick.
         """
 
-        # get_draft throws an IndexError until the first pick is selected.
-        try:
-            self.df_draft = self.get_draft(self.headers, self.draft_params)
-            self.df_board = self.update_board(self.df_board, self.df_draft)
-
-            # This only gets updated once here to compare the current state's
-            # value to the newly updated board to determine if the model
-            # needs run again.
-            if self.df_cur_pick is None:
-                self.df_cur_pick = self.get_current_pick(self.df_board)
-            else:
-                pass
+        if self.event_source is not None and self.event_source.running:
+            df_new_picks = self.get_event_picks(
+                self.headers, self.draft_params, self.event_source
+            )
+        else:
+            df_new_picks = self.get_new_picks(
+                self.headers,
+                self.draft_params,
+                self.last_pick_number,
+                self.draft_detail,
+            )
+
+        # Only picks after the board's last pick are placed on it
+        if len(df_new_picks) > 0:
+            df_new_picks = df_new_picks.loc[
+                df_new_picks["number"] > self.last_pick_number
+            ]
+
+        self._add_new_picks(df_new_picks)
+        self.update_event_source()
+
+    def _add_new_picks(self, df_new_picks: pd.DataFrame) -> None:
+        # No picks have been made since the last update.
+        if len(df_new_picks) == 0:
+            return
 
-        except IndexError:
+        if self.df_draft is None:
+            self.df_draft = df_new_picks
+        else:
+            self.df_draft = pd.concat([self.df_draft, df_new_picks])
+
+        self.df_board = self.update_board_picks(self.df_board, df_new_picks)
+        self.last_pick_number = int(df_new_picks["number"].max())
+
+        # This only gets updated once here to compare the current state's
+        # value to the newly updated board to determine if the model
+        # needs run again.
+        if self.df_cur_pick is None:
+            self.df_cur_pick = self.get_current_pick(self.df_board)
+        else:
             pass
 
     def create_df_final_players(self) -> pd.DataFrame:
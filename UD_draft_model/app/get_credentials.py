@@ -1,7 +1,10 @@
 import streamlit as st
 from selenium.common.exceptions import WebDriverException
 
-import UD_draft_model.scrapers.scrape_site.pull_bearer_token as pb
+from UD_draft_model.scrapers.scrape_site.pull_bearer_token import (
+    HeaderCaptureTimeout,
+)
+from UD_draft_model.scrapers.scrape_site.token_cache import get_token_cache
 from UD_draft_model.app.save_session_state import SaveSessionState
 
 
@@ -18,6 +21,7 @@ class Credentials(SaveSessionState):
     ) -> dict:
         """
         Pulls the bearer token and user-agent required to make api requests.
+        Cached headers are used until the token expires.
 
         Parameters
         ----------
@@ -35,22 +39,9 @@ class Credentials(SaveSessionState):
             Required headers.
         """
 
-        headers = pb.read_headers()
-
-        if username not in headers:
-            valid_token = False
-        else:
-            headers = headers[username]
-            valid_token = pb.test_headers(headers)
-
-        if valid_token == False:
-            url = "https://underdogfantasy.com/lobby"
-            headers = pb.pull_required_headers(
-                url, self.chromedriver_path, username, password
-            )
-
-            if save_headers:
-                pb.save_headers(username, headers)
+        headers = get_token_cache().get_headers(
+            username, password, self.chromedriver_path, save_headers
+        )
 
         return headers
 
@@ -95,7 +86,7 @@ class Credentials(SaveSessionState):
                         placeholder.empty()
                     except KeyError:
                         pass
-                    except UnboundLocalError:
+                    except (UnboundLocalError, HeaderCaptureTimeout):
                         st.write("Invalid Credentials - Please try again")
                     except WebDriverException:
                         st.write("Unable to check credentials")
@@ -106,6 +97,7 @@ def get_headers(
 ) -> dict:
     """
     Pulls the bearer token and user-agent required to make api requests.
+    Cached headers are used until the token expires.
 
     Parameters
     ----------
@@ -125,20 +117,9 @@ def get_headers(
         Required headers.
     """
 
-    headers = pb.read_headers()
-
-    if username not in headers:
-        valid_token = False
-    else:
-        headers = headers[username]
-        valid_token = pb.test_headers(headers)
-
-    if valid_token == False:
-        url = "https://underdogfantasy.com/lobby"
-        headers = pb.pull_required_headers(url, chromedriver_path, username, password)
-
-        if save_headers:
-            pb.save_headers(username, headers)
+    headers = get_token_cache().get_headers(
+        username, password, chromedriver_path, save_headers
+    )
 
     return headers
 
@@ -182,7 +163,7 @@ def enter_ud_credentials(chromdriver_path: str) -> bool:
                 placeholder.empty()
             except KeyError:
                 pass
-            except UnboundLocalError:
+            except (UnboundLocalError, HeaderCaptureTimeout):
                 st.write("Invalid Credentials - Please try again")
             except WebDriverException:
                 st.write("Unable to check credentials")
@@ -0,0 +1,268 @@
+"""
+Module is responsible for backfilling the daily ranks over a date range in
+parallel. Dates that already have a valid csv are skipped and the rest are
+spread across a small pool of worker processes, each of which keeps its own
+headless Chrome open for every date it's given.
+
+Progress is recorded in a manifest (ranks_manifest.json in the export folder)
+as each date finishes so an interrupted backfill picks up where it stopped.
+
+Only errors from the browser (e.g. the page timing out) count as a failed
+attempt at a date. Any other error is a bug that would fail every date, so it
+stops the backfill rather than using up every date's attempts.
+"""
+
+from multiprocessing import Pool, util
+from os import path
+import json
+import os
+
+import pandas as pd
+from selenium.common.exceptions import WebDriverException
+
+import UD_draft_model.scrapers.scrape_ranks.scrape_ranks as scrape_ranks
+
+MANIFEST_NAME = 'ranks_manifest.json'
+
+# Errors that are worth retrying the date for. WebDriverException covers
+# timeouts and elements that didn't load, OSError a lost connection to the
+# driver.
+TRANSIENT_ERRORS = (WebDriverException, OSError)
+
+# Chrome of the worker process, created by _init_worker
+_driver = None
+_driver_path = None
+
+
+def is_valid_ranks_file(file_path: str, date: str) -> bool:
+    """
+    True if the csv exists, has every rank column and at least one rank,
+    and is for the date passed
+    """
+
+    try:
+        df = pd.read_csv(file_path)
+    except (FileNotFoundError, pd.errors.EmptyDataError, pd.errors.ParserError):
+        return False
+
+    cols = scrape_ranks.RANK_COLS + ['date']
+    if any(col not in df.columns for col in cols) or len(df) == 0:
+        return False
+
+    return bool((df['date'].astype(str) == date).all())
+
+
+def read_manifest(export_folder: str) -> dict:
+    manifest_path = path.join(export_folder, MANIFEST_NAME)
+
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+
+    manifest.setdefault('done', [])
+    manifest.setdefault('failed', {})
+
+    return manifest
+
+
+def save_manifest(export_folder: str, manifest: dict) -> None:
+    """ Replaces the manifest in one step so it's never left half written """
+
+    manifest_path = path.join(export_folder, MANIFEST_NAME)
+    temp_path = manifest_path + '.tmp'
+
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    os.replace(temp_path, manifest_path)
+
+    return None
+
+
+def select_pending_dates(dates: list, export_folder: str, manifest: dict
+                         , max_attempts: int=3) -> list:
+    """
+    Returns the dates that still need exporting. Dates with a valid csv are
+    marked done in the manifest (and dates marked done without one aren't),
+    and dates that have failed max_attempts times are skipped.
+    """
+
+    done = set(manifest['done'])
+
+    pending = []
+    for date in dates:
+        full_path = scrape_ranks.create_ranks_path(export_folder, date)
+
+        if is_valid_ranks_file(full_path, date):
+            done.add(date)
+            continue
+
+        # Listed as done but the csv is missing or invalid
+        done.discard(date)
+
+        attempts = manifest['failed'].get(date, {}).get('attempts', 0)
+        if attempts < max_attempts:
+            pending.append(date)
+
+    manifest['done'] = sorted(done)
+
+    return pending
+
+
+def _init_worker(driver_path: str) -> None:
+    """ Runs once in each worker process """
+
+    global _driver_path
+
+    _driver_path = driver_path
+
+    # Quits Chrome when the pool is closed
+    util.Finalize(None, _quit_driver, exitpriority=10)
+
+
+def _get_driver():
+    global _driver
+
+    if _driver is None:
+        _driver = scrape_ranks.create_driver(_driver_path)
+
+    return _driver
+
+
+def _quit_driver() -> None:
+    global _driver
+
+    if _driver is not None:
+        try:
+            _driver.quit()
+        except Exception:
+            pass
+
+        _driver = None
+
+
+def _export_date(task: tuple) -> tuple:
+    """
+    Exports the ranks of one date with the worker's driver. Returns
+    (date, None) or (date, error message) so one date the browser failed on
+    doesn't stop the backfill. Any other error is raised.
+    """
+
+    url, date, export_folder, num_ranks, from_source = task
+
+    try:
+        driver = _get_driver()
+        driver.get(url)
+
+        df = scrape_ranks.extract_day_ranks(driver, date, num_ranks, from_source)
+
+        # Written to a temp file first so a crash can't leave a partial csv
+        full_path = scrape_ranks.create_ranks_path(export_folder, date)
+        temp_path = full_path + '.tmp'
+        df.to_csv(temp_path, index=False)
+        os.replace(temp_path, full_path)
+    except TRANSIENT_ERRORS as e:
+        # The driver may be in a bad state so the next date starts a new one
+        _quit_driver()
+
+        return date, repr(e)
+    except Exception:
+        _quit_driver()
+        raise
+
+    return date, None
+
+
+def backfill_ranks(url: str, driver_path: str, start_date: str, end_date: str
+                   , export_folder: str, num_ranks: int=400, workers: int=2
+                   , from_source: bool=True, max_attempts: int=3) -> dict:
+    """
+    Exports the ranks of every date from start_date to end_date that
+    doesn't already have a valid csv in export_folder.
+
+    Parameters
+    ----------
+    url : str
+        Url of the rankings site.
+    driver_path : str
+        File path to chromedriver.
+    start_date : str
+        First date formatted as yyyy-mm-dd.
+    end_date : str
+        Last date formatted as yyyy-mm-dd.
+    export_folder : str
+        Folder the csvs and manifest are written to.
+    num_ranks : int, optional
+        Number of ranks pulled for each date, by default 400.
+    workers : int, optional
+        Number of worker processes, each with its own headless Chrome, by
+        default 2. Each Chrome uses a few hundred MB and the site is shared,
+        so raise it with care.
+    from_source : bool, optional
+        Parses each table page's html locally, by default True.
+    max_attempts : int, optional
+        Dates that have failed this many times are no longer retried, by
+        default 3.
+
+    Returns
+    -------
+    dict
+        The manifest: 'done' dates and {date: {'attempts', 'error'}} of
+        the 'failed' dates.
+
+    Raises
+    ------
+    Exception
+        Any error exporting a date that isn't one of TRANSIENT_ERRORS. The
+        dates finished before it are kept in the manifest.
+    """
+
+    os.makedirs(export_folder, exist_ok=True)
+
+    manifest = read_manifest(export_folder)
+
+    dates = scrape_ranks.create_date_list(start_date, end_date)
+    pending = select_pending_dates(dates, export_folder, manifest, max_attempts)
+    done = set(manifest['done'])
+
+    save_manifest(export_folder, manifest)
+
+    print(f'{len(done)} dates already exported - {len(pending)} to export')
+
+    if len(pending) == 0:
+        return manifest
+
+    tasks = [(url, date, export_folder, num_ranks, from_source) for date in pending]
+
+    with Pool(min(workers, len(pending)), initializer=_init_worker
+              , initargs=(driver_path,)) as pool:
+        for date, error in pool.imap_unordered(_export_date, tasks):
+            if error is None:
+                done.add(date)
+                manifest['failed'].pop(date, None)
+            else:
+                failed = manifest['failed'].setdefault(date, {'attempts': 0})
+                failed['attempts'] += 1
+                failed['error'] = error
+                print(f'{date} failed - {error}')
+
+            manifest['done'] = sorted(done)
+            save_manifest(export_folder, manifest)
+
+        # Lets the workers exit normally so their drivers are quit
+        pool.close()
+        pool.join()
+
+    return manifest
+
+
+if __name__ == '__main__':
+
+    CHROMEDRIVER_PATH = '/usr/bin/chromedriver'
+    URL = 'https://sam-hoppen.shinyapps.io/UD_ADP/'
+    OUTPUT_FOLDER = 'data/2022/player_ranks'
+
+    # backfill_ranks(URL, CHROMEDRIVER_PATH, '2022-05-01', '2022-09-08'
+    # , OUTPUT_FOLDER, workers=4)
@@ -1,14 +1,35 @@
 from math import ceil
 from os import path
-from time import sleep
+from time import sleep, perf_counter
 import datetime
+import html
 
+from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.wait import WebDriverWait
 import pandas as pd
 
+RANK_COLS = ['player', 'pos', 'team', 'adp', 'rank']
+
+# Columns of each table row that are kept (Old ADP, ADP Change and Pos Rank
+# are excluded)
+KEEP_COL_INDEXES = [0, 1, 2, 3, 6]
+
+
+def create_driver(driver_path: str, headless: bool=True) -> webdriver.Chrome:
+    """ Opens Chrome with the options every ranks scraper uses """
+
+    options = Options()
+    if headless:
+        options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+
+    return webdriver.Chrome(driver_path, options=options)
+
 
 def change_dates(driver: webdriver.Chrome, date: str) -> webdriver.Chrome:
     """ 
@@ -87,10 +108,61 @@ def extract_page_ranks(driver: webdriver.Chrome) -> pd.DataFrame:
     return df
 
 
-def extract_day_ranks(driver: webdriver.Chrome, date: str, num_ranks: int=400) -> pd.DataFrame:
+def parse_page_ranks(page_source: str) -> pd.DataFrame:
+    """ 
+    Parses the rankings table out of the page's html locally. Rows and
+    columns are read the same way as extract_page_ranks.
+    """
+
+    soup = BeautifulSoup(page_source, 'html.parser')
+    rows = soup.find_all(class_='rt-tr')
+
+    data = []
+    for i, row in enumerate(rows):
+        # Don't need the header row
+        if i == 0:
+            continue
+
+        # Every descendant, same as find_elements_by_css_selector("*")
+        cols = row.find_all(True)
+        if len(cols) <= max(KEEP_COL_INDEXES):
+            continue
+
+        data.append([cols[j].get_text(strip=True) for j in KEEP_COL_INDEXES])
+
+    df = pd.DataFrame(data, columns=RANK_COLS)
+
+    return df
+
+
+def extract_page_ranks_from_source(driver: webdriver.Chrome
+                                   , previous_df: pd.DataFrame=None) -> pd.DataFrame:
+    """ 
+    Extracts the current rankings table from the page's html, which is
+    pulled in one call rather than one call per cell. Waits until the table
+    has rows that differ from previous_df (i.e. the previous page).
+    """
+
+    def page_loaded(d) -> bool:
+        """ True once the table has rows and they aren't the previous page's """
+
+        df = parse_page_ranks(d.page_source)
+
+        return len(df) > 0 and (previous_df is None or not df.equals(previous_df))
+
+    WebDriverWait(driver, timeout=10).until(page_loaded)
+
+    df = parse_page_ranks(driver.page_source)
+
+    return df
+
+
+def extract_day_ranks(driver: webdriver.Chrome, date: str, num_ranks: int=400
+                      , from_source: bool=False) -> pd.DataFrame:
     """ 
     Creates df of all ranks from a day up to the number of ranks passed 
-    
+    from_source parses each page's html locally instead of reading every
+    cell through the driver
     """
 
     driver = change_dates(driver, date)
@@ -98,11 +170,14 @@ def extract_day_ranks(driver: webdriver.Chrome, date: str, num_ranks: int=400) -
     num_pages = ceil(num_ranks / 50)
 
     dfs = []
+    df = None
     for i in range(num_pages):
-        if i == 0:
-            df = extract_page_ranks(driver)
+        if i != 0:
+            driver = next_page(driver)
+
+        if from_source:
+            df = extract_page_ranks_from_source(driver, previous_df=df)
         else:
-            driver = next_page(driver)            
             df = extract_page_ranks(driver)
 
         dfs.append(df)
@@ -113,34 +188,106 @@ def extract_day_ranks(driver: webdriver.Chrome, date: str, num_ranks: int=400) -
     return df
 
 
+def create_ranks_path(export_folder: str, date: str) -> str:
+    date_f = date.replace('-', '')
+
+    return path.join(export_folder, f'df_player_ranks_{date_f}.csv')
+
+
 def export_day_ranks(url, driver_path, start_date: str, end_date: str
-                            , export_folder: str, num_ranks: int=400) -> None:
+                            , export_folder: str, num_ranks: int=400
+                            , reuse_driver: bool=False, from_source: bool=False
+                            , pause: float=5, headless: bool=False) -> None:
     """ 
     Exports the ranks for each day from start_date to end_date as separate
     csvs stored in the export_folder param
+
+    reuse_driver keeps one Chrome open for every date (the page is reloaded
+    for each date) rather than launching one per date. from_source parses
+    each table page's html locally. pause is the seconds slept between
+    dates. headless runs Chrome without a window.
     """
 
     dates = create_date_list(start_date, end_date)
 
-    for date in dates:
-        driver = webdriver.Chrome(CHROMEDRIVER_PATH)
-        driver.get(URL)
+    driver = None
+    try:
+        for date in dates:
+            if driver is None:
+                driver = create_driver(driver_path, headless)
 
-        df = extract_day_ranks(driver, date, num_ranks)
-        
-        driver.close()
-        driver.quit()
+            driver.get(url)
+
+            df = extract_day_ranks(driver, date, num_ranks, from_source)
 
-        date_f = date.replace('-', '')
-        full_path = path.join(export_folder, f'df_player_ranks_{date_f}.csv')
+            if not reuse_driver:
+                driver.close()
+                driver.quit()
+                driver = None
 
-        df.to_csv(full_path, index=False)
+            df.to_csv(create_ranks_path(export_folder, date), index=False)
 
-        sleep(5)
+            sleep(pause)
+    finally:
+        if driver is not None:
+            driver.quit()
 
     return None
 
 
+def create_ranks_fixture(df: pd.DataFrame, file_path: str
+                         , ranks_per_page: int=50) -> None:
+    """ 
+    Writes a static html page that mimics the rankings table (one
+    'rt-tr' row per player with the columns the site shows) from a
+    df_player_ranks csv. Only the first page of ranks_per_page rows is
+    written. Used to benchmark the extractors without the live site.
+    """
+
+    def cell(value) -> str:
+        return f'<div class="rt-td">{html.escape(str(value))}</div>'
+
+    header = ['Player', 'Pos', 'Team', 'ADP', 'Old ADP', 'ADP Change'
+              , 'Rank', 'Pos Rank']
+    rows = ['<div class="rt-tr">' + ''.join(cell(h) for h in header) + '</div>']
+
+    for _, player in df.head(ranks_per_page).iterrows():
+        values = [player['player'], player['pos'], player['team'], player['adp']
+                  , player['adp'], 0, player['rank'], '']
+        rows.append('<div class="rt-tr">' + ''.join(cell(v) for v in values)
+                    + '</div>')
+
+    page = ('<html><body><div class="rt-table">' + ''.join(rows)
+            + '</div></body></html>')
+
+    with open(file_path, 'w') as f:
+        f.write(page)
+
+    return None
+
+
+def benchmark_extract(driver: webdriver.Chrome, fixture_path: str
+                      , repeat: int=5) -> dict:
+    """ 
+    Times extract_page_ranks against extract_page_ranks_from_source on a
+    static fixture (see create_ranks_fixture). Returns the mean seconds
+    per page of each.
+    """
+
+    driver.get('file://' + path.abspath(fixture_path))
+
+    results = {}
+    for name, extract in [('cells', extract_page_ranks)
+                          , ('page_source', extract_page_ranks_from_source)]:
+        start = perf_counter()
+        for _ in range(repeat):
+            extract(driver)
+
+        results[name] = (perf_counter() - start) / repeat
+
+    return results
+
+
 if __name__ == '__main__':
 
     CHROMEDRIVER_PATH = '/usr/bin/chromedriver'
@@ -149,4 +296,11 @@ if __name__ == '__main__':
     /data/2022/player_ranks'
 
     # export_day_ranks(URL, CHROMEDRIVER_PATH, '2022-10-01', '2022-10-08'
-    # , OUTPUT_FOLDER, num_ranks=400)
\ No newline at end of file
+    # , OUTPUT_FOLDER, num_ranks=400, reuse_driver=True, from_source=True
+    # , pause=0)
+
+    # Benchmark the extractors against a fixture built from a saved day
+    # df = pd.read_csv('data/2022/player_ranks/df_player_ranks_20220906.csv')
+    # create_ranks_fixture(df, '/tmp/ranks_fixture.html')
+    # driver = webdriver.Chrome(CHROMEDRIVER_PATH)
+    # print(benchmark_extract(driver, '/tmp/ranks_fixture.html'))
\ No newline at end of file
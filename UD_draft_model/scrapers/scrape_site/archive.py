@@ -0,0 +1,158 @@
+"""
+Module is responsible for archiving the raw API responses so that the dfs can
+be rebuilt (or the parsers benchmarked) from disk instead of re-scraping the
+API.
+
+Each response is appended to a gzip compressed NDJSON file as one line of
+{"url", "fetched_at", "status_code", "body"}. One gzip writer is kept open
+while recording and flushed after every append, so each run adds a single
+gzip member and the file stays readable up to the last append if the run is
+interrupted before the archive is closed.
+
+Replay serves the latest record of each url. Earlier records of a url (e.g.
+a live draft pulled several times) are still kept and can be read in order
+with iter_records.
+"""
+
+import datetime
+import gzip
+import json
+import os
+import threading
+import zlib
+
+import requests
+
+
+class ResponseArchive:
+    modes = ("record", "replay")
+
+    def __init__(self, file_path: str, mode: str = "record"):
+        """
+        Parameters
+        ----------
+        file_path : str
+            Path to the archive e.g. data/archive/responses.ndjson.gz
+        mode : str, optional
+            'record' appends every response pulled from the API to the archive.
+            'replay' serves every request from the archive without hitting the
+            API. By default 'record'.
+        """
+
+        if mode not in ResponseArchive.modes:
+            raise ValueError(f"mode must be one of {ResponseArchive.modes}")
+
+        self.file_path = file_path
+        self.mode = mode
+
+        self._index = None
+        self._lock = threading.Lock()
+
+        # Opened on the first append and kept open until close
+        self._file = None
+        self._writer = None
+
+        folder = os.path.dirname(file_path)
+        if folder != "":
+            os.makedirs(folder, exist_ok=True)
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == "replay"
+
+    def record(self, url: str, response: requests.Response) -> None:
+        """Appends the response to the archive"""
+
+        record = {
+            "url": url,
+            "fetched_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "status_code": response.status_code,
+            "body": response.content.decode("utf-8", errors="replace"),
+        }
+        line = (json.dumps(record) + "\n").encode("utf-8")
+
+        with self._lock:
+            if self._writer is None:
+                self._file = open(self.file_path, "ab")
+                self._writer = gzip.GzipFile(fileobj=self._file, mode="ab")
+
+            self._writer.write(line)
+            self._writer.flush(zlib.Z_SYNC_FLUSH)
+            self._file.flush()
+
+            if self._index is not None:
+                self._index[url] = record
+
+    def close(self) -> None:
+        """
+        Ends the gzip member being appended to. Appending again afterwards
+        starts a new one.
+        """
+
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._file.close()
+
+            self._file = None
+            self._writer = None
+
+    def get_response(self, url: str) -> requests.Response:
+        """
+        Creates a response from the latest archived record of the url. Only
+        the latest is served, so replaying a url that changed between pulls
+        (e.g. a live draft) always returns its last state.
+
+        Raises
+        ------
+        KeyError
+            If the url was never archived.
+        """
+
+        with self._lock:
+            if self._index is None:
+                self._index = self._create_index()
+
+            if url not in self._index:
+                raise KeyError(f"{url} not found in {self.file_path}")
+
+            record = self._index[url]
+
+        response = requests.Response()
+        response.url = url
+        response.status_code = record["status_code"]
+        response._content = record["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.headers["content-type"] = "application/json"
+
+        return response
+
+    def iter_records(self, url_contains: str = None):
+        """
+        Yields every archived record in the order they were fetched. Records
+        can be filtered to urls that contain url_contains.
+        """
+
+        if not os.path.exists(self.file_path):
+            return
+
+        with gzip.open(self.file_path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    record = json.loads(line)
+
+                    if url_contains is None or url_contains in record["url"]:
+                        yield record
+            except (EOFError, json.JSONDecodeError):
+                # The run that appended last was interrupted before the
+                # archive was closed
+                return
+
+    def _create_index(self) -> dict:
+        """Maps each url to its latest record"""
+
+        index = {}
+        for record in self.iter_records():
+            index[record["url"]] = record
+
+        return index
@@ -0,0 +1,183 @@
+"""
+Module is responsible for running scraper requests concurrently while
+keeping the results in the same order as the inputs, and for coalescing
+identical requests that are made at the same time.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+
+def map_concurrent(func, items: list, max_workers: int = 1) -> tuple:
+    """
+    Applies func to every item using a bounded thread pool.
+
+    Parameters
+    ----------
+    func : Callable
+        Function that takes a single item.
+    items : list
+        Items to apply func to.
+    max_workers : int, optional
+        Max number of items processed at once, by default 1 which runs
+        everything serially in the calling thread.
+
+    Returns
+    -------
+    tuple
+        First element is a list of (item, result) tuples in the same order as
+        items for every item that succeeded. Second element is a dict of
+        {item: exception} for every item that failed.
+    """
+
+    results = []
+    errors = {}
+
+    if max_workers <= 1:
+        for item in items:
+            try:
+                results.append((item, func(item)))
+            except Exception as e:
+                errors[item] = e
+
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(item, executor.submit(func, item)) for item in items]
+
+        for item, future in futures:
+            try:
+                results.append((item, future.result()))
+            except Exception as e:
+                errors[item] = e
+
+    return results, errors
+
+
+def fetch_pages(fetch_page, is_last_page, window: int = 1, first_page: int = 1) -> list:
+    """
+    Fetches numbered pages until the first page where is_last_page is True.
+    Up to window pages are requested ahead of the page being checked, and any
+    that haven't started once the last page is found are cancelled.
+
+    Parameters
+    ----------
+    fetch_page : Callable
+        Function that takes a page number and returns its data.
+    is_last_page : Callable
+        Function that takes the data of a page and returns True if it marks
+        the end of the pages (e.g. an empty page).
+    window : int, optional
+        Max number of pages requested at once, by default 1 which fetches
+        every page serially.
+    first_page : int, optional
+        Number of the first page, by default 1.
+
+    Returns
+    -------
+    list
+        (page number, data) tuples in page order. The last page is excluded.
+    """
+
+    return list(iter_pages(fetch_page, is_last_page, window, first_page))
+
+
+def iter_pages(fetch_page, is_last_page, window: int = 1, first_page: int = 1):
+    """
+    Same as fetch_pages but yields each (page number, data) tuple as soon as
+    it's checked, so the pages don't all have to be held in memory. Pages
+    requested ahead are cancelled if the generator is closed early.
+    """
+
+    if window <= 1:
+        page = first_page
+        while True:
+            data = fetch_page(page)
+
+            if is_last_page(data):
+                return
+
+            yield page, data
+            page += 1
+
+    with ThreadPoolExecutor(max_workers=window) as executor:
+        futures = deque()
+        for page in range(first_page, first_page + window):
+            futures.append((page, executor.submit(fetch_page, page)))
+
+        next_page = first_page + window
+        try:
+            while len(futures) > 0:
+                page, future = futures.popleft()
+                data = future.result()
+
+                if is_last_page(data):
+                    return
+
+                yield page, data
+
+                futures.append((next_page, executor.submit(fetch_page, next_page)))
+                next_page += 1
+        finally:
+            _cancel_futures(futures)
+
+
+def _cancel_futures(futures: deque) -> None:
+    """Cancels every future that hasn't started running yet"""
+
+    for page, future in futures:
+        future.cancel()
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesces identical calls that are made at the same time. The first
+        caller of a key runs the function and every caller that arrives while
+        it's running waits for and shares its result (or exception).
+        """
+
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func) -> tuple:
+        """
+        Runs func unless a call with the same key is already running.
+
+        Returns
+        -------
+        tuple
+            (result of func, True if the result was shared from another call)
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+
+            if call is None:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+                is_leader = True
+            else:
+                is_leader = False
+
+        if not is_leader:
+            call["done"].wait()
+
+            if call["error"] is not None:
+                raise call["error"]
+
+            return call["result"], True
+
+        try:
+            call["result"] = func()
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call["done"].set()
+
+        return call["result"], False
@@ -0,0 +1,553 @@
+"""
+Module is responsible for delivering the picks of a live draft as they are
+made. An event source runs in a background thread and puts each new pick
+(the raw pick record from the API) on an in-memory queue that the draft
+board drains, rather than the board re-requesting the whole draft on every
+refresh.
+
+Two sources are available:
+    PollingEventSource - requests the draft on an interval. Works against the
+        API as it is.
+    StreamingEventSource - holds open a long-lived request to an events url
+        that sends one JSON event per line as picks are made. It falls back
+        to polling if the stream can't be reached.
+
+Underdog doesn't document a push channel so the events url is configurable
+(UD_DRAFT_EVENTS_URL or events_url) and LocalPickPublisher serves the same
+protocol locally for testing. Without one, create_event_source polls.
+
+Stream protocol: GET {events_url}?after=<pick number> returns newline
+delimited JSON of {"type": "pick", "pick": {...}} events, starting with every
+pick after <pick number>. Blank lines are heartbeats.
+"""
+
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+import requests
+
+from UD_draft_model.scrapers.scrape_site.transport import (
+    Transport,
+    get_default_transport,
+)
+
+# Url template of the draft events stream e.g.
+# http://127.0.0.1:8080/drafts/{draft_id}/events. Polling is used when unset.
+DRAFT_EVENTS_URL = os.environ.get("UD_DRAFT_EVENTS_URL", "")
+
+
+class DraftEventSource(ABC):
+    def __init__(
+        self,
+        draft_id: str,
+        after_number: int = 0,
+        idle_timeout: float = 60.0,
+        num_picks: int = None,
+    ):
+        """
+        Base class of the event sources. Subclasses implement _run, which is
+        run in a background thread until should_stop is True, and pass the
+        pick records they receive to _publish.
+
+        Parameters
+        ----------
+        draft_id : str
+            Draft to follow.
+        after_number : int, optional
+            Only picks after this pick number are delivered, by default 0.
+        idle_timeout : float, optional
+            The source stops itself once get_picks hasn't been called for
+            this many seconds (e.g. the app session reading it has ended), by
+            default 60. None never stops.
+        num_picks : int, optional
+            Number of picks in the draft. The source stops once the last one
+            is delivered, by default it runs until stopped.
+        """
+
+        self.draft_id = draft_id
+        self.last_pick_number = after_number
+        self.idle_timeout = idle_timeout
+        self.num_picks = num_picks
+
+        self.queue = queue.Queue()
+        self.stats = {"picks": 0, "requests": 0, "reconnects": 0}
+
+        self._stop_event = threading.Event()
+        self._publish_lock = threading.Lock()
+        self._thread = None
+        self._last_read = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "DraftEventSource":
+        if self.running:
+            return self
+
+        self._stop_event.clear()
+        self._last_read = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    @property
+    def complete(self) -> bool:
+        """True once every pick of the draft has been delivered"""
+
+        return self.num_picks is not None and self.last_pick_number >= self.num_picks
+
+    def should_stop(self) -> bool:
+        """
+        True once stop is called, the draft is complete or nothing has read
+        the picks for idle_timeout
+        """
+
+        if self._stop_event.is_set() or self.complete:
+            return True
+
+        if (
+            self.idle_timeout is not None
+            and time.monotonic() - self._last_read > self.idle_timeout
+        ):
+            print(f"Nothing read draft {self.draft_id}'s picks - stopping its events")
+            self.stop()
+            return True
+
+        return False
+
+    def get_picks(self, timeout: float = 0) -> list:
+        """
+        Drains the queue of new picks, sorted by pick number. Waits up to
+        timeout seconds for the first pick when the queue is empty.
+        """
+
+        self._last_read = time.monotonic()
+
+        picks = []
+        try:
+            if timeout > 0:
+                picks.append(self.queue.get(timeout=timeout))
+
+            while True:
+                picks.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        return sorted(picks, key=lambda pick: pick["number"])
+
+    def _publish(self, picks: list) -> None:
+        """Queues the picks that haven't been delivered yet"""
+
+        with self._publish_lock:
+            for pick in sorted(picks, key=lambda pick: pick["number"]):
+                if pick["number"] <= self.last_pick_number:
+                    continue
+
+                self.queue.put(pick)
+                self.last_pick_number = pick["number"]
+                self.stats["picks"] += 1
+
+    @abstractmethod
+    def _run(self) -> None:
+        """Runs in the background thread until should_stop is True"""
+
+
+class PollingEventSource(DraftEventSource):
+    def __init__(
+        self,
+        draft_id: str,
+        headers: dict,
+        after_number: int = 0,
+        interval: float = 3.0,
+        transport: Transport = None,
+        idle_timeout: float = 60.0,
+        num_picks: int = None,
+        max_interval: float = 15.0,
+    ):
+        """
+        Requests the draft every interval seconds and queues the new picks.
+        While requests find no new picks (e.g. a slow drafter is on the
+        clock) the wait doubles up to max_interval, and it drops back to
+        interval as soon as a pick is found.
+
+        Parameters
+        ----------
+        headers : dict
+            Headers passed to the API request.
+        interval : float, optional
+            Seconds between requests while picks are being made, by default 3.
+        transport : Transport, optional
+            Transport used for the requests, by default the process-wide
+            transport from get_default_transport.
+        max_interval : float, optional
+            Longest wait between requests when nothing changes, by default 15.
+        """
+
+        super().__init__(draft_id, after_number, idle_timeout, num_picks)
+
+        # Imported here since scrape_league_data imports the transport too
+        import UD_draft_model.scrapers.scrape_site.scrape_league_data as scrape_site
+
+        self.interval = interval
+        self.max_interval = max_interval
+
+        self.draft_detail = scrape_site.DraftsDetail(
+            [draft_id], headers, transport=transport
+        )
+
+    def poll(self) -> None:
+        """Requests the draft once and queues the new picks"""
+
+        url = self.draft_detail.url_drafts[self.draft_id]
+
+        json_draft = self.draft_detail.read_in_site_data(
+            url, headers=self.draft_detail.auth_header
+        )
+        self.stats["requests"] += 1
+
+        self._publish(json_draft["draft"]["picks"])
+
+    def _run(self) -> None:
+        wait = self.interval
+        while not self.should_stop():
+            num_picks = self.stats["picks"]
+
+            try:
+                self.poll()
+            except (requests.RequestException, KeyError, ValueError) as e:
+                print(f"Polling draft {self.draft_id} failed - {e!r}")
+
+            if self.stats["picks"] > num_picks:
+                wait = self.interval
+            else:
+                wait = min(wait * 2, self.max_interval)
+
+            self._stop_event.wait(wait)
+
+
+class StreamingEventSource(PollingEventSource):
+    def __init__(
+        self,
+        draft_id: str,
+        headers: dict,
+        events_url: str,
+        after_number: int = 0,
+        interval: float = 3.0,
+        transport: Transport = None,
+        read_timeout: float = 30.0,
+        max_failures: int = 3,
+        idle_timeout: float = 60.0,
+        num_picks: int = None,
+    ):
+        """
+        Streams the picks from events_url, reconnecting whenever the stream
+        ends or goes quiet for read_timeout seconds (i.e. long polling).
+        After max_failures connection errors in a row it falls back to
+        polling every interval seconds.
+
+        Parameters
+        ----------
+        events_url : str
+            Url of the draft's event stream. "{draft_id}" is replaced with the
+            draft id.
+        read_timeout : float, optional
+            Seconds without a line (events or heartbeats) before reconnecting,
+            by default 30.
+        max_failures : int, optional
+            Connection errors in a row before falling back to polling, by
+            default 3.
+        """
+
+        super().__init__(
+            draft_id,
+            headers,
+            after_number,
+            interval,
+            transport,
+            idle_timeout,
+            num_picks=num_picks,
+        )
+
+        if transport is None:
+            transport = get_default_transport()
+
+        self.events_url = events_url.format(draft_id=draft_id)
+        self.headers = headers
+        self.transport = transport
+        self.read_timeout = read_timeout
+        self.max_failures = max_failures
+
+        self.polling = False
+        self._response = None
+
+    def stop(self) -> None:
+        super().stop()
+
+        # Unblocks the thread waiting on the stream
+        response = self._response
+        if response is not None:
+            response.close()
+
+    def _run(self) -> None:
+        failures = 0
+        while not self.should_stop():
+            try:
+                self._stream()
+                failures = 0
+            except requests.Timeout:
+                # The stream went quiet, which isn't a failure when long polling
+                failures = 0
+            except (requests.RequestException, ValueError) as e:
+                if self._stop_event.is_set():
+                    return
+
+                failures += 1
+                if failures >= self.max_failures:
+                    print(f"Draft events stream failed - {e!r}. Polling instead.")
+                    self.polling = True
+                    super()._run()
+                    return
+
+                self._stop_event.wait(min(2**failures * 0.1, self.interval))
+
+            self.stats["reconnects"] += 1
+
+    def _stream(self) -> None:
+        """Reads the events from one connection until it's closed"""
+
+        connect_timeout = self.transport.timeout[0]
+
+        self._response = self.transport.session.get(
+            self.events_url,
+            params={"after": self.last_pick_number},
+            headers=self.headers,
+            stream=True,
+            timeout=(connect_timeout, self.read_timeout),
+        )
+        self.stats["requests"] += 1
+
+        try:
+            self._response.raise_for_status()
+
+            # Lines are read as they arrive rather than once a full chunk of
+            # bytes is buffered
+            for line in self._response.iter_lines(chunk_size=1):
+                if self.should_stop():
+                    return
+
+                # Heartbeat
+                if not line:
+                    continue
+
+                event = json.loads(line)
+                if event.get("type") == "pick":
+                    self._publish([event["pick"]])
+
+                if self.complete:
+                    return
+        except requests.ConnectionError:
+            # The stream dropped (or went quiet for read_timeout) after it
+            # connected so it's reopened rather than counted as a failure
+            return
+        finally:
+            self._response.close()
+            self._response = None
+
+
+def create_event_source(
+    draft_id: str,
+    headers: dict,
+    after_number: int = 0,
+    events_url: str = None,
+    interval: float = 3.0,
+    transport: Transport = None,
+    idle_timeout: float = 60.0,
+    num_picks: int = None,
+) -> DraftEventSource:
+    """
+    Creates a StreamingEventSource if an events url is passed or set with
+    UD_DRAFT_EVENTS_URL. Otherwise, a PollingEventSource is created.
+    """
+
+    if events_url is None:
+        events_url = DRAFT_EVENTS_URL
+
+    if events_url:
+        return StreamingEventSource(
+            draft_id,
+            headers,
+            events_url,
+            after_number=after_number,
+            interval=interval,
+            transport=transport,
+            idle_timeout=idle_timeout,
+            num_picks=num_picks,
+        )
+
+    return PollingEventSource(
+        draft_id,
+        headers,
+        after_number=after_number,
+        interval=interval,
+        transport=transport,
+        idle_timeout=idle_timeout,
+        num_picks=num_picks,
+    )
+
+
+class LocalPickPublisher:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, heartbeat: float = 5.0):
+        """
+        Local HTTP server that streams picks with the protocol
+        StreamingEventSource reads. Picks are pushed with publish (or
+        replay_draft) and sent to every open stream of the draft.
+
+        Parameters
+        ----------
+        host : str, optional
+            Host to bind, by default "127.0.0.1".
+        port : int, optional
+            Port to bind, by default 0 which picks a free port.
+        heartbeat : float, optional
+            Seconds between heartbeats sent to quiet streams, by default 5.
+        """
+
+        self.heartbeat = heartbeat
+
+        # {draft_id: picks published so far}
+        self.picks = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+
+        self.server = ThreadingHTTPServer((host, port), self._create_handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+
+        return f"http://{host}:{port}"
+
+    @property
+    def events_url(self) -> str:
+        """Url template to pass to StreamingEventSource"""
+
+        return self.url + "/drafts/{draft_id}/events"
+
+    def start(self) -> "LocalPickPublisher":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def publish(self, draft_id: str, picks: list) -> None:
+        with self._condition:
+            self.picks.setdefault(draft_id, []).extend(picks)
+            self._condition.notify_all()
+
+    def replay_draft(
+        self, draft_id: str, picks: list, pick_interval: float = 1.0
+    ) -> threading.Thread:
+        """
+        Publishes the picks one at a time, pick_interval seconds apart, from
+        a background thread (e.g. the picks of MockPayloads.draft).
+        """
+
+        def replay():
+            for pick in picks:
+                if self._stopped:
+                    return
+
+                self.publish(draft_id, [pick])
+                time.sleep(pick_interval)
+
+        thread = threading.Thread(target=replay, daemon=True)
+        thread.start()
+
+        return thread
+
+    def _stream(self, draft_id: str, after_number: int, write) -> None:
+        """Writes the picks after after_number as they are published"""
+
+        with self._condition:
+            picks = self.picks.get(draft_id, [])
+            sent = len([pick for pick in picks if pick["number"] <= after_number])
+
+        while True:
+            with self._condition:
+                if len(self.picks.get(draft_id, [])) <= sent and not self._stopped:
+                    self._condition.wait(self.heartbeat)
+
+                if self._stopped:
+                    return
+
+                new_picks = self.picks.get(draft_id, [])[sent:]
+                sent += len(new_picks)
+
+            # An empty line is sent as a heartbeat when nothing was published
+            lines = [json.dumps({"type": "pick", "pick": pick}) for pick in new_picks]
+            write(("".join(line + "\n" for line in lines) or "\n").encode("utf-8"))
+
+    def _create_handler(self):
+        publisher = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # The stream is ended by closing the connection
+            protocol_version = "HTTP/1.0"
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                match = re.fullmatch(r"/drafts/([^/]+)/events", parsed.path)
+
+                if match is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                after_number = int(parse_qs(parsed.query).get("after", ["0"])[0])
+
+                self.send_response(200)
+                self.send_header("content-type", "application/x-ndjson")
+                self.send_header("cache-control", "no-cache")
+                self.end_headers()
+
+                def write(data: bytes) -> None:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+
+                try:
+                    publisher._stream(match[1], after_number, write)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,175 @@
+"""
+Module is responsible for storing the scraped dfs in compact dtypes. UUID
+columns are replaced with integer codes from an IdDictionary that's shared by
+every df of a slate (so the dfs still join on them) and low-cardinality
+string columns are stored as categoricals.
+
+This is opt-in - scraper classes only compact their dfs when passed a
+DtypePolicy - since the coded ids can't be compared to the UUID strings used
+elsewhere (e.g. in urls) without decoding them first.
+"""
+
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+# UUID columns replaced with integer codes
+ID_COLUMNS = ["appearance_id", "player_id", "draft_entry_id", "team_id"]
+
+# Low-cardinality string columns stored as categoricals
+CATEGORY_COLUMNS = ["position", "abbr", "status"]
+
+
+class IdDictionary:
+    def __init__(self):
+        """
+        Thread-safe, append-only mapping of ids to integer codes. A code never
+        changes once it's assigned so dfs coded at different times can still
+        be joined.
+        """
+
+        self._codes = {}
+        self._ids = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def encode(self, ids) -> np.ndarray:
+        """
+        Converts the ids to codes, assigning a new code to any id that hasn't
+        been seen. Missing ids are coded as -1.
+        """
+
+        ids = pd.Series(ids, dtype=object)
+
+        # Each unique id is only looked up once
+        codes, uniques = pd.factorize(ids)
+
+        with self._lock:
+            unique_codes = np.empty(len(uniques), dtype=np.int32)
+            for i, id_ in enumerate(uniques):
+                code = self._codes.get(id_)
+
+                if code is None:
+                    code = len(self._ids)
+                    self._codes[id_] = code
+                    self._ids.append(id_)
+
+                unique_codes[i] = code
+
+        return np.where(codes == -1, -1, unique_codes[codes]).astype(np.int32)
+
+    def decode(self, codes) -> np.ndarray:
+        """Converts the codes back to ids. -1 is decoded as None."""
+
+        codes = np.asarray(codes)
+
+        with self._lock:
+            ids = np.array(self._ids + [None], dtype=object)
+
+        return ids[np.where(codes < 0, len(ids) - 1, codes)]
+
+
+# A slate's dictionary is only kept while a policy (or anything else) still
+# references it so the dictionaries of slates that are no longer being built
+# are freed rather than accumulating for the life of the process
+_slate_id_dictionaries = weakref.WeakValueDictionary()
+_slate_id_dictionaries_lock = threading.Lock()
+
+
+def get_slate_id_dictionary(slate_id: str) -> IdDictionary:
+    """
+    Returns the IdDictionary shared by every df of the slate. It's freed once
+    nothing references it, so keep the policy (or its id_dictionary) for as
+    long as the coded dfs are used - a later call creates a new dictionary
+    whose codes don't match them.
+    """
+
+    with _slate_id_dictionaries_lock:
+        id_dictionary = _slate_id_dictionaries.get(slate_id)
+
+        if id_dictionary is None:
+            id_dictionary = IdDictionary()
+            _slate_id_dictionaries[slate_id] = id_dictionary
+
+        return id_dictionary
+
+
+class DtypePolicy:
+    def __init__(
+        self,
+        id_dictionary: IdDictionary = None,
+        id_columns: list = None,
+        category_columns: list = None,
+    ):
+        """
+        Parameters
+        ----------
+        id_dictionary : IdDictionary, optional
+            Dictionary used to code the id columns. Every df that's joined
+            together must use the same one, by default a new IdDictionary.
+        id_columns : list, optional
+            Columns replaced with integer codes, by default ID_COLUMNS.
+        category_columns : list, optional
+            Columns stored as categoricals, by default CATEGORY_COLUMNS.
+        """
+
+        if id_dictionary is None:
+            id_dictionary = IdDictionary()
+
+        self.id_dictionary = id_dictionary
+        self.id_columns = id_columns if id_columns is not None else ID_COLUMNS
+        self.category_columns = (
+            category_columns if category_columns is not None else CATEGORY_COLUMNS
+        )
+
+    @classmethod
+    def for_slate(cls, slate_id: str, **kwargs) -> "DtypePolicy":
+        """Creates a policy that uses the slate's shared IdDictionary"""
+
+        return cls(get_slate_id_dictionary(slate_id), **kwargs)
+
+    def apply(self, df: pd.DataFrame, id_columns: list = None) -> pd.DataFrame:
+        """
+        Codes the id columns and converts the category columns of the df.
+        Columns that are already converted are left as they are.
+
+        id_columns are coded as well as the policy's, for dfs that name an id
+        differently to the dfs they're joined to (e.g. the id of the draft
+        entries is the draft_entry_id of the picks).
+        """
+
+        df = df.copy()
+
+        for col in self.id_columns + (id_columns or []):
+            if col in df.columns and _is_text(df[col]):
+                df[col] = self.id_dictionary.encode(df[col])
+
+        for col in self.category_columns:
+            if col in df.columns and _is_text(df[col]):
+                df[col] = df[col].astype("category")
+
+        return df
+
+    def decode(self, df: pd.DataFrame, id_columns: list = None) -> pd.DataFrame:
+        """Converts the coded id columns of the df back to ids"""
+
+        df = df.copy()
+
+        for col in self.id_columns + (id_columns or []):
+            if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+                df[col] = self.id_dictionary.decode(df[col])
+
+        return df
+
+
+def _is_text(col: pd.Series) -> bool:
+    """True if the column holds strings that haven't been converted yet"""
+
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return False
+
+    return pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col)
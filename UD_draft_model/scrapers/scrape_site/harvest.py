@@ -0,0 +1,465 @@
+"""
+Module is responsible for bulk harvesting every draft of one or more slates.
+
+Slates, the pages of leagues in each slate, and the details of each draft are
+streamed through bounded queues so that only a few batches of drafts are ever
+held in memory. Picks and league info are written to Parquet files
+partitioned by year and slate as each batch completes:
+
+    {output_dir}/{year}/{slate_id}/df_drafts/part-00000.parquet
+    {output_dir}/{year}/{slate_id}/df_league_info/part-00000.parquet
+
+A checkpoint of each slate is saved after each batch so that an interrupted
+run picks up where it left off:
+
+    {output_dir}/checkpoints/{slate_id}.json
+
+It records the id of each draft written and the numbers of the Parquet
+parts. A resumed run reads every page of leagues again and only pulls the
+drafts whose ids aren't in the checkpoint, so drafts that moved to another
+page or were added since the last run are still found.
+
+Usage:
+    python -m UD_draft_model.scrapers.scrape_site.harvest --username <email>
+"""
+
+import json
+import os
+import queue
+import threading
+
+import pandas as pd
+
+import UD_draft_model.scrapers.scrape_site.schemas as schemas
+import UD_draft_model.scrapers.scrape_site.scrape_league_data as scrape_site
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+CHECKPOINT_FOLDER = "checkpoints"
+
+# Marks the end of a queue
+_DONE = None
+
+
+class Harvester:
+    def __init__(
+        self,
+        headers: dict,
+        output_dir: str = "data",
+        slate_type: str = "completed",
+        slate_ids: list = None,
+        transport: Transport = None,
+        max_workers: int = 4,
+        queue_size: int = 100,
+        batch_size: int = 250,
+    ):
+        """
+        Parameters
+        ----------
+        headers : dict
+            Headers required to make api requests.
+        output_dir : str, optional
+            Folder the Parquet files and checkpoint are written to, by
+            default 'data'.
+        slate_type : str, optional
+            'completed' or 'settled', by default 'completed'.
+        slate_ids : list, optional
+            Only harvests these slates, by default every slate found.
+        transport : Transport, optional
+            Transport shared by every request, by default the process-wide
+            transport.
+        max_workers : int, optional
+            Number of drafts pulled at once, by default 4.
+        queue_size : int, optional
+            Max number of drafts waiting to be pulled or written, by default
+            100. This (with batch_size) bounds the memory used.
+        batch_size : int, optional
+            Number of drafts written to each Parquet file, by default 250.
+        """
+
+        self.headers = headers
+        self.output_dir = output_dir
+        self.slate_type = slate_type
+        self.slate_ids = slate_ids
+        self.transport = transport
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+
+        self._draft_queue = queue.Queue(maxsize=queue_size)
+        self._write_queue = queue.Queue(maxsize=queue_size)
+
+        # {slate_id: checkpoint}, read as each slate is reached
+        self._checkpoints = {}
+        self._lock = threading.Lock()
+
+        # Set when the writer fails so the producers stop queueing drafts
+        self._cancelled = threading.Event()
+        self._writer_error = None
+        self._write_queue_done = False
+
+        self.failed_draft_ids = {}
+        self.num_drafts_written = 0
+
+    def harvest(self) -> int:
+        """
+        Harvests every draft of the slates that hasn't been written already.
+
+        Returns
+        -------
+        int
+            Number of drafts written.
+
+        Raises
+        ------
+        Exception
+            The error that stopped the writer. Drafts written before it are
+            kept in the checkpoint.
+        """
+
+        workers = [
+            threading.Thread(target=self._pull_drafts, daemon=True)
+            for i in range(self.max_workers)
+        ]
+        writer = threading.Thread(target=self._write_drafts, daemon=True)
+
+        for thread in workers + [writer]:
+            thread.start()
+
+        try:
+            for slate in self.get_slates():
+                if self._cancelled.is_set():
+                    break
+
+                self._queue_slate_drafts(slate)
+        finally:
+            for i in range(self.max_workers):
+                self._draft_queue.put(_DONE)
+            for thread in workers:
+                thread.join()
+
+            self._write_queue.put(_DONE)
+            writer.join()
+
+        if self._writer_error is not None:
+            raise self._writer_error
+
+        return self.num_drafts_written
+
+    def get_slates(self) -> list:
+        slates = scrape_site.Slates(
+            self.headers, self.slate_type, transport=self.transport
+        )
+        slates.create_df_slates(clear_json=True)
+
+        if self.slate_ids is None:
+            return slates.slates
+
+        return [slate for slate in slates.slates if slate.id in self.slate_ids]
+
+    def _queue_slate_drafts(self, slate: scrape_site.Slate) -> None:
+        """
+        Reads each page of leagues in the slate and queues every draft that
+        hasn't been written yet.
+        """
+
+        drafts = scrape_site.Drafts(self.headers, slate, transport=self.transport)
+        self._load_checkpoint(slate.id)
+
+        with self._lock:
+            # Drafts already queued are skipped too in case the lists shift
+            # while they're being read and a draft shows up on two pages
+            skipped_ids = set(self._checkpoints[slate.id]["draft_ids"])
+
+        for url in drafts.get_league_urls():
+            for page, leagues in drafts.iter_league_pages(url):
+                if self._cancelled.is_set():
+                    return
+
+                for league in leagues["drafts"]:
+                    if league["id"] in skipped_ids:
+                        continue
+
+                    skipped_ids.add(league["id"])
+                    self._draft_queue.put((slate.id, league))
+
+    def _pull_drafts(self) -> None:
+        """Worker that pulls the picks of each queued draft"""
+
+        while True:
+            item = self._draft_queue.get()
+            if item is _DONE:
+                return
+
+            # The writer failed so the rest of the queue is just drained
+            if self._cancelled.is_set():
+                continue
+
+            slate_id, league = item
+
+            try:
+                drafts_detail = scrape_site.DraftsDetail(
+                    [league["id"]], self.headers, transport=self.transport
+                )
+                df_picks = drafts_detail.create_df_drafts()
+            except Exception as e:
+                print(f"Failed to pull draft {league['id']} - {e!r}")
+                # Not checkpointed so it's pulled again by the next run
+                with self._lock:
+                    self.failed_draft_ids[league["id"]] = e
+                continue
+
+            self._write_queue.put((slate_id, league, df_picks))
+
+    def _write_drafts(self) -> None:
+        """
+        Writer thread. If writing fails the error is kept for harvest to raise
+        and the queue is drained until the workers finish so they never block
+        on a full queue.
+        """
+
+        try:
+            self._write_batches()
+        except Exception as e:
+            self._writer_error = e
+            self._cancelled.set()
+
+            while not self._write_queue_done:
+                self._write_queue_done = self._write_queue.get() is _DONE
+
+    def _write_batches(self) -> None:
+        """
+        Buffers the pulled drafts by partition and writes a batch once
+        batch_size drafts are buffered.
+        """
+
+        buffers = {}
+        num_buffered = 0
+
+        while True:
+            item = self._write_queue.get()
+            self._write_queue_done = item is _DONE
+
+            if item is not _DONE:
+                slate_id, league, df_picks = item
+                year = str(league.get("draft_at", "unknown"))[:4]
+
+                buffer = buffers.setdefault((year, slate_id), ([], []))
+                buffer[0].append(league)
+                buffer[1].append(df_picks)
+                num_buffered += 1
+
+            if num_buffered >= self.batch_size or (item is _DONE and num_buffered > 0):
+                self._write_batch(buffers)
+
+                buffers = {}
+                num_buffered = 0
+
+            if item is _DONE:
+                return
+
+    def _write_batch(self, buffers: dict) -> None:
+        """
+        Writes one Parquet file of picks and league info per partition then
+        checkpoints the ids of the drafts written.
+        """
+
+        slate_ids = {slate_id for year, slate_id in buffers}
+
+        # The parts are checkpointed as in progress before they're written so
+        # that an interrupted run knows which files to remove
+        part_numbers = {}
+        with self._lock:
+            for year, slate_id in buffers:
+                checkpoint = self._checkpoints[slate_id]
+                part_numbers[(year, slate_id)] = checkpoint["next_part"]
+                checkpoint["in_progress"].append([year, checkpoint["next_part"]])
+                checkpoint["next_part"] += 1
+
+        self._save_checkpoints(slate_ids)
+
+        num_drafts = 0
+        for (year, slate_id), (leagues, dfs_picks) in buffers.items():
+            df_league_info = schemas.build_df(leagues, schemas.LEAGUES)
+            df_drafts = pd.concat(dfs_picks, ignore_index=True)
+
+            part_number = part_numbers[(year, slate_id)]
+            for df_name, df in [
+                ("df_drafts", df_drafts),
+                ("df_league_info", df_league_info),
+            ]:
+                _write_parquet(
+                    df, self._part_path(year, slate_id, df_name, part_number)
+                )
+
+            num_drafts += len(leagues)
+
+        with self._lock:
+            for (year, slate_id), (leagues, dfs_picks) in buffers.items():
+                checkpoint = self._checkpoints[slate_id]
+
+                part_number = part_numbers[(year, slate_id)]
+                checkpoint["in_progress"].remove([year, part_number])
+                checkpoint["parts"].setdefault(year, []).append(part_number)
+                checkpoint["draft_ids"].extend(league["id"] for league in leagues)
+
+        self._save_checkpoints(slate_ids)
+
+        self.num_drafts_written += num_drafts
+        print(f"{self.num_drafts_written} drafts written")
+
+    def _checkpoint_path(self, slate_id: str) -> str:
+        return os.path.join(self.output_dir, CHECKPOINT_FOLDER, slate_id + ".json")
+
+    def _part_path(
+        self, year: str, slate_id: str, df_name: str, part_number: int
+    ) -> str:
+        part_name = f"part-{part_number:05d}.parquet"
+
+        return os.path.join(self.output_dir, year, slate_id, df_name, part_name)
+
+    def _load_checkpoint(self, slate_id: str) -> None:
+        """
+        Reads the slate's checkpoint and removes the parts an interrupted run
+        was writing when it stopped. Their drafts are pulled again.
+        """
+
+        checkpoint = {
+            "draft_ids": [],
+            "parts": {},
+            "in_progress": [],
+            "next_part": 0,
+        }
+
+        checkpoint_path = self._checkpoint_path(slate_id)
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                checkpoint.update(json.load(f))
+
+        # Only files this harvester named are removed, never anything else in
+        # output_dir
+        for year, part_number in checkpoint["in_progress"]:
+            for df_name in ["df_drafts", "df_league_info"]:
+                file_path = self._part_path(year, slate_id, df_name, part_number)
+
+                for path in [file_path, file_path + ".tmp"]:
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        checkpoint["in_progress"] = []
+
+        with self._lock:
+            self._checkpoints[slate_id] = checkpoint
+
+    def _save_checkpoints(self, slate_ids: list) -> None:
+        """
+        Replaces each slate's checkpoint in one step so it's never left half
+        written
+        """
+
+        with self._lock:
+            contents = {
+                slate_id: json.dumps(self._checkpoints[slate_id])
+                for slate_id in slate_ids
+            }
+
+        os.makedirs(os.path.join(self.output_dir, CHECKPOINT_FOLDER), exist_ok=True)
+
+        for slate_id, content in contents.items():
+            checkpoint_path = self._checkpoint_path(slate_id)
+
+            temp_path = checkpoint_path + ".tmp"
+            with open(temp_path, "w") as f:
+                f.write(content)
+
+            os.replace(temp_path, checkpoint_path)
+
+
+def _write_parquet(df: pd.DataFrame, file_path: str) -> None:
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    # Columns that mix types (e.g. DEFAULT_VALUE in a numeric column) are
+    # stored as strings
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].map(lambda x: x if x is None else str(x))
+
+    temp_path = file_path + ".tmp"
+    df.to_parquet(temp_path, index=False)
+    os.replace(temp_path, file_path)
+
+
+def read_harvest(output_dir: str, year: str, df_name: str = "df_drafts"):
+    """
+    Reads every Parquet file of df_name written for the year.
+
+    Parameters
+    ----------
+    output_dir : str
+        Folder the harvest was written to.
+    year : str
+        Year of the drafts e.g. '2022'.
+    df_name : str, optional
+        'df_drafts' or 'df_league_info', by default 'df_drafts'.
+
+    Returns
+    -------
+    pd.DataFrame
+        All slates of the year combined.
+    """
+
+    year_path = os.path.join(output_dir, str(year))
+
+    dfs = []
+    for slate_id in sorted(os.listdir(year_path)):
+        folder = os.path.join(year_path, slate_id, df_name)
+        if not os.path.isdir(folder):
+            continue
+
+        for file in sorted(os.listdir(folder)):
+            if file.endswith(".parquet"):
+                dfs.append(pd.read_parquet(os.path.join(folder, file)))
+
+    return pd.concat(dfs, ignore_index=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Harvests every draft of a slate")
+    parser.add_argument("--username", help="Username of the saved headers to use")
+    parser.add_argument("--output-dir", default="data")
+    parser.add_argument(
+        "--slate-type", default="completed", choices=["completed", "settled"]
+    )
+    parser.add_argument("--slate-ids", nargs="+")
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=250)
+    parser.add_argument(
+        "--base-url", help="Sends every request here instead (e.g. the mock api)"
+    )
+    args = parser.parse_args()
+
+    if args.base_url is not None:
+        scrape_site.set_base_urls(args.base_url, args.base_url)
+
+    if args.username is not None:
+        import UD_draft_model.scrapers.scrape_site.pull_bearer_token as pb
+
+        headers = pb.read_headers()[args.username]
+    else:
+        headers = {}
+
+    harvester = Harvester(
+        headers,
+        output_dir=args.output_dir,
+        slate_type=args.slate_type,
+        slate_ids=args.slate_ids,
+        max_workers=args.max_workers,
+        queue_size=args.queue_size,
+        batch_size=args.batch_size,
+    )
+    num_drafts = harvester.harvest()
+
+    print(f"Harvest finished - {num_drafts} drafts written")
+    if len(harvester.failed_draft_ids) > 0:
+        print(f"{len(harvester.failed_draft_ids)} drafts failed and will be retried")
@@ -0,0 +1,242 @@
+"""
+Module is responsible for an on-disk HTTP cache of the reference endpoints
+that rarely change (teams, players, matches, scoring types, contest styles).
+
+Each cached response is stored with its validators (ETag / Last-Modified).
+Later requests for the same url are sent conditionally and a 304 from the API
+is served from disk. The cache is bounded in size and evicts the least
+recently used responses first.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import requests
+
+from UD_draft_model.scrapers.scrape_site.ttl_cache import get_conditional_headers
+
+# Urls of the reference endpoints that are cached by default
+REFERENCE_URL_PATTERNS = [
+    r"/v1/teams$",
+    r"/slates/[^/]+/players$",
+    r"/slates/[^/]+/matches$",
+    r"/v1/scoring_types$",
+    r"/v1/contest_styles$",
+]
+
+
+class HTTPCache:
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = 100 * 1024**2,
+        url_patterns: list = None,
+    ):
+        """
+        Parameters
+        ----------
+        cache_dir : str
+            Folder the responses are stored in.
+        max_bytes : int, optional
+            Max size of the stored bodies before the least recently used are
+            evicted, by default 100 MB.
+        url_patterns : list, optional
+            Regex patterns of the urls to cache, by default
+            REFERENCE_URL_PATTERNS.
+        """
+
+        if url_patterns is None:
+            url_patterns = REFERENCE_URL_PATTERNS
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.url_patterns = [re.compile(pattern) for pattern in url_patterns]
+
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(size for path, size, used in self._list_bodies())
+        self._evict()
+
+    def should_cache(self, url: str) -> bool:
+        path = url.split("?")[0]
+
+        return any(pattern.search(path) for pattern in self.url_patterns)
+
+    def get_conditional_headers(self, url: str) -> dict:
+        """
+        Creates the If-None-Match / If-Modified-Since headers of the cached
+        response or an empty dict if the url isn't cached.
+        """
+
+        meta = self._read_meta(url)
+        if meta is None:
+            with self._lock:
+                self.stats["misses"] += 1
+
+            return {}
+
+        return get_conditional_headers(meta)
+
+    def get_response(self, url: str) -> requests.Response:
+        """
+        Creates a response from the cached body of the url and marks it as
+        recently used. None is returned if the url isn't cached.
+        """
+
+        body_path, meta_path = self._get_paths(url)
+
+        with self._lock:
+            meta = self._read_meta(url)
+
+            try:
+                with open(body_path, "rb") as f:
+                    body = f.read()
+            except FileNotFoundError:
+                meta = None
+
+            if meta is None:
+                self.stats["misses"] += 1
+                return None
+
+            os.utime(body_path)
+            self.stats["hits"] += 1
+
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        response._content = body
+        response.encoding = "utf-8"
+        response.headers.update(meta["headers"])
+
+        return response
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """
+        Stores a 200 response that has validators. Anything else can't be
+        revalidated so it isn't stored.
+        """
+
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+
+        if response.status_code != 200 or (etag is None and last_modified is None):
+            return
+
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last-modified": last_modified,
+            # The validators are kept so a response served from disk can be
+            # revalidated by the caller too (e.g. ContestRefs)
+            "headers": {
+                header: response.headers[header]
+                for header in ["content-type", "etag", "last-modified"]
+                if header in response.headers
+            },
+        }
+
+        body_path, meta_path = self._get_paths(url)
+
+        with self._lock:
+            old_size = _get_size(body_path)
+
+            _write_atomic(body_path, response.content)
+            _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+            self._size += len(response.content) - old_size
+            self.stats["stores"] += 1
+
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for body_path, size, used in self._list_bodies():
+                self._remove(body_path)
+
+            self._size = 0
+
+    def _evict(self) -> None:
+        """Removes the least recently used responses until under max_bytes"""
+
+        if self._size <= self.max_bytes:
+            return
+
+        bodies = sorted(self._list_bodies(), key=lambda body: body[2])
+
+        for body_path, size, used in bodies:
+            if self._size <= self.max_bytes:
+                break
+
+            self._remove(body_path)
+            self._size -= size
+            self.stats["evictions"] += 1
+
+    def _list_bodies(self) -> list:
+        """(path, size, last used) of every stored body"""
+
+        bodies = []
+        for file in os.listdir(self.cache_dir):
+            if not file.endswith(".body"):
+                continue
+
+            path = os.path.join(self.cache_dir, file)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            bodies.append((path, stat.st_size, stat.st_mtime))
+
+        return bodies
+
+    def _remove(self, body_path: str) -> None:
+        meta_path = body_path[: -len(".body")] + ".json"
+
+        for path in [body_path, meta_path]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _read_meta(self, url: str) -> dict:
+        body_path, meta_path = self._get_paths(url)
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Guards against a hash collision
+        if meta.get("url") != url:
+            return None
+
+        return meta
+
+    def _get_paths(self, url: str) -> tuple:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        path = os.path.join(self.cache_dir, key)
+
+        return path + ".body", path + ".json"
+
+
+def _get_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    temp_path = f"{path}.{threading.get_ident()}.{time.monotonic_ns()}.tmp"
+
+    with open(temp_path, "wb") as f:
+        f.write(data)
+
+    os.replace(temp_path, path)
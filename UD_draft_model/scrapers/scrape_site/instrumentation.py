@@ -0,0 +1,295 @@
+"""
+Module is responsible for recording where the scrapers spend their time. Every
+request is grouped by endpoint (its url path with the ids replaced by '{id}')
+and the request count, latency histogram, response bytes, retries, throttle
+waits, JSON decode time and JSON-to-df parse time are tracked for each.
+
+The metrics can be viewed as a summary df or exported to Prometheus when
+prometheus-client is installed.
+"""
+
+import bisect
+import re
+import threading
+from urllib.parse import urlparse
+
+import pandas as pd
+
+try:
+    from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+except ImportError:
+    CounterMetricFamily = None
+    HistogramMetricFamily = None
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float("inf"))
+
+# Path segments that are ids (UUIDs or numbers)
+_ID_SEGMENT = re.compile(
+    r"^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)$", re.I
+)
+
+# Counters tracked for each endpoint
+_COUNTERS = (
+    "requests",
+    "errors",
+    "bytes",
+    "retries",
+    "throttle_time",
+    "decode_time",
+    "parse_time",
+    "parse_rows",
+    "failures",
+)
+
+
+def get_endpoint(url: str) -> str:
+    """
+    Groups urls by endpoint e.g.
+    https://api.underdogfantasy.com/v2/drafts/<uuid>?page=2 -> /v2/drafts/{id}
+    """
+
+    path = urlparse(url).path
+
+    segments = [
+        "{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")
+    ]
+
+    return "/".join(segments)
+
+
+class Instrumentation:
+    def __init__(self, latency_buckets: tuple = LATENCY_BUCKETS):
+        """
+        Thread-safe per-endpoint metrics.
+
+        Parameters
+        ----------
+        latency_buckets : tuple, optional
+            Upper bounds (seconds) of the latency histogram buckets, by default
+            LATENCY_BUCKETS.
+        """
+
+        self.latency_buckets = tuple(latency_buckets)
+
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+        # Endpoint of the last request sent by each thread, used to attribute
+        # the decode and parse time that follows it
+        self._local = threading.local()
+
+    def record_request(
+        self, url: str, latency: float, num_bytes: int, status_code: int = None
+    ) -> None:
+        """
+        Records one request sent to the API. status_code is None when the
+        request failed without a response.
+        """
+
+        endpoint = self.set_current_endpoint(url)
+
+        with self._lock:
+            metrics = self._get_metrics(endpoint)
+
+            metrics["requests"] += 1
+            metrics["bytes"] += num_bytes
+            if status_code is None or status_code >= 400:
+                metrics["errors"] += 1
+
+            i = bisect.bisect_left(self.latency_buckets, latency)
+            metrics["latency_counts"][min(i, len(self.latency_buckets) - 1)] += 1
+            metrics["latency_sum"] += latency
+            metrics["latency_max"] = max(metrics["latency_max"], latency)
+
+    def record_retry(self, url: str, wait: float) -> None:
+        self._add(get_endpoint(url), retries=1, throttle_time=wait)
+
+    def record_throttle(self, url: str, wait: float) -> None:
+        """Records time spent waiting on the rate limiter"""
+
+        if wait > 0:
+            self._add(get_endpoint(url), throttle_time=wait)
+
+    def record_decode(self, seconds: float, url: str = None) -> None:
+        self._add(self._get_endpoint(url), decode_time=seconds)
+
+    def record_parse(self, seconds: float, num_rows: int, url: str = None) -> None:
+        """Records the time spent converting records of the endpoint into a df"""
+
+        self._add(self._get_endpoint(url), parse_time=seconds, parse_rows=num_rows)
+
+    def record_failure(self, url: str = None) -> None:
+        """Records a scraper method that failed after pulling from the endpoint"""
+
+        self._add(self._get_endpoint(url), failures=1)
+
+    def set_current_endpoint(self, url: str) -> str:
+        endpoint = get_endpoint(url)
+        self._local.endpoint = endpoint
+
+        return endpoint
+
+    def summarize(self) -> pd.DataFrame:
+        """
+        Creates an endpoint level df of the metrics, slowest endpoints first.
+        Latency percentiles are the upper bound of the histogram bucket they
+        fall in.
+        """
+
+        endpoints = self._copy_metrics()
+
+        rows = []
+        for endpoint, metrics in endpoints.items():
+            requests = metrics["requests"]
+
+            rows.append(
+                {
+                    "endpoint": endpoint,
+                    "requests": requests,
+                    "errors": metrics["errors"],
+                    "retries": metrics["retries"],
+                    "mb": metrics["bytes"] / 1024**2,
+                    "latency_mean": metrics["latency_sum"] / max(requests, 1),
+                    "latency_p50": self._get_percentile(metrics, 0.5),
+                    "latency_p95": self._get_percentile(metrics, 0.95),
+                    "latency_max": metrics["latency_max"],
+                    "latency_total": metrics["latency_sum"],
+                    "throttle_time": metrics["throttle_time"],
+                    "decode_time": metrics["decode_time"],
+                    "parse_time": metrics["parse_time"],
+                    "parse_rows": metrics["parse_rows"],
+                    "failures": metrics["failures"],
+                }
+            )
+
+        if len(rows) == 0:
+            return pd.DataFrame(columns=["endpoint"])
+
+        df = pd.DataFrame(rows)
+        df = df.sort_values(by="latency_total", ascending=False).reset_index(drop=True)
+
+        return df
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints = {}
+
+    def collect(self):
+        """
+        Yields the metrics as Prometheus metric families. This lets the
+        instrumentation be registered as a custom collector:
+        prometheus_client.REGISTRY.register(get_instrumentation())
+        """
+
+        if CounterMetricFamily is None:
+            raise ImportError("prometheus-client must be installed to export metrics")
+
+        endpoints = self._copy_metrics()
+
+        counters = {
+            "requests": ("ud_scraper_requests", "Requests sent"),
+            "errors": ("ud_scraper_errors", "Requests that failed or returned >= 400"),
+            "bytes": ("ud_scraper_response_bytes", "Bytes of response bodies"),
+            "retries": ("ud_scraper_retries", "Requests retried"),
+            "throttle_time": (
+                "ud_scraper_throttle_seconds",
+                "Seconds waiting on the rate limiter and retry backoffs",
+            ),
+            "decode_time": ("ud_scraper_decode_seconds", "Seconds decoding JSON"),
+            "parse_time": (
+                "ud_scraper_parse_seconds",
+                "Seconds converting JSON records to dfs",
+            ),
+            "failures": ("ud_scraper_failures", "Scraper methods that failed"),
+        }
+
+        for stat, (name, documentation) in counters.items():
+            family = CounterMetricFamily(name, documentation, labels=["endpoint"])
+            for endpoint, metrics in endpoints.items():
+                family.add_metric([endpoint], metrics[stat])
+
+            yield family
+
+        histogram = HistogramMetricFamily(
+            "ud_scraper_request_latency_seconds",
+            "Latency of the requests sent",
+            labels=["endpoint"],
+        )
+        for endpoint, metrics in endpoints.items():
+            buckets = []
+            cumulative = 0
+            for bound, count in zip(self.latency_buckets, metrics["latency_counts"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else str(bound)
+                buckets.append((le, cumulative))
+
+            histogram.add_metric([endpoint], buckets, metrics["latency_sum"])
+
+        yield histogram
+
+    def _copy_metrics(self) -> dict:
+        with self._lock:
+            return {
+                endpoint: {**metrics, "latency_counts": list(metrics["latency_counts"])}
+                for endpoint, metrics in self._endpoints.items()
+            }
+
+    def _get_percentile(self, metrics: dict, percentile: float) -> float:
+        requests = sum(metrics["latency_counts"])
+        if requests == 0:
+            return None
+
+        cumulative = 0
+        for bound, count in zip(self.latency_buckets, metrics["latency_counts"]):
+            cumulative += count
+            if cumulative >= percentile * requests:
+                # The max is a tighter bound for the last bucket
+                return min(bound, metrics["latency_max"])
+
+    def _get_endpoint(self, url: str = None) -> str:
+        if url is not None:
+            return get_endpoint(url)
+
+        return getattr(self._local, "endpoint", "unknown")
+
+    def _add(self, endpoint: str, **increments) -> None:
+        with self._lock:
+            metrics = self._get_metrics(endpoint)
+
+            for stat, increment in increments.items():
+                metrics[stat] += increment
+
+    def _get_metrics(self, endpoint: str) -> dict:
+        """Must be called while holding the lock"""
+
+        if endpoint not in self._endpoints:
+            metrics = {stat: 0 for stat in _COUNTERS}
+            metrics["latency_counts"] = [0] * len(self.latency_buckets)
+            metrics["latency_sum"] = 0.0
+            metrics["latency_max"] = 0.0
+
+            self._endpoints[endpoint] = metrics
+
+        return self._endpoints[endpoint]
+
+
+_instrumentation = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Returns the process-wide Instrumentation every Transport records to"""
+
+    return _instrumentation
+
+
+def start_prometheus_server(port: int = 8000) -> None:
+    """
+    Registers the process-wide instrumentation with prometheus-client and
+    serves the metrics at http://localhost:{port}/metrics.
+    """
+
+    from prometheus_client import REGISTRY, start_http_server
+
+    REGISTRY.register(_instrumentation)
+    start_http_server(port)
@@ -0,0 +1,138 @@
+"""
+Module is responsible for decoding the API's JSON responses. The fastest
+backend that's installed is used (orjson, then simdjson, then the stdlib json
+module) and responses are decoded straight from their raw bytes rather than
+through response.text.
+
+The backend can be forced with the UD_JSON_BACKEND environment variable.
+Whichever backend is used, a body that isn't valid JSON (e.g. an HTML error
+page) raises JSONDecodeError.
+"""
+
+import json
+import os
+import time
+
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+BACKENDS = ("orjson", "simdjson", "json")
+
+
+class JSONDecodeError(requests.JSONDecodeError):
+    """
+    Raised for a body that isn't valid JSON by every backend. It's a
+    ValueError and the same error response.json() raises, so existing
+    handlers still catch it.
+    """
+
+
+def get_available_backends() -> list:
+    available = {"orjson": orjson, "simdjson": simdjson, "json": json}
+
+    return [backend for backend in BACKENDS if available[backend] is not None]
+
+
+class JSONDecoder:
+    def __init__(self, backend: str = None, from_bytes: bool = True):
+        """
+        Parameters
+        ----------
+        backend : str, optional
+            'orjson', 'simdjson' or 'json', by default the fastest backend
+            that's installed.
+        from_bytes : bool, optional
+            Decodes the raw bytes of the response as UTF-8 (which the API
+            always sends). When False, response.text is decoded instead which
+            may have to guess the encoding first, by default True.
+
+        Raises
+        ------
+        ValueError
+            If the backend isn't installed.
+        """
+
+        if backend is None:
+            backend = get_available_backends()[0]
+
+        if backend not in get_available_backends():
+            raise ValueError(
+                f"{backend} isn't installed - use one of {get_available_backends()}"
+            )
+
+        self.backend = backend
+        self.from_bytes = from_bytes
+
+        if backend == "orjson":
+            self._loads = orjson.loads
+        elif backend == "simdjson":
+            self._loads = simdjson.loads
+        else:
+            # The stdlib is faster on text than on bytes
+            self._loads = lambda content: json.loads(
+                content.decode("utf-8") if isinstance(content, bytes) else content
+            )
+
+    def decode(self, response: requests.Response):
+        """
+        Decodes the body of the response.
+
+        Raises
+        ------
+        JSONDecodeError
+            If the body isn't valid JSON or UTF-8.
+        """
+
+        try:
+            if self.from_bytes:
+                return self._loads(response.content)
+
+            return self._loads(response.text)
+        except ValueError as e:
+            # Each backend raises its own error (UnicodeDecodeError is a
+            # ValueError too)
+            raise JSONDecodeError(
+                getattr(e, "msg", str(e)), response.text, getattr(e, "pos", 0) or 0
+            ) from e
+
+    def decode_timed(self, response: requests.Response) -> tuple:
+        """
+        Returns
+        -------
+        tuple
+            (decoded body, seconds spent decoding)
+        """
+
+        start = time.perf_counter()
+        data = self.decode(response)
+
+        return data, time.perf_counter() - start
+
+
+_default_decoder = None
+
+
+def get_default_decoder() -> JSONDecoder:
+    """Returns the process-wide JSONDecoder used by the scraper classes"""
+
+    global _default_decoder
+
+    if _default_decoder is None:
+        _default_decoder = JSONDecoder(os.environ.get("UD_JSON_BACKEND") or None)
+
+    return _default_decoder
+
+
+def set_default_decoder(decoder: JSONDecoder) -> None:
+    global _default_decoder
+
+    _default_decoder = decoder
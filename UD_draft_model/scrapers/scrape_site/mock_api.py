@@ -0,0 +1,597 @@
+"""
+Module is responsible for a local stand-in of the Underdog API so that the
+scraper classes can be run (and benchmarked) offline.
+
+Every endpoint used by scrape_league_data is served from one server with
+synthesized payloads. Latency and errors (429s with Retry-After and 503s) can
+be injected to exercise the transport's concurrency limits and retry policy.
+
+Usage:
+    python -m UD_draft_model.scrapers.scrape_site.mock_api --num-drafts 200
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+POSITIONS = ["QB", "RB", "WR", "TE"]
+TEAM_ABBRS = [
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE",
+    "DAL", "DEN", "DET", "GB", "HOU", "IND", "JAX", "KC",
+    "LAC", "LAR", "LV", "MIA", "MIN", "NE", "NO", "NYG",
+    "NYJ", "PHI", "PIT", "SEA", "SF", "TB", "TEN", "WAS",
+]  # fmt: skip
+
+
+def _id(*parts) -> str:
+    """Deterministic UUID so the same request always returns the same ids"""
+
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, "/".join(str(p) for p in parts)))
+
+
+class MockPayloads:
+    def __init__(
+        self,
+        num_drafts: int = 50,
+        num_teams: int = 12,
+        num_rounds: int = 18,
+        num_players: int = 400,
+        num_tourney_rounds: int = 2,
+        page_size: int = 25,
+        seed: int = 0,
+    ):
+        """
+        Synthesizes the payload of every endpoint used by the scrapers.
+
+        Parameters
+        ----------
+        num_drafts : int, optional
+            Number of drafts in each completed/settled draft list, by default 50.
+        num_teams : int, optional
+            Number of entries per draft, by default 12.
+        num_rounds : int, optional
+            Number of rounds per draft, by default 18.
+        num_players : int, optional
+            Number of appearances on the slate, by default 400.
+        num_tourney_rounds : int, optional
+            Number of tournament rounds on each slate, by default 2.
+        page_size : int, optional
+            Number of drafts per page of the draft lists, by default 25.
+        seed : int, optional
+            Seed for the synthesized values, by default 0.
+        """
+
+        self.num_drafts = num_drafts
+        self.num_teams = num_teams
+        self.num_rounds = num_rounds
+        self.num_players = num_players
+        self.num_tourney_rounds = num_tourney_rounds
+        self.page_size = page_size
+        self.seed = seed
+
+        self.slate_id = _id("slate")
+        self.scoring_type_id = _id("scoring_type")
+        self.contest_style_id = _id("contest_style")
+        # The drafts and the player scores use different ids for the same weeks
+        self.draft_week_1_id = 78
+
+        self.teams = [
+            {"id": _id("team", abbr), "abbr": abbr, "name": f"{abbr} Team"}
+            for abbr in TEAM_ABBRS
+        ]
+        self.players = self._create_players()
+
+    def _create_players(self) -> list:
+        rng = random.Random(self.seed)
+
+        players = []
+        for i in range(self.num_players):
+            team = self.teams[i % len(self.teams)]
+            position = POSITIONS[rng.randrange(len(POSITIONS))]
+            players.append(
+                {
+                    "player_id": _id("player", i),
+                    "appearance_id": _id("appearance", i),
+                    "first_name": f"First{i}",
+                    "last_name": f"Last{i}",
+                    "position": position,
+                    "position_id": _id("position", position),
+                    "team_id": team["id"],
+                    "adp": round(i + 1 + rng.random(), 1),
+                    "points": round(max(0, 350 - i * 0.8 + rng.gauss(0, 10)), 1),
+                }
+            )
+
+        return players
+
+    def draft_ids(self, source: str) -> list:
+        return [_id("draft", source, i) for i in range(self.num_drafts)]
+
+    def draft(self, draft_id: str) -> dict:
+        entries = [
+            {
+                "id": _id("entry", draft_id, i),
+                "pick_order": i + 1,
+                "user_id": _id("user", draft_id, i),
+            }
+            for i in range(self.num_teams)
+        ]
+        users = [
+            {"id": entry["user_id"], "username": f"user_{i + 1}"}
+            for i, entry in enumerate(entries)
+        ]
+
+        picks = []
+        for number in range(1, self.num_teams * self.num_rounds + 1):
+            round_index = (number - 1) // self.num_teams
+            slot = (number - 1) % self.num_teams
+            if round_index % 2 == 1:
+                slot = self.num_teams - 1 - slot
+
+            player = self.players[(number - 1) % len(self.players)]
+            picks.append(
+                {
+                    "id": _id("pick", draft_id, number),
+                    "appearance_id": player["appearance_id"],
+                    "created_at": "2022-08-10T21:42:52Z",
+                    "draft_entry_id": entries[slot]["id"],
+                    "number": number,
+                    "pick_slot_id": _id("pick_slot", slot),
+                    "points": player["points"] / 17,
+                    "projection_adp": player["adp"],
+                    "projection_average": None,
+                    "projection_points": player["points"],
+                    "swapped": False,
+                }
+            )
+
+        return {"draft": {"picks": picks, "draft_entries": entries, "users": users}}
+
+    def weekly_scores(self, draft_id: str) -> dict:
+        rng = random.Random(draft_id)
+
+        scores = []
+        for week in range(17):
+            points = {
+                _id("entry", draft_id, i): round(rng.uniform(60, 180), 2)
+                for i in range(self.num_teams)
+            }
+            scores.append(
+                {
+                    "id": _id("weekly_score", draft_id, week),
+                    "week": {"id": self.draft_week_1_id + week, "status": "final"},
+                    "draft_entries_points": points,
+                }
+            )
+
+        return {"draft_weekly_scores": scores}
+
+    def league(self, draft_id: str) -> dict:
+        return {
+            "id": draft_id,
+            "clock": 30,
+            "contest_style_id": self.contest_style_id,
+            "draft_at": "2022-08-10T21:42:36Z",
+            "draft_type": "fast",
+            "entry_count": self.num_teams,
+            "slate_id": self.slate_id,
+            "source": "tournament",
+            "status": "live",
+            "title": "Mock Draft",
+        }
+
+    def league_page(self, source: str, page: int) -> dict:
+        draft_ids = self.draft_ids(source)
+        start = (page - 1) * self.page_size
+
+        drafts = [
+            self.league(draft_id)
+            for draft_id in draft_ids[start : start + self.page_size]
+        ]
+
+        return {"drafts": drafts}
+
+    def active_drafts(self) -> dict:
+        drafts = []
+        for draft_id in self.draft_ids("active")[:3]:
+            draft = self.league(draft_id)
+            draft["status"] = "drafting"
+            draft["draft_entry_id"] = _id("entry", draft_id, 0)
+            drafts.append(draft)
+
+        return {"drafts": drafts}
+
+    def slates(self) -> dict:
+        slate = {
+            "id": self.slate_id,
+            "contest_style_ids": [self.contest_style_id],
+            "description": "Mock slate",
+            "title": "Mock Best Ball",
+            "draft_count": self.num_drafts,
+            "tournament_draft_count": self.num_drafts * self.num_tourney_rounds,
+        }
+
+        return {"slates": [slate]}
+
+    def tournament_rounds(self) -> dict:
+        rounds = [
+            {
+                "id": _id("tournament_round", i),
+                "title": f"Mock Tournament Round {i + 1}",
+                "tournament": {"id": _id("tournament", i)},
+            }
+            for i in range(self.num_tourney_rounds)
+        ]
+
+        return {"tournament_rounds": rounds}
+
+    def players_list(self) -> dict:
+        players = [
+            {
+                "id": player["player_id"],
+                "first_name": player["first_name"],
+                "last_name": player["last_name"],
+                "image_url": None,
+                "position_id": player["position_id"],
+                "team_id": player["team_id"],
+            }
+            for player in self.players
+        ]
+
+        return {"players": players}
+
+    def appearances(self, week: int = None) -> dict:
+        rng = random.Random(week)
+
+        pos_ranks = {position: 0 for position in POSITIONS}
+        appearances = []
+        for player in self.players:
+            pos_ranks[player["position"]] += 1
+
+            if week is None:
+                score = None
+                points = player["points"]
+            else:
+                points = round(player["points"] / 17, 2)
+                score = {"points": round(max(0, rng.gauss(points, 5)), 2)}
+
+            appearances.append(
+                {
+                    "id": player["appearance_id"],
+                    "latest_news_item_updated_at": None,
+                    "player_id": player["player_id"],
+                    "position_id": player["position_id"],
+                    "team_id": player["team_id"],
+                    "projection": {
+                        "id": _id("projection", player["appearance_id"]),
+                        "adp": str(player["adp"]),
+                        "points": str(points),
+                        "position_rank": (
+                            player["position"] + str(pos_ranks[player["position"]])
+                        ),
+                        "scoring_type_id": self.scoring_type_id,
+                    },
+                    "score": score,
+                }
+            )
+
+        return {"appearances": appearances}
+
+    def matches(self) -> dict:
+        bye_weeks = [
+            {"id": _id("bye", team["id"]), "team_id": team["id"], "week": 6 + i % 9}
+            for i, team in enumerate(self.teams)
+        ]
+        for bye_week in bye_weeks:
+            bye_week["year"] = 2022
+
+        return {"matches": [{"bye_weeks": bye_weeks}]}
+
+    def scoring_types(self) -> dict:
+        return {
+            "scoring_types": [
+                {"id": self.scoring_type_id, "sport_id": "NFL", "title": "Best Ball"}
+            ]
+        }
+
+    def contest_styles(self) -> dict:
+        return {
+            "contest_styles": [
+                {
+                    "id": self.contest_style_id,
+                    "sport_id": "NFL",
+                    "scoring_type_id": self.scoring_type_id,
+                    "rounds": self.num_rounds,
+                }
+            ]
+        }
+
+
+class MockUnderdogAPI:
+    def __init__(
+        self,
+        payloads: MockPayloads = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.1,
+    ):
+        """
+        Local HTTP server that serves the MockPayloads for every endpoint the
+        scraper classes use. Point the scrapers at it with
+        scrape_league_data.set_base_urls(server.url, server.url).
+
+        Parameters
+        ----------
+        payloads : MockPayloads, optional
+            Payloads to serve, by default MockPayloads().
+        host : str, optional
+            Host to bind, by default "127.0.0.1".
+        port : int, optional
+            Port to bind, by default 0 which picks a free port.
+        latency : float, optional
+            Seconds added to every response, by default 0.
+        latency_jitter : float, optional
+            Max random seconds added on top of latency, by default 0.
+        error_rate : float, optional
+            Fraction of requests that return a 503, by default 0.
+        throttle_rate : float, optional
+            Fraction of requests that return a 429, by default 0.
+        retry_after : float, optional
+            Retry-After seconds sent with each 429, by default 0.1.
+        """
+
+        if payloads is None:
+            payloads = MockPayloads()
+
+        self.payloads = payloads
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0, "not_modified": 0}
+        self._stats_lock = threading.Lock()
+        self._rng = random.Random(payloads.seed)
+
+        self.server = ThreadingHTTPServer((host, port), self._create_handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+        self.routes = [
+            (r"/v2/drafts/([^/]+)", lambda m, q: payloads.draft(m[1])),
+            (
+                r"/v1/drafts/([^/]+)/weekly_scores",
+                lambda m, q: payloads.weekly_scores(m[1]),
+            ),
+            (r"/v3/user/active_drafts", lambda m, q: payloads.active_drafts()),
+            (
+                r"/v2/user/slates/([^/]+)/(\w+)_drafts",
+                lambda m, q: payloads.league_page(m[2], _page(q)),
+            ),
+            (
+                r"/v1/user/slates/([^/]+)/tournament_rounds",
+                lambda m, q: payloads.tournament_rounds(),
+            ),
+            (
+                r"/v1/user/tournament_rounds/([^/]+)/drafts",
+                lambda m, q: payloads.league_page(m[1], _page(q)),
+            ),
+            (r"/v1/sports/nfl/slates", lambda m, q: payloads.slates()),
+            (r"/v2/user/completed_slates", lambda m, q: payloads.slates()),
+            (r"/v1/user/sports/nfl/settled_slates", lambda m, q: payloads.slates()),
+            (r"/v1/slates/([^/]+)/players", lambda m, q: payloads.players_list()),
+            (
+                r"/v1/slates/([^/]+)/scoring_types/([^/]+)/appearances",
+                lambda m, q: payloads.appearances(),
+            ),
+            (
+                r"/v1/weeks/(\d+)/scoring_types/([^/]+)/appearances",
+                lambda m, q: payloads.appearances(int(m[1])),
+            ),
+            (r"/v1/teams", lambda m, q: {"teams": payloads.teams}),
+            (r"/v2/slates/([^/]+)/matches", lambda m, q: payloads.matches()),
+            (r"/v1/scoring_types", lambda m, q: payloads.scoring_types()),
+            (r"/v1/contest_styles", lambda m, q: payloads.contest_styles()),
+            (r"/v1/user", lambda m, q: {"user": {"id": _id("user")}}),
+        ]
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockUnderdogAPI":
+        """Serves requests from a background thread"""
+
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def respond(self, path: str, request_headers: dict = None) -> tuple:
+        """
+        Creates the (status code, headers, body) returned for the path. Every
+        200 carries an ETag and a 304 is returned when the request's
+        If-None-Match matches it.
+        """
+
+        if request_headers is None:
+            request_headers = {}
+
+        self._update_stats("requests")
+
+        delay = self.latency + self._rng.uniform(0, self.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        draw = self._rng.random()
+        if draw < self.throttle_rate:
+            self._update_stats("throttled")
+            return 429, {"retry-after": str(self.retry_after)}, b"{}"
+
+        if draw < self.throttle_rate + self.error_rate:
+            self._update_stats("errors")
+            return 503, {}, b"{}"
+
+        parsed = urlparse(path)
+        query = parse_qs(parsed.query)
+
+        for pattern, create_payload in self.routes:
+            match = re.fullmatch(pattern, parsed.path)
+            if match is not None:
+                body = json.dumps(create_payload(match, query)).encode("utf-8")
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+
+                if request_headers.get("if-none-match") == etag:
+                    self._update_stats("not_modified")
+                    return 304, {"etag": etag}, b""
+
+                headers = {"content-type": "application/json", "etag": etag}
+
+                return 200, headers, body
+
+        return 404, {}, json.dumps({"error": "not found"}).encode("utf-8")
+
+    def _update_stats(self, stat: str) -> None:
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def _create_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                request_headers = {k.lower(): v for k, v in self.headers.items()}
+                status_code, headers, body = api.respond(self.path, request_headers)
+
+                self.send_response(status_code)
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _page(query: dict) -> int:
+    return int(query.get("page", ["1"])[0])
+
+
+def benchmark(
+    api: MockUnderdogAPI, workers: list, num_drafts: int = None, headers: dict = None
+) -> list:
+    """
+    Times how long DraftsDetail takes to pull and parse the drafts served by
+    the api for each number of workers.
+
+    Returns
+    -------
+    list
+        Dicts of the workers, seconds, drafts per second, and requests sent.
+    """
+
+    # Imported here so the server doesn't depend on pandas
+    import UD_draft_model.scrapers.scrape_site.scrape_league_data as scrape_site
+    from UD_draft_model.scrapers.scrape_site.rate_limit import RetryPolicy
+    from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+    if headers is None:
+        headers = {"user-agent": "mock"}
+
+    scrape_site.set_base_urls(api.url, api.url)
+
+    draft_ids = api.payloads.draft_ids("completed")
+    if num_drafts is not None:
+        draft_ids = draft_ids[:num_drafts]
+
+    results = []
+    for max_workers in workers:
+        transport = Transport(
+            pool_maxsize=max(10, max_workers), retry_policy=RetryPolicy()
+        )
+        requests_before = api.stats["requests"]
+
+        start = time.perf_counter()
+        drafts_detail = scrape_site.DraftsDetail(
+            draft_ids, headers, transport=transport, max_workers=max_workers
+        )
+        drafts_detail.create_df_drafts()
+        seconds = time.perf_counter() - start
+
+        results.append(
+            {
+                "workers": max_workers,
+                "seconds": round(seconds, 3),
+                "drafts_per_second": round(len(draft_ids) / seconds, 1),
+                "requests": api.stats["requests"] - requests_before,
+                "retries": transport.stats["retries"],
+            }
+        )
+
+        transport.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Runs the mock Underdog API")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--num-drafts", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--serve", action="store_true", help="Serve until interrupted")
+    args = parser.parse_args()
+
+    api = MockUnderdogAPI(
+        MockPayloads(num_drafts=args.num_drafts),
+        port=args.port,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+
+    with api:
+        if args.serve:
+            print(f"Serving mock Underdog API at {api.url}")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
+        else:
+            for result in benchmark(api, args.workers):
+                print(result)
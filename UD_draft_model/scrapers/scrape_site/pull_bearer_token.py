@@ -1,10 +1,11 @@
 """
 Module is responsible for pulling a bearer token that can be used to scrape the API
+
+The headers are captured from Chrome's performance log as soon as they appear
+rather than after a fixed wait. Only network entries of the log are parsed.
 """
 import time
-import os
 import json
-from requests import JSONDecodeError
 
 from selenium import webdriver
 from selenium.webdriver.common.keys import Keys
@@ -12,6 +13,11 @@ from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.webdriver.chrome.options import Options
 
 import UD_draft_model.scrapers.scrape_site.scrape_league_data as scrape_site
+from UD_draft_model.scrapers.scrape_site.json_decode import JSONDecodeError
+from UD_draft_model.scrapers.scrape_site.token_store import (
+    TOKEN_PATH,
+    get_token_store,
+)
 
 
 def create_webdriver(url, chromedriver_path, username, password):
@@ -41,88 +47,238 @@ def create_webdriver(url, chromedriver_path, username, password):
     return driver
 
 
-def pull_logs(url: str, chromedriver_path: str, username: str, password: str) -> dict:
-    driver = create_webdriver(url, chromedriver_path, username, password)
+# Performance log methods that carry request/response headers
+NETWORK_METHODS = (
+    "Network.requestWillBeSent",
+    "Network.requestWillBeSentExtraInfo",
+    "Network.responseReceived",
+    "Network.responseReceivedExtraInfo",
+)
 
-    time.sleep(5)
-    logs = driver.get_log("performance")
 
-    driver.close()
-    driver.quit()
+class HeaderCaptureTimeout(TimeoutError):
+    """Raised when the headers don't appear in the log before the timeout"""
 
-    return logs
 
+class HeaderCapture:
+    def __init__(self, keep_logs: bool = False):
+        """
+        Incrementally scans performance log entries for the bearer token and
+        user-agent. Entries that aren't network entries are skipped without
+        being parsed.
 
-def pull_bearer_token(logs: dict) -> str:
-    for log in logs:
-        try:
-            log_dict = json.loads(log["message"])
-            bearer_token = log_dict["message"]["params"]["response"]["headers"][
-                "authorization"
-            ]
+        Parameters
+        ----------
+        keep_logs : bool, optional
+            Keeps every entry fed in logs, by default False.
+        """
 
-            if bearer_token[:6] == "Bearer":
-                break
+        self.bearer_token = None
+        self.user_agent = None
+        self.logs = [] if keep_logs else None
 
-        except:
-            pass
+        self.stats = {"entries": 0, "parsed": 0}
 
-    return bearer_token
+    @property
+    def complete(self) -> bool:
+        return self.bearer_token is not None and self.user_agent is not None
 
+    @property
+    def headers(self) -> dict:
+        return {"authorization": self.bearer_token, "user-agent": self.user_agent}
 
-def pull_user_agent(logs: dict) -> str:
-    for log in logs:
-        try:
-            log_dict = json.loads(log["message"])
-            val = log_dict["message"]["params"]["request"]["headers"]["User-Agent"]
-            break
-        except:
-            pass
+    def feed(self, logs: list) -> bool:
+        """
+        Scans the new log entries and returns True once both headers were
+        found.
+        """
 
-    return val
+        if self.logs is not None:
+            self.logs += logs
 
+        for log in logs:
+            self.stats["entries"] += 1
 
-def pull_required_headers(
-    url: str, chromedriver_path: str, username: str, password: str
-) -> dict:
-    logs = pull_logs(url, chromedriver_path, username, password)
+            params = _parse_network_entry(log)
+            if params is None:
+                continue
 
-    bearer_token = pull_bearer_token(logs)
-    user_agent = pull_user_agent(logs)
+            self.stats["parsed"] += 1
 
-    headers = {"authorization": bearer_token, "user-agent": user_agent}
+            for headers in _get_entry_headers(params):
+                self._read_headers(headers)
 
-    return headers
+            if self.complete:
+                return True
 
+        return self.complete
 
-def create_headers_path() -> str:
+    def _read_headers(self, headers: dict) -> None:
+        for header, value in headers.items():
+            header = header.lower()
+
+            if (
+                self.bearer_token is None
+                and header == "authorization"
+                and value[:6] == "Bearer"
+            ):
+                self.bearer_token = value
+            elif self.user_agent is None and header == "user-agent":
+                self.user_agent = value
+
+
+def _parse_network_entry(log: dict) -> dict:
     """
-    Creates the path to the bearer_token data.
+    Returns the params of a network entry or None for any other entry. The
+    method is checked on the raw message before it's parsed.
     """
 
-    relative_path = "scrapers/scrape_site/bearer_token"
+    message = log.get("message", "")
+    if not any(method in message for method in NETWORK_METHODS):
+        return None
 
-    cwd = os.getcwd()
-    folder_end_index = cwd.rfind("UD_draft_model") + len("UD_draft_model")
+    try:
+        log_dict = json.loads(message)["message"]
+    except (ValueError, KeyError, TypeError):
+        return None
 
-    if cwd.rfind("UD_draft_model") == -1:
-        base_path = os.path.join(cwd, "UD_draft_model")
-    else:
-        base_path = cwd[:folder_end_index]
+    if log_dict.get("method") not in NETWORK_METHODS:
+        return None
+
+    return log_dict.get("params", {})
+
+
+def _get_entry_headers(params: dict) -> list:
+    """Every header dict found in the params of a network entry"""
+
+    headers = [params.get("headers")]
+
+    for key in ["request", "response"]:
+        if isinstance(params.get(key), dict):
+            headers.append(params[key].get("headers"))
+            headers.append(params[key].get("requestHeaders"))
 
-    token_dir = os.path.join(base_path, relative_path)
-    token_path = os.path.join(token_dir, "token.json")
+    return [h for h in headers if isinstance(h, dict)]
 
-    return token_path
+
+def capture_headers(
+    driver, timeout: float = 30.0, poll_interval: float = 0.1, keep_logs: bool = False
+) -> HeaderCapture:
+    """
+    Polls the driver's performance log (each call only returns the entries
+    added since the last one) until the bearer token and user-agent appear.
+
+    Parameters
+    ----------
+    driver
+        Webdriver, or anything with a get_log method.
+    timeout : float, optional
+        Seconds to wait for the headers, by default 30.
+    poll_interval : float, optional
+        Seconds between reads of the log, by default 0.1.
+    keep_logs : bool, optional
+        Keeps every entry read in the capture's logs, by default False.
+
+    Raises
+    ------
+    HeaderCaptureTimeout
+        If the headers don't appear before the timeout, e.g. when the
+        credentials are invalid.
+    """
+
+    capture = HeaderCapture(keep_logs)
+    deadline = time.monotonic() + timeout
+
+    while not capture.feed(driver.get_log("performance")):
+        if time.monotonic() >= deadline:
+            raise HeaderCaptureTimeout(
+                f"Headers weren't found in the performance log after {timeout}s"
+            )
+
+        time.sleep(poll_interval)
+
+    return capture
+
+
+def pull_logs(
+    url: str,
+    chromedriver_path: str,
+    username: str,
+    password: str,
+    timeout: float = 30.0,
+) -> list:
+    """
+    Logs in and returns the performance log entries up to the point the
+    bearer token and user-agent appeared. HeaderCaptureTimeout is raised if
+    they don't appear within timeout seconds.
+    """
+
+    driver = create_webdriver(url, chromedriver_path, username, password)
+
+    try:
+        capture = capture_headers(driver, timeout, keep_logs=True)
+    finally:
+        driver.close()
+        driver.quit()
+
+    return capture.logs
+
+
+def pull_bearer_token(logs: list) -> str:
+    capture = HeaderCapture()
+    capture.feed(logs)
+
+    return capture.bearer_token
+
+
+def pull_user_agent(logs: list) -> str:
+    capture = HeaderCapture()
+    capture.feed(logs)
+
+    return capture.user_agent
+
+
+def pull_required_headers(
+    url: str,
+    chromedriver_path: str,
+    username: str,
+    password: str,
+    timeout: float = 30.0,
+) -> dict:
+    """
+    Logs in and returns the headers as soon as they appear in the
+    performance log. HeaderCaptureTimeout is raised if they don't appear
+    within timeout seconds.
+    """
+
+    driver = create_webdriver(url, chromedriver_path, username, password)
+
+    try:
+        capture = capture_headers(driver, timeout)
+    finally:
+        driver.close()
+        driver.quit()
+
+    return capture.headers
+
+
+def create_headers_path() -> str:
+    """
+    Creates the path to the bearer_token data. This is set with
+    UD_TOKEN_PATH rather than depending on the working directory.
+    """
+
+    return TOKEN_PATH
 
 
 def read_headers(file_path: str = None) -> dict:
     """
-    Reads in all user's bearer tokens.
+    Reads in all user's bearer tokens. By default they're read from the
+    process-wide token store, which only reads the file once.
     """
 
     if file_path is None:
-        file_path = create_headers_path()
+        return get_token_store().get_all()
 
     try:
         with open(file_path, "r") as f:
@@ -136,17 +292,11 @@ def read_headers(file_path: str = None) -> dict:
 def save_headers(username: str, headers: dict) -> None:
     """
     Saves the bearer token to a json file to prevent re-scraping the token
-    when it's still active.
+    when it's still active. The file is locked and replaced atomically so
+    concurrent sessions can save at the same time.
     """
 
-    token_path = create_headers_path()
-
-    header_data = read_headers(file_path=token_path)
-
-    header_data[username] = headers
-
-    with open(token_path, "w") as f:
-        json.dump(header_data, f)
+    get_token_store().set(username, headers)
 
     return None
 
@@ -156,11 +306,12 @@ def test_headers(headers: dict) -> bool:
     Returns a True value if the headers are still valid.
     """
 
-    url = "https://api.underdogfantasy.com/v1/user"
     base_data = scrape_site.BaseData(headers)
+    url = base_data.api_base_url + "/v1/user"
     # base_data.auth_header["authorization"] = bearer_token
 
-    # JSONDecodeError thrown when the user-agent is incorrect.
+    # JSONDecodeError thrown when the user-agent is incorrect (the API sends
+    # back an HTML page), whichever JSON backend is used.
     try:
         data = base_data.read_in_site_data(url, headers=base_data.auth_header)
     except JSONDecodeError:
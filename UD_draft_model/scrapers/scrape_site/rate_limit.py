@@ -0,0 +1,174 @@
+"""
+Module is responsible for pacing the requests sent to the API. RateLimiter
+spaces requests out with a token bucket that slows down when the API starts
+throttling and RetryPolicy decides how long to back off before a retry.
+"""
+
+from email.utils import parsedate_to_datetime
+import datetime
+import random
+import threading
+import time
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float = 10,
+        capacity: int = None,
+        min_rate: float = 0.5,
+        recovery: float = 0.1,
+    ):
+        """
+        Thread-safe token bucket shared by every request sent through a
+        Transport. The rate is halved each time the API throttles a request
+        and recovers by a fixed amount after each successful request.
+
+        Parameters
+        ----------
+        rate : float, optional
+            Max number of requests per second, by default 10.
+        capacity : int, optional
+            Max number of requests that can be sent in a burst, by default
+            the rate rounded up.
+        min_rate : float, optional
+            Lowest rate the limiter slows down to, by default 0.5.
+        recovery : float, optional
+            Requests per second added back to the rate after each successful
+            request, by default 0.1.
+        """
+
+        if capacity is None:
+            capacity = max(1, int(rate + 0.999))
+
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.recovery = recovery
+
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Blocks until a request can be sent.
+
+        Returns
+        -------
+        float
+            Seconds spent waiting.
+        """
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+    def on_success(self) -> None:
+        """Speeds the rate back up towards max_rate"""
+
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.recovery)
+
+    def on_throttled(self) -> None:
+        """Halves the rate and empties the bucket"""
+
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = 4,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        retry_statuses: tuple = (429, 500, 502, 503, 504),
+    ):
+        """
+        Determines which responses are retried and how long to wait first.
+
+        Parameters
+        ----------
+        max_retries : int, optional
+            Max number of times a request is retried, by default 4.
+        backoff_factor : float, optional
+            Base of the exponential backoff in seconds, by default 0.5.
+        max_backoff : float, optional
+            Max seconds to wait before a retry, by default 30.
+        retry_statuses : tuple, optional
+            Status codes that are retried, by default 429 and 5xx codes.
+        """
+
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+
+    def should_retry(self, attempt: int, status_code: int = None) -> bool:
+        """
+        Returns True if the request should be sent again. status_code is None
+        when the request failed without a response (e.g. a timeout).
+        """
+
+        if attempt >= self.max_retries:
+            return False
+
+        return status_code is None or status_code in self.retry_statuses
+
+    def get_wait(self, attempt: int, retry_after: str = None) -> float:
+        """
+        Seconds to wait before the next attempt. The Retry-After header is
+        used when the API sends one, otherwise this is an exponential backoff
+        with full jitter.
+        """
+
+        wait = _parse_retry_after(retry_after)
+
+        if wait is None:
+            wait = random.uniform(0, self.backoff_factor * (2**attempt))
+
+        return min(self.max_backoff, wait)
+
+
+def _parse_retry_after(retry_after: str):
+    """Converts a Retry-After header (seconds or an HTTP date) to seconds"""
+
+    if retry_after is None:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    return max(0.0, (retry_at - now).total_seconds())
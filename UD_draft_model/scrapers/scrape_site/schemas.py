@@ -0,0 +1,258 @@
+"""
+Module is responsible for converting the lists of records returned by the API
+into dfs. Each endpoint declares a Schema that describes the columns to build
+and build_df creates each column in a single pass over the records.
+"""
+
+import pandas as pd
+
+# Value used when a record doesn't contain a column
+DEFAULT_VALUE = "N/A"
+
+
+class Schema:
+    def __init__(
+        self,
+        columns: list = None,
+        nested: dict = None,
+        defaults: dict = None,
+        dtypes: dict = None,
+        drop: list = None,
+        flatten: dict = None,
+    ):
+        """
+        Describes how a list of API records is converted into a df.
+
+        Parameters
+        ----------
+        columns : list, optional
+            Keys of each record to create columns for. By default, the keys of
+            the first record are used.
+        nested : dict, optional
+            {column: path} of values to pull out of nested dicts/lists where
+            path is a '.' separated string of keys (or list indexes)
+            e.g. {'tournament_id': 'tournament.id'}. A column that's also in
+            columns is replaced in place, as is a key of a flattened dict
+            whose path it points to. Otherwise, it's added to the end.
+        defaults : dict, optional
+            {column: value} used when a record doesn't contain the column,
+            by default DEFAULT_VALUE.
+        dtypes : dict, optional
+            {column: dtype} applied once the df is built.
+        drop : list, optional
+            Keys that are never turned into columns.
+        flatten : dict, optional
+            {key: [keys to skip]} of nested dicts whose keys are all turned
+            into columns (except the ones skipped) while the outer records
+            are parsed. The nested keys are taken from the first record that
+            contains the dict.
+        """
+
+        self.columns = columns
+        self.nested = nested if nested is not None else {}
+        self.defaults = defaults if defaults is not None else {}
+        self.dtypes = dtypes if dtypes is not None else {}
+        self.drop = drop if drop is not None else []
+        self.flatten = flatten if flatten is not None else {}
+
+        self._nested_keys = {
+            col: [int(key) if key.isdigit() else key for key in path.split(".")]
+            for col, path in self.nested.items()
+        }
+
+        # {(outer key, key): column} of flattened keys that are renamed
+        self._renamed_keys = {
+            tuple(keys): col
+            for col, keys in self._nested_keys.items()
+            if len(keys) == 2 and keys[0] in self.flatten
+        }
+
+    def get_columns(self, records: list) -> list:
+        """
+        Creates the final list of columns given the records being converted.
+        """
+
+        if self.columns is None:
+            columns = list(records[0].keys())
+        else:
+            columns = list(self.columns)
+
+        columns = [col for col in columns if col not in self.drop]
+        columns += [
+            col for col in self._get_flattened_keys(records) if col not in columns
+        ]
+        columns += [col for col in self.nested if col not in columns]
+
+        return columns
+
+    def get_paths(self, records: list) -> dict:
+        """
+        Creates {column: [keys]} for every column that's pulled out of a
+        nested dict/list.
+        """
+
+        paths = self._get_flattened_keys(records)
+        paths.update(self._nested_keys)
+
+        return paths
+
+    def _get_flattened_keys(self, records: list) -> dict:
+        """
+        Creates {column: [outer key, nested key]} for every key of the dicts
+        being flattened, in the order the keys appear.
+        """
+
+        flattened_keys = {}
+        for outer_key, skip_keys in self.flatten.items():
+            nested = next(
+                (
+                    record[outer_key]
+                    for record in records
+                    if isinstance(record.get(outer_key), dict)
+                ),
+                {},
+            )
+
+            for key in nested:
+                if key not in skip_keys:
+                    col = self._renamed_keys.get((outer_key, key), key)
+                    flattened_keys[col] = [outer_key, key]
+
+        return flattened_keys
+
+
+def build_df(records: list, schema: Schema = None) -> pd.DataFrame:
+    """
+    Converts a list of dictionaries into a df where each column is built with
+    one pass over the records.
+
+    Parameters
+    ----------
+    records : list
+        Dicts returned by the API.
+    schema : Schema, optional
+        Describes the columns to build, by default the keys of the first
+        record are used for the columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per record.
+
+    Raises
+    ------
+    IndexError
+        If records is empty. Callers rely on this to detect endpoints that
+        haven't returned any data yet.
+    """
+
+    if len(records) == 0:
+        raise IndexError("No records found to build df from")
+
+    if schema is None:
+        schema = Schema()
+
+    paths = schema.get_paths(records)
+
+    data = {}
+    for col in schema.get_columns(records):
+        default = schema.defaults.get(col, DEFAULT_VALUE)
+
+        if col in paths:
+            keys = paths[col]
+            data[col] = [_get_nested_value(record, keys, default) for record in records]
+        else:
+            data[col] = [record.get(col, default) for record in records]
+
+    df = pd.DataFrame(data)
+
+    if len(schema.dtypes) > 0:
+        df = df.astype(schema.dtypes)
+
+    return df
+
+
+def _get_nested_value(record, keys: list, default):
+    """Follows keys into the nested dicts/lists of the record"""
+
+    value = record
+    for key in keys:
+        if isinstance(value, dict):
+            if key not in value:
+                return default
+        elif isinstance(value, list):
+            if not isinstance(key, int) or key >= len(value):
+                return default
+        else:
+            return default
+
+        value = value[key]
+
+    return value
+
+
+##############################################################
+##################### Endpoint Schemas #######################
+##############################################################
+
+# v2/drafts/{id}
+PICKS = Schema(drop=["projection_average"])
+DRAFT_ENTRIES = Schema()
+USERS = Schema(columns=["id", "username"])
+
+# v1/drafts/{id}/weekly_scores
+WEEKLY_SCORES = Schema(
+    nested={"week_id": "week.id", "status": "week.status"}, drop=["week"]
+)
+
+# v3/user/active_drafts
+ACTIVE_DRAFTS = Schema()
+
+# v2/user/slates/{id}/{slate_type}_drafts
+LEAGUES = Schema()
+
+# v1/user/slates/{id}/tournament_rounds
+TOURNAMENT_ROUNDS = Schema(
+    nested={"tournament_id": "tournament.id"}, drop=["tournament"]
+)
+
+# Slates (only one contest style id is ever stored in the list)
+SLATES = Schema(nested={"contest_style_ids": "contest_style_ids.0"})
+
+# v1/slates/{id}/players
+PLAYERS = Schema(drop=["image_url"])
+
+# v1/slates/{id}/scoring_types/{id}/appearances
+APPEARANCES = Schema(
+    nested={"season_projected_points": "projection.points"},
+    flatten={"projection": ["id", "scoring_type_id"]},
+    drop=["latest_news_item_updated_at", "score", "projection"],
+)
+
+# v1/weeks/{id}/scoring_types/{id}/appearances
+PLAYER_SCORES = Schema(
+    nested={"projected_points": "projection.points", "actual_points": "score.points"},
+    drop=["latest_news_item_updated_at", "projection", "score"],
+)
+
+# Columns of the player scores when no week has any scores yet
+PLAYER_SCORES_COLUMNS = [
+    "id",
+    "player_id",
+    "position_id",
+    "team_id",
+    "projected_points",
+    "actual_points",
+]
+
+# v1/teams
+TEAMS = Schema(columns=["id", "abbr", "name"])
+
+# v2/slates/{id}/matches
+BYE_WEEKS = Schema(
+    drop=["id", "year"], defaults={"week": None}, dtypes={"week": pd.Int64Dtype()}
+)
+
+# v1/scoring_types and v1/contest_styles
+SCORING_TYPES = Schema()
+CONTEST_STYLES = Schema()
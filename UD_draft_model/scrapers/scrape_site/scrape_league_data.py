@@ -1,10 +1,58 @@
-import requests
-import pandas as pd
+from itertools import chain
+import os
+import threading
 import time
 
+import pandas as pd
+
+import UD_draft_model.scrapers.scrape_site.schemas as schemas
+from UD_draft_model.scrapers.scrape_site.dtypes import DtypePolicy
+from UD_draft_model.scrapers.scrape_site.json_decode import get_default_decoder
+from UD_draft_model.scrapers.scrape_site.concurrency import (
+    iter_pages,
+    map_concurrent,
+)
+from UD_draft_model.scrapers.scrape_site.transport import (
+    Transport,
+    get_default_transport,
+)
+from UD_draft_model.scrapers.scrape_site.ttl_cache import (
+    TTLCache,
+    get_conditional_headers,
+)
+
+# Base urls of the API. These can be pointed somewhere else (e.g. the mock_api
+# server) with the UD_API_BASE_URL and UD_STATS_BASE_URL environment variables
+# or set_base_urls.
+API_BASE_URL = os.environ.get("UD_API_BASE_URL", "https://api.underdogfantasy.com")
+STATS_BASE_URL = os.environ.get(
+    "UD_STATS_BASE_URL", "https://stats.underdogfantasy.com"
+)
+
+
+def set_base_urls(api_base_url: str = None, stats_base_url: str = None) -> None:
+    """
+    Changes the base urls used by every scraper class created afterwards.
+    """
+
+    if api_base_url is not None:
+        BaseData.api_base_url = api_base_url.rstrip("/")
+
+    if stats_base_url is not None:
+        BaseData.stats_base_url = stats_base_url.rstrip("/")
+
 
 class BaseData:
-    def __init__(self, headers: dict, clear_json_attrs: bool = True):
+    api_base_url = API_BASE_URL
+    stats_base_url = STATS_BASE_URL
+
+    def __init__(
+        self,
+        headers: dict,
+        clear_json_attrs: bool = True,
+        transport: Transport = None,
+        dtype_policy: DtypePolicy = None,
+    ):
         """
         Provides basic functionality to scrape the UD API and store the
         data into dfs.
@@ -18,9 +66,24 @@ class BaseData:
             bearer token) is not always required.
         clear_json_attrs : bool, optional
             Clears the json attrs created from scraping the API, by default True.
+        transport : Transport, optional
+            Pooled HTTP transport used for every request, by default the
+            process-wide transport from get_default_transport.
+        dtype_policy : DtypePolicy, optional
+            Stores the ids and low-cardinality columns of the dfs in compact
+            dtypes, by default the dfs aren't compacted.
         """
 
         self._clear_json_attrs = clear_json_attrs
+        self.dtype_policy = dtype_policy
+
+        # Change for every class with json_decode.set_default_decoder
+        self.json_decoder = get_default_decoder()
+
+        if transport is None:
+            transport = get_default_transport()
+
+        self.transport = transport
 
         self.auth_header = headers.copy()
         self.auth_header["accept"] = "application/json"
@@ -41,21 +104,25 @@ class BaseData:
         Overwrites every 'df_' attribute with a df that is created by running the
         'create_' method that matches it. This serves as the primary method
         for building the dfs associated with the class
+
+        Requests are paced by the transport's rate limiter and retry policy
+        rather than sleeping between each method.
+
+        Parameters
+        ----------
+        sleep_time : int, optional
+            Deprecated and ignored - configure the transport's RateLimiter
+            instead. Kept so existing callers don't break.
         """
 
         attrs = [attr for attr in dir(self) if attr.startswith("df_")]
         for attr in attrs:
             method_name = "create_" + attr
-            self.__dict__[attr] = getattr(self, method_name)()
             try:
                 self.__dict__[attr] = getattr(self, method_name)()
-            except:
-                print(getattr(self, method_name), "failed to run")
-
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            else:
-                pass
+            except Exception as e:
+                print(getattr(self, method_name), f"failed to run - {e!r}")
+                self.transport.instrumentation.record_failure()
 
         if self._clear_json_attrs == True:
             self.clear_json_attrs()
@@ -76,63 +143,46 @@ class BaseData:
         if headers is None:
             headers = {}
 
-        response = requests.get(url, headers=headers)
+        response = self.transport.get(url, headers=headers)
 
-        site_data = response.json()
+        site_data, decode_time = self.json_decoder.decode_timed(response)
+        self.transport.record_decode(decode_time, len(response.content))
 
         return site_data
 
-    def create_scraped_data_df(self, scraped_data: list) -> pd.DataFrame:
+    def create_scraped_data_df(
+        self, scraped_data: list, schema: schemas.Schema = None
+    ) -> pd.DataFrame:
         """
         Converts a list of dictionaries into a df where the keys of the dicts are
         used for the columns and the values are placed in the rows.
-        NOTE: this assumes the keys in all dicts are the same.
+        NOTE: Unless the schema declares the columns, this assumes the keys in
+        all dicts are the same as the first. Missing values are set to "N/A"
+        or the schema's default.
         """
 
-        # Get the dicionary keys to identify the columns of the list for each output dict key
-        output_data_cols = []
-        for output_data_col in scraped_data[0].keys():
-            output_data_cols.append(output_data_col)
-
-        final_data_dict = {"columns": output_data_cols}
-        for data_dict_id, data in enumerate(scraped_data):
-            all_data_elements = []
-            for output_data_col in output_data_cols:
-                try:
-                    data_element = data[output_data_col]
-                except:
-                    # Note: This should probably be conditional on the data type,
-                    # but just using N/A for now.
-                    data_element = "N/A"
+        start = time.perf_counter()
+        final_data_df = schemas.build_df(scraped_data, schema)
 
-                all_data_elements.append(data_element)
-
-            final_data_dict[data_dict_id] = all_data_elements
-
-        final_data_df = self._convert_data_dict_to_df(final_data_dict)
+        # Attributed to the endpoint this thread last pulled from
+        self.transport.instrumentation.record_parse(
+            time.perf_counter() - start, len(final_data_df)
+        )
 
         return final_data_df
 
-    def _convert_data_dict_to_df(self, scraped_data_dict: dict) -> pd.DataFrame:
+    def apply_dtype_policy(
+        self, df: pd.DataFrame, id_columns: list = None
+    ) -> pd.DataFrame:
         """
-        Converts the dict from the create_scraped_data_dict function to a df
-        NOTE: The input dict takes the following form:
-        {'columns': [<column names>], 1: [<column values>], 2: [<column_values>], ...}
+        Compacts the df if the class was passed a dtype_policy. id_columns are
+        coded as well as the policy's.
         """
 
-        columns = scraped_data_dict["columns"]
-
-        data_keys = list(scraped_data_dict.keys())[1:]
-
-        data_for_df = []
-        for data_key in data_keys:
-            data = scraped_data_dict[data_key]
-
-            data_for_df.append(data)
+        if self.dtype_policy is None or df is None:
+            return df
 
-        final_df = pd.DataFrame(data=data_for_df, columns=columns)
-
-        return final_df
+        return self.dtype_policy.apply(df, id_columns=id_columns)
 
     def _create_week_id_mapping(self) -> pd.DataFrame:
         """Creates a map between the APIs Week ID and the actual Week number"""
@@ -154,19 +204,40 @@ class BaseData:
 class DraftsDetail(BaseData):
     """Compiles all major league specific data into dataframes"""
 
-    def __init__(self, league_ids: list, headers: str, clear_json_attrs: bool = True):
-        super().__init__(headers, clear_json_attrs=clear_json_attrs)
+    def __init__(
+        self,
+        league_ids: list,
+        headers: str,
+        clear_json_attrs: bool = True,
+        transport: Transport = None,
+        max_workers: int = 1,
+        dtype_policy: DtypePolicy = None,
+    ):
+        """
+        max_workers sets how many leagues are pulled at once. Values above 1
+        pull leagues concurrently and should stay within both the API's rate
+        limit and the transport's pool_maxsize.
+        """
+
+        super().__init__(
+            headers,
+            clear_json_attrs=clear_json_attrs,
+            transport=transport,
+            dtype_policy=dtype_policy,
+        )
 
         self.league_ids = league_ids
+        self.max_workers = max_workers
+
+        # Stores {league_id: exception} for every league that failed to pull
+        self.failed_league_ids = {}
 
         self.url_drafts = {}
         self.url_weekly_scores = {}
         for league_id in league_ids:
-            url_draft = "https://api.underdogfantasy.com/v2/drafts/" + league_id
+            url_draft = self.api_base_url + "/v2/drafts/" + league_id
             url_weekly_scores = (
-                "https://api.underdogfantasy.com/v1/drafts/"
-                + league_id
-                + "/weekly_scores"
+                self.api_base_url + "/v1/drafts/" + league_id + "/weekly_scores"
             )
 
             self.url_drafts[league_id] = url_draft
@@ -180,30 +251,59 @@ class DraftsDetail(BaseData):
         self.df_weekly_scores = pd.DataFrame()
 
     def create_df_drafts(self) -> pd.DataFrame:
-        dfs = []
-        for league_id in self.league_ids:
-            df = self._create_df_draft_ind_league(league_id)
-            dfs.append(df)
+        dfs = self._create_dfs_all_leagues(self._create_df_draft_ind_league)
 
         final_df = pd.concat(dfs)
 
-        return final_df
+        return self.apply_dtype_policy(final_df)
 
     def create_df_draft_entries(self) -> pd.DataFrame:
-        dfs = []
-        for league_id in self.league_ids:
-            df = self._create_df_draft_entries_ind_league(league_id)
-            dfs.append(df)
+        dfs = self._create_dfs_all_leagues(self._create_df_draft_entries_ind_league)
 
         final_df = pd.concat(dfs)
 
-        return final_df
+        # The entry id is coded like the draft_entry_id of the picks so the
+        # draft board still joins to them
+        return self.apply_dtype_policy(final_df, id_columns=["id"])
+
+    def create_df_new_picks(self, after_number: int) -> pd.DataFrame:
+        """
+        Creates a df of only the picks made after the pick number passed so
+        that a live draft can be updated without re-parsing every pick. An
+        empty df is returned if there aren't any new picks.
+        """
+
+        dfs = self._create_dfs_all_leagues(
+            lambda league_id: self._create_df_new_picks_ind_league(
+                league_id, after_number
+            )
+        )
+        dfs = [df for df in dfs if df is not None]
+
+        if len(dfs) == 0:
+            return pd.DataFrame()
+
+        final_df = pd.concat(dfs)
+
+        return self.apply_dtype_policy(final_df)
+
+    def create_df_picks(self, league_id: str, picks: list) -> pd.DataFrame:
+        """
+        Creates a df of pick records that were already pulled (e.g. the picks
+        delivered by a draft_events source). An empty df is returned if there
+        aren't any picks.
+        """
+
+        if len(picks) == 0:
+            return pd.DataFrame()
+
+        df = self.create_scraped_data_df(picks, schemas.PICKS)
+        df["draft_id"] = league_id
+
+        return self.apply_dtype_policy(df)
 
     def create_df_weekly_scores(self) -> pd.DataFrame:
-        dfs = []
-        for league_id in self.league_ids:
-            df = self._create_df_weekly_scores_ind_league(league_id)
-            dfs.append(df)
+        dfs = self._create_dfs_all_leagues(self._create_df_weekly_scores_ind_league)
 
         final_df = pd.concat(dfs)
         final_df.reset_index(inplace=True)
@@ -211,33 +311,94 @@ class DraftsDetail(BaseData):
         week_mapping = self._create_week_id_mapping()
         final_df = pd.merge(final_df, week_mapping, on="week_id")
 
-        return final_df
+        return self.apply_dtype_policy(final_df)
 
-    def _create_df_draft_ind_league(self, league_id: str) -> pd.DataFrame:
-        self.json_drafts[league_id] = self.read_in_site_data(
-            self.url_drafts[league_id], headers=self.auth_header
+    def _create_dfs_all_leagues(self, create_df_ind_league) -> list:
+        """
+        Runs create_df_ind_league for every league, up to max_workers at once,
+        and returns the dfs in the same order as league_ids.
+
+        A league that fails is recorded in failed_league_ids rather than
+        stopping the rest of the leagues from being pulled. The first error is
+        only raised if every league fails.
+        """
+
+        results, errors = map_concurrent(
+            create_df_ind_league, self.league_ids, max_workers=self.max_workers
         )
-        scraped_data = self.json_drafts[league_id]["draft"]["picks"]
 
-        initial_scraped_df = self.create_scraped_data_df(scraped_data)
-        initial_scraped_df.drop(["projection_average"], axis=1, inplace=True)
+        for league_id, e in errors.items():
+            print(f"{e!r} occurred - unable to pull league {league_id}")
+
+        self.failed_league_ids.update(errors)
+
+        if len(results) == 0 and len(errors) > 0:
+            raise list(errors.values())[0]
+
+        dfs = [df for league_id, df in results]
+
+        return dfs
+
+    def _read_draft_json(self, league_id: str) -> dict:
+        """
+        Pulls the draft data for the league, which includes the picks, entries
+        and users. The response is cached in json_drafts so that each draft is
+        only requested once per instance.
+        """
+
+        if league_id not in self.json_drafts:
+            self.json_drafts[league_id] = self.read_in_site_data(
+                self.url_drafts[league_id], headers=self.auth_header
+            )
+        else:
+            # Parsing the cached json is still attributed to the endpoint
+            self.transport.instrumentation.set_current_endpoint(
+                self.url_drafts[league_id]
+            )
+
+        return self.json_drafts[league_id]
+
+    def _create_df_draft_ind_league(self, league_id: str) -> pd.DataFrame:
+        scraped_data = self._read_draft_json(league_id)["draft"]["picks"]
+
+        initial_scraped_df = self.create_scraped_data_df(scraped_data, schemas.PICKS)
 
         initial_scraped_df["draft_id"] = league_id
 
         return initial_scraped_df
 
+    def _create_df_new_picks_ind_league(
+        self, league_id: str, after_number: int
+    ) -> pd.DataFrame:
+        """
+        Only the picks after after_number are parsed. None is returned if
+        there aren't any.
+        """
+
+        picks = self._read_draft_json(league_id)["draft"]["picks"]
+        new_picks = [pick for pick in picks if pick["number"] > after_number]
+
+        if len(new_picks) == 0:
+            return None
+
+        df = self.create_scraped_data_df(new_picks, schemas.PICKS)
+        df["draft_id"] = league_id
+
+        return df
+
     def _create_df_draft_entries_ind_league(self, league_id: str) -> pd.DataFrame:
         """
         Creates a df of all users in the draft, sorted by pick order.
         """
 
-        json = self.read_in_site_data(self.url_drafts[league_id], self.auth_header)
+        json = self._read_draft_json(league_id)
 
-        df_entries = self.create_scraped_data_df(json["draft"]["draft_entries"])
-        df_users = self.create_scraped_data_df(json["draft"]["users"])
+        df_entries = self.create_scraped_data_df(
+            json["draft"]["draft_entries"], schemas.DRAFT_ENTRIES
+        )
+        df_users = self.create_scraped_data_df(json["draft"]["users"], schemas.USERS)
 
         df_users.rename(columns={"id": "user_id"}, inplace=True)
-        df_users = df_users[["user_id", "username"]]
 
         df = pd.merge(df_entries, df_users, how="left", on="user_id")
         df = df.sort_values(by="pick_order").reset_index(drop=True)
@@ -252,15 +413,11 @@ class DraftsDetail(BaseData):
         )
         scraped_data = self.json_weekly_scores[league_id]["draft_weekly_scores"]
 
-        initial_scraped_df = self.create_scraped_data_df(scraped_data)
-
-        weekly_scores = self._pull_out_weekly_scores(initial_scraped_df)
-
-        initial_scraped_df.drop(["week", "draft_entries_points"], axis=1, inplace=True)
-
-        final_scraped_df = pd.merge(
-            left=weekly_scores, right=initial_scraped_df, on="id", how="left"
+        initial_scraped_df = self.create_scraped_data_df(
+            scraped_data, schemas.WEEKLY_SCORES
         )
+
+        final_scraped_df = self._pull_out_weekly_scores(initial_scraped_df)
         final_scraped_df.drop(["id"], axis=1, inplace=True)
 
         return final_scraped_df
@@ -269,34 +426,40 @@ class DraftsDetail(BaseData):
         """
         Each row represents one week where each teams score is contained
         within a dicitonary for that week. This pulls those scores out and
-        puts them in a Team/Week level df
+        puts them in a Team/Week level df by repeating each week's row once
+        per team rather than looping over the rows.
         """
 
-        df = df.copy()
-
-        all_weekly_scores = []
-        for index, row in df.iterrows():
-            row_id = row["id"]
-            week_id = row["week"]["id"]
-            status = row["week"]["status"]
-            points_dict = row["draft_entries_points"]
+        points_dicts = [
+            points_dict if isinstance(points_dict, dict) else {}
+            for points_dict in df["draft_entries_points"].to_list()
+        ]
+        num_teams = [len(points_dict) for points_dict in points_dicts]
 
-            for user_id, points in points_dict.items():
-                weekly_scores = [row_id, week_id, status, user_id, points]
+        df = df.drop(columns=["draft_entries_points"]).reset_index(drop=True)
+        df = df.loc[df.index.repeat(num_teams)].reset_index(drop=True)
 
-                all_weekly_scores.append(weekly_scores)
+        df["user_id"] = list(chain.from_iterable(d.keys() for d in points_dicts))
+        df["total_points"] = list(chain.from_iterable(d.values() for d in points_dicts))
 
         columns = ["id", "week_id", "status", "user_id", "total_points"]
-        df = pd.DataFrame(data=all_weekly_scores, columns=columns)
+        other_columns = [col for col in df.columns if col not in columns]
+        df = df[columns + other_columns]
 
         return df
 
 
 class DraftsActive(BaseData):
-    url = "https://api.underdogfantasy.com/v3/user/active_drafts"
+    url_path = "/v3/user/active_drafts"
+
+    def __init__(
+        self, headers: str, clear_json_attrs: bool = True, transport: Transport = None
+    ):
+        super().__init__(
+            headers, clear_json_attrs=clear_json_attrs, transport=transport
+        )
 
-    def __init__(self, headers: str, clear_json_attrs: bool = True):
-        super().__init__(headers, clear_json_attrs=clear_json_attrs)
+        self.url = self.api_base_url + DraftsActive.url_path
 
         self.json = {}
         self.df_active_drafts = None
@@ -306,13 +469,13 @@ class DraftsActive(BaseData):
         Creates a draft level df of all active drafts.
         """
 
-        self.json = self.read_in_site_data(DraftsActive.url, headers=self.auth_header)
+        self.json = self.read_in_site_data(self.url, headers=self.auth_header)
 
         try:
-            df = self.create_scraped_data_df(self.json["drafts"])
+            df = self.create_scraped_data_df(self.json["drafts"], schemas.ACTIVE_DRAFTS)
             df = self._add_contest_refs(df)
         except IndexError:
-            print(f"No data found in {DraftsActive.url} - no df will be returned")
+            print(f"No data found in {self.url} - no df will be returned")
             df = None
 
         if self.clear_json_attrs:
@@ -326,7 +489,7 @@ class DraftsActive(BaseData):
         for the draft and rounds needed to build a draft shell.
         """
 
-        contest_refs = ContestRefs(self.auth_header)
+        contest_refs = ContestRefs(self.auth_header, transport=self.transport)
         df_styles = contest_refs.create_df_contest_styles()
         df_styles = df_styles[["id", "scoring_type_id", "rounds"]]
         df_styles.rename(columns={"id": "contest_style_id"}, inplace=True)
@@ -341,24 +504,40 @@ class Drafts(BaseData):
     Compiles all completed or settled draft level data for a slate.
     """
 
-    def __init__(self, headers: str, slate, clear_json_attrs: bool = True):
+    def __init__(
+        self,
+        headers: str,
+        slate,
+        clear_json_attrs: bool = True,
+        transport: Transport = None,
+        max_workers: int = 1,
+        page_window: int = 1,
+    ):
         """
         Note: This requires the user-agent header - Should be able to grab this
         with the bearer token, but hard coding for now
+
+        max_workers sets how many league urls (e.g. tournament rounds) are
+        pulled at once and page_window sets how many pages of each url are
+        requested ahead. Up to max_workers * page_window requests can be in
+        flight at the same time.
         """
 
-        super().__init__(headers, clear_json_attrs=clear_json_attrs)
+        super().__init__(
+            headers, clear_json_attrs=clear_json_attrs, transport=transport
+        )
 
         self.slate = slate
+        self.max_workers = max_workers
+        self.page_window = page_window
 
         url_suffix = f"/{self.slate.slate_type}_drafts"
         self.url_base_leagues = (
-            "https://api.underdogfantasy.com/v2/user/slates/"
-            + self.slate.id
-            + url_suffix
+            self.api_base_url + "/v2/user/slates/" + self.slate.id + url_suffix
         )
         self.url_tourney_league_ids = (
-            "https://api.underdogfantasy.com/v1/user/slates/"
+            self.api_base_url
+            + "/v1/user/slates/"
             + self.slate.id
             + "/tournament_rounds"
         )
@@ -370,10 +549,18 @@ class Drafts(BaseData):
         if league_urls is None:
             league_urls = self.get_league_urls()
 
-        leagues = []
-        for i, league_url in enumerate(league_urls):
-            df = self._create_df_leagues(league_url, "league_" + str(i + 1))
-            leagues.append(df)
+        league_keys = ["league_" + str(i + 1) for i in range(len(league_urls))]
+
+        results, errors = map_concurrent(
+            lambda i: self._create_df_leagues(league_urls[i], league_keys[i]),
+            list(range(len(league_urls))),
+            max_workers=self.max_workers,
+        )
+
+        if len(errors) > 0:
+            raise list(errors.values())[0]
+
+        leagues = [df for i, df in results]
 
         df_all_leagues = pd.concat(leagues)
         df_all_leagues.reset_index(inplace=True)
@@ -406,7 +593,9 @@ class Drafts(BaseData):
 
         leagues_df_list = []
         for leagues_page in scraped_data.values():
-            leagues_page_df = self.create_scraped_data_df(leagues_page["drafts"])
+            leagues_page_df = self.create_scraped_data_df(
+                leagues_page["drafts"], schemas.LEAGUES
+            )
             leagues_df_list.append(leagues_page_df)
 
         leagues_df = pd.concat(leagues_df_list)
@@ -416,28 +605,35 @@ class Drafts(BaseData):
     def _create_json_leagues(self, url_base: str) -> dict:
         """
         Loops through all the different pages that contain the league level data
-        and stores each as an entry in a dict
+        and stores each as an entry in a dict.
+        """
+
+        leagues_json_dict = {
+            "page_" + str(i): leagues for i, leagues in self.iter_league_pages(url_base)
+        }
+
+        return leagues_json_dict
+
+    def iter_league_pages(self, url_base: str):
+        """
+        Yields (page number, leagues json) for each page of the league url.
+        Pages are requested page_window at a time and stop at the first page
+        without any drafts.
         """
 
-        url_exists = True
-        i = 1
-        leagues_json_dict = {}
-        while url_exists:
+        def fetch_page(i: int) -> dict:
             if i == 1:
                 url = url_base
             else:
                 url = url_base + "?page=" + str(i)
 
-            leagues = self.read_in_site_data(url, headers=self.auth_header)
+            return self.read_in_site_data(url, headers=self.auth_header)
 
-            if len(leagues["drafts"]) > 0:
-                leagues_json_dict["page_" + str(i)] = leagues
-            else:
-                url_exists = False
-
-            i += 1
-
-        return leagues_json_dict
+        return iter_pages(
+            fetch_page,
+            lambda leagues: len(leagues["drafts"]) == 0,
+            window=self.page_window,
+        )
 
     def _create_df_tourney_league_ids(self) -> pd.DataFrame:
         """
@@ -450,16 +646,9 @@ class Drafts(BaseData):
         )
         scraped_data = json_tourney_league_ids["tournament_rounds"]
 
-        initial_scraped_df = self.create_scraped_data_df(scraped_data)
-
-        # Pulling out the 'id' from the 'tournament' dict in case this is whats needed
-        tournament_col = initial_scraped_df["tournament"].to_list()
-        tournament_df = self.create_scraped_data_df(tournament_col)
-        tournament_df.rename(columns={"id": "tournament_id"}, inplace=True)
-        tournament_df = tournament_df["tournament_id"]
-
-        initial_scraped_df.drop(["tournament"], axis=1, inplace=True)
-        final_df = initial_scraped_df.join(tournament_df)
+        # The schema pulls the 'id' out of the 'tournament' dict in case this is
+        # whats needed
+        final_df = self.create_scraped_data_df(scraped_data, schemas.TOURNAMENT_ROUNDS)
 
         return final_df
 
@@ -470,7 +659,7 @@ class Drafts(BaseData):
 
         tourney_league_ids = list(self._create_df_tourney_league_ids()["id"])
 
-        base_url = "https://api.underdogfantasy.com/v1/user/tournament_rounds/"
+        base_url = self.api_base_url + "/v1/user/tournament_rounds/"
         tourney_league_urls = []
         for tourney_league_id in tourney_league_ids:
             tourney_league_url = base_url + tourney_league_id + "/drafts"
@@ -485,18 +674,24 @@ class Slates(BaseData):
     Compiles all available and completed slates for a specific slate type.
     """
 
-    url_slates_available = "https://stats.underdogfantasy.com/v1/sports/nfl/slates"
-    url_slates_completed = "https://api.underdogfantasy.com/v2/user/completed_slates"
-    url_slates_settled = (
-        "https://api.underdogfantasy.com/v1/user/sports/nfl/settled_slates"
-    )
+    path_slates_available = "/v1/sports/nfl/slates"
+    path_slates_completed = "/v2/user/completed_slates"
+    path_slates_settled = "/v1/user/sports/nfl/settled_slates"
 
-    def __init__(self, headers: str, slate_type: str, clear_json_attrs: bool = True):
+    def __init__(
+        self,
+        headers: str,
+        slate_type: str,
+        clear_json_attrs: bool = True,
+        transport: Transport = None,
+    ):
         """
         slate_type must be 'available', 'completed', or 'settled'
         """
 
-        super().__init__(headers, clear_json_attrs=clear_json_attrs)
+        super().__init__(
+            headers, clear_json_attrs=clear_json_attrs, transport=transport
+        )
 
         self.slate_type = slate_type
 
@@ -520,11 +715,9 @@ class Slates(BaseData):
         self.json = self.read_in_site_data(url, headers=self.auth_header)
 
         try:
-            df = self.create_scraped_data_df(self.json["slates"])
-
-            # This is stored as a list, but seems to always only contain
-            # one id.
-            df["contest_style_ids"] = df["contest_style_ids"].apply(lambda x: x[0])
+            # contest_style_ids is stored as a list, but seems to always only
+            # contain one id which the schema pulls out.
+            df = self.create_scraped_data_df(self.json["slates"], schemas.SLATES)
         except IndexError:
             print(f"No data found in {url} - no df will be returned")
             df = None
@@ -542,11 +735,11 @@ class Slates(BaseData):
         """
 
         if self.slate_type == "available":
-            url = Slates.url_slates_available
+            url = self.stats_base_url + Slates.path_slates_available
         elif self.slate_type == "completed":
-            url = Slates.url_slates_completed
+            url = self.api_base_url + Slates.path_slates_completed
         elif self.slate_type == "settled":
-            url = Slates.url_slates_settled
+            url = self.api_base_url + Slates.path_slates_settled
 
         return url
 
@@ -593,32 +786,49 @@ class ReferenceData(BaseData):
         slate_id: str,
         scoring_type_id: str,
         clear_json_attrs: bool = True,
+        transport: Transport = None,
+        max_workers: int = 1,
+        dtype_policy: DtypePolicy = None,
     ):
-        super().__init__(headers, clear_json_attrs=clear_json_attrs)
+        """
+        max_workers sets how many weeks of player scores are pulled at once.
+
+        To compact the dfs, pass DtypePolicy.for_slate(slate_id) so the ids are
+        coded with the same dictionary as the slate's DraftsDetail dfs.
+        """
+
+        super().__init__(
+            headers,
+            clear_json_attrs=clear_json_attrs,
+            transport=transport,
+            dtype_policy=dtype_policy,
+        )
 
         self.slate_id = slate_id
         self.scoring_type_id = scoring_type_id
+        self.max_workers = max_workers
 
         # week ID seems right but can't find the correct url for it
         # self._player_scores_wk_1_id = 78
         self._player_scores_wk_1_id = 1186
 
         self.url_players = (
-            "https://stats.underdogfantasy.com/v1/slates/" + self.slate_id + "/players"
+            self.stats_base_url + "/v1/slates/" + self.slate_id + "/players"
         )
         self.url_appearances = (
-            "https://stats.underdogfantasy.com/v1/slates/"
+            self.stats_base_url
+            + "/v1/slates/"
             + self.slate_id
             + "/scoring_types/"
             + self.scoring_type_id
             + "/appearances"
         )
-        self.url_teams = "https://stats.underdogfantasy.com/v1/teams"
+        self.url_teams = self.stats_base_url + "/v1/teams"
         self.url_bye_weeks = (
-            "https://stats.underdogfantasy.com/v2/slates/" + self.slate_id + "/matches"
+            self.stats_base_url + "/v2/slates/" + self.slate_id + "/matches"
         )
 
-        base_url_player_scores = "https://stats.underdogfantasy.com/v1/weeks/"
+        base_url_player_scores = self.stats_base_url + "/v1/weeks/"
         end_url_player_scores = (
             "/scoring_types/" + self.scoring_type_id + "/appearances"
         )
@@ -648,8 +858,9 @@ class ReferenceData(BaseData):
                 try:
                     method_name = "create_" + attr
                     self.__dict__[attr] = getattr(self, method_name)()
-                except:
-                    print(getattr(self, method_name), "failed to run")
+                except Exception as e:
+                    print(getattr(self, method_name), f"failed to run - {e!r}")
+                    self.transport.instrumentation.record_failure()
 
         # This ensures the dfs it depends on are created
         self.df_players_master = self.create_df_players_master()
@@ -662,41 +873,23 @@ class ReferenceData(BaseData):
             self.url_players, headers=self.auth_header
         )
 
-        initial_scraped_df = self.create_scraped_data_df(self.json_players["players"])
-        initial_scraped_df.drop(["image_url"], axis=1, inplace=True)
+        initial_scraped_df = self.create_scraped_data_df(
+            self.json_players["players"], schemas.PLAYERS
+        )
         initial_scraped_df.rename(columns={"id": "player_id"}, inplace=True)
 
-        return initial_scraped_df
+        return self.apply_dtype_policy(initial_scraped_df)
 
     def create_df_appearances(self) -> pd.DataFrame:
         self.json_appearances = self.read_in_site_data(
             self.url_appearances, headers=self.auth_header
         )
 
-        initial_scraped_df = self.create_scraped_data_df(
-            self.json_appearances["appearances"]
-        )
-        initial_scraped_df.drop(
-            ["latest_news_item_updated_at", "score"], axis=1, inplace=True
-        )
-
-        # 'projection' column values are dicitionaries which can be converted to a df and merged
-        projection_col = initial_scraped_df["projection"].to_list()
-        projection_df = self.create_scraped_data_df(projection_col)
-
-        projection_df.drop(["id", "scoring_type_id"], axis=1, inplace=True)
-        projection_df.rename(
-            columns={"points": "season_projected_points"}, inplace=True
-        )
-
-        final_df = pd.merge(
-            initial_scraped_df,
-            projection_df,
-            left_index=True,
-            right_index=True,
-            how="left",
+        # 'projection' column values are dicitionaries which the schema flattens
+        # into columns while the appearances are parsed
+        final_df = self.create_scraped_data_df(
+            self.json_appearances["appearances"], schemas.APPEARANCES
         )
-        final_df.drop(["projection"], axis=1, inplace=True)
 
         # Note: There are scenarios (Taysom Hill) where the player's position ID
         # and Position Rank does not align with his actual position.
@@ -705,21 +898,18 @@ class ReferenceData(BaseData):
         final_df["position"] = final_df["position_rank"].str[0:2]
         final_df.rename(columns={"id": "appearance_id"}, inplace=True)
 
-        return final_df
+        return self.apply_dtype_policy(final_df)
 
     def create_df_teams(self) -> pd.DataFrame:
         self.json_teams = self.read_in_site_data(
             self.url_teams, headers=self.auth_header
         )
 
-        initial_scraped_df = self.create_scraped_data_df(self.json_teams["teams"])
-
-        keep_vars = ["id", "abbr", "name"]
-        final_df = initial_scraped_df[keep_vars].copy()
+        final_df = self.create_scraped_data_df(self.json_teams["teams"], schemas.TEAMS)
 
         final_df.rename(columns={"name": "team_name", "id": "team_id"}, inplace=True)
 
-        return final_df
+        return self.apply_dtype_policy(final_df)
 
     def create_df_bye_weeks(self) -> pd.DataFrame:
         self.json_bye_weeks = self.read_in_site_data(
@@ -727,17 +917,12 @@ class ReferenceData(BaseData):
         )
 
         initial_scraped_df = self.create_scraped_data_df(
-            self.json_bye_weeks["matches"][0]["bye_weeks"]
+            self.json_bye_weeks["matches"][0]["bye_weeks"], schemas.BYE_WEEKS
         )
 
-        initial_scraped_df.drop(["id", "year"], axis=1, inplace=True)
         initial_scraped_df.rename(columns={"week": "bye_week"}, inplace=True)
 
-        initial_scraped_df["bye_week"] = initial_scraped_df["bye_week"].astype(
-            pd.Int64Dtype()
-        )
-
-        return initial_scraped_df
+        return self.apply_dtype_policy(initial_scraped_df)
 
     def create_df_players_master(self) -> pd.DataFrame:
         """Creates a master lookup for player attributes"""
@@ -771,84 +956,87 @@ class ReferenceData(BaseData):
 
         return final_df
 
-    def create_df_player_scores(self):
+    def create_df_player_scores(
+        self, first_week: int = 1, last_week: int = 17
+    ) -> pd.DataFrame:
         """
         This no longer appears to work due to either a change in the endpoint
         or the starting point week id is wrong
+
+        Pulls the player scores for every week number from first_week to
+        last_week (inclusive) so that weeks that are already stored don't need
+        pulled again. Weeks are pulled up to max_workers at once and each
+        week's json is dropped as soon as its df is created.
+
+        An empty df with the player scores columns is returned if none of the
+        weeks have any scores yet.
+
+        Raises
+        ------
+        ValueError
+            If the weeks aren't within 1 to 17 or first_week is after
+            last_week.
         """
 
-        self.json_player_scores = {
-            "player_scores_wk_"
-            + str(i + 1): self.read_in_site_data(
-                self.urls_player_scores["player_scores_wk_" + str(i + 1)],
-                headers=self.auth_header,
-            )
-            for i, wk_id in enumerate(
-                range(self._player_scores_wk_1_id, self._player_scores_wk_1_id + 17)
+        num_weeks = len(self.urls_player_scores)
+        if not 1 <= first_week <= last_week <= num_weeks:
+            raise ValueError(
+                f"Weeks must be within 1 to {num_weeks} with first_week <= "
+                f"last_week - got {first_week} to {last_week}"
             )
-        }
 
-        player_scores_df_list = []
-        for wk_id in range(1, 18):
-            if (
-                len(
-                    self.json_player_scores["player_scores_wk_" + str(wk_id)][
-                        "appearances"
-                    ]
-                )
-                > 0
-            ):
-                player_scores_json = self.json_player_scores[
-                    "player_scores_wk_" + str(wk_id)
-                ]
-                player_scores_df = self._create_df_player_scores_one_wk(
-                    player_scores_json["appearances"]
-                )
-                player_scores_df["week_number"] = wk_id
-
-                player_scores_df_list.append(player_scores_df)
-            else:
-                pass
+        week_numbers = list(range(first_week, last_week + 1))
+
+        results, errors = map_concurrent(
+            self._create_df_player_scores_wk_number,
+            week_numbers,
+            max_workers=self.max_workers,
+        )
+
+        if len(errors) > 0:
+            raise list(errors.values())[0]
+
+        player_scores_df_list = [df for wk_number, df in results if df is not None]
+
+        if len(player_scores_df_list) == 0:
+            columns = ["index"] + schemas.PLAYER_SCORES_COLUMNS + ["week_number"]
+            return pd.DataFrame(columns=columns)
 
         player_scores_df = pd.concat(player_scores_df_list)
         player_scores_df.reset_index(inplace=True)
 
-        return player_scores_df
+        return self.apply_dtype_policy(player_scores_df)
 
-    def _create_df_player_scores_one_wk(self, scraped_data: list) -> pd.DataFrame:
+    def _create_df_player_scores_wk_number(self, wk_number: int) -> pd.DataFrame:
         """
-        Each weeks player scores are contained in its own URL - this creates a df
-        of those scores for one week
+        Pulls and creates the player scores df for one week number. None is
+        returned if the week doesn't have any scores yet.
         """
 
-        initial_scraped_df = self.create_scraped_data_df(scraped_data)
-        initial_scraped_df.drop(["latest_news_item_updated_at"], axis=1, inplace=True)
-
-        # 'projection' column values are dicitionaries which can be converted to a df and merged
-        projection_col = initial_scraped_df["projection"].to_list()
-        projection_df = self.create_scraped_data_df(projection_col)
+        player_scores_json = self.read_in_site_data(
+            self.urls_player_scores["player_scores_wk_" + str(wk_number)],
+            headers=self.auth_header,
+        )
 
-        projection_df = projection_df[["points"]]
-        projection_df.rename(columns={"points": "projected_points"}, inplace=True)
+        if len(player_scores_json["appearances"]) == 0:
+            return None
 
-        score_col = initial_scraped_df["score"].to_list()
-        score_df = self.create_scraped_data_df(score_col)
+        player_scores_df = self._create_df_player_scores_one_wk(
+            player_scores_json["appearances"]
+        )
+        player_scores_df["week_number"] = wk_number
 
-        score_df = score_df[["points"]]
-        score_df.rename(columns={"points": "actual_points"}, inplace=True)
+        return player_scores_df
 
-        final_df = pd.merge(
-            initial_scraped_df,
-            projection_df,
-            left_index=True,
-            right_index=True,
-            how="left",
-        )
-        final_df = pd.merge(
-            final_df, score_df, left_index=True, right_index=True, how="left"
-        )
+    def _create_df_player_scores_one_wk(self, scraped_data: list) -> pd.DataFrame:
+        """
+        Each weeks player scores are contained in its own URL - this creates a df
+        of those scores for one week
+        """
 
-        final_df.drop(["projection", "score"], axis=1, inplace=True)
+        # The schema pulls the points out of the 'projection' and 'score' dicts
+        # while the appearances are parsed
+        final_df = self.create_scraped_data_df(scraped_data, schemas.PLAYER_SCORES)
 
         return final_df
 
@@ -877,11 +1065,22 @@ class ContestRefs(BaseData):
     slates, settled slates, etc.)
     """
 
-    url_scoring_types = "https://stats.underdogfantasy.com/v1/scoring_types"
-    url_contest_styles = "https://stats.underdogfantasy.com/v1/contest_styles"
+    path_scoring_types = "/v1/scoring_types"
+    path_contest_styles = "/v1/contest_styles"
+
+    # Shared by every instance so the catalogs are only pulled once per ttl.
+    # Expired entries are served while they're revalidated in the background.
+    cache = TTLCache(ttl=60 * 60)
 
-    def __init__(self, headers: str, clear_json_attrs: bool = True):
-        super().__init__(headers, clear_json_attrs=clear_json_attrs)
+    def __init__(
+        self, headers: str, clear_json_attrs: bool = True, transport: Transport = None
+    ):
+        super().__init__(
+            headers, clear_json_attrs=clear_json_attrs, transport=transport
+        )
+
+        self.url_scoring_types = self.stats_base_url + ContestRefs.path_scoring_types
+        self.url_contest_styles = self.stats_base_url + ContestRefs.path_contest_styles
 
         self.df_scoring_types = None
         self.df_contest_styles = None
@@ -889,7 +1088,11 @@ class ContestRefs(BaseData):
         self.json = {}
 
     def create_df_scoring_types(
-        self, headers: dict = None, clear_json: bool = False, update_attr: bool = False
+        self,
+        headers: dict = None,
+        clear_json: bool = False,
+        update_attr: bool = False,
+        use_cache: bool = True,
     ) -> pd.DataFrame:
         """
         Creates a scoring type level df with the scoring types of all existing
@@ -901,46 +1104,128 @@ class ContestRefs(BaseData):
             - 'display_stats' contains more descriptive information about each
             scoring_type, but that data isn't needed now and would take some
             time to pull out and structure.
+            - The df is served from ContestRefs.cache unless use_cache is
+            False.
         """
 
         if headers is None:
             headers = self.auth_header
 
-        self.json["scoring_types"] = self.read_in_site_data(
-            ContestRefs.url_scoring_types, headers=self.auth_header
+        df = self._create_df_cached(
+            self.url_scoring_types, "scoring_types", schemas.SCORING_TYPES, use_cache
         )
 
-        df = self.create_scraped_data_df(self.json["scoring_types"]["scoring_types"])
-
-        df = df.loc[df["sport_id"] == "NFL"]
-
         if update_attr:
             self.df_scoring_types = df
 
         if clear_json:
-            del self.json["scoring_types"]
+            self.json.pop("scoring_types", None)
 
         return df
 
     def create_df_contest_styles(
-        self, headers: dict = None, clear_json: bool = False, update_attr: bool = False
+        self,
+        headers: dict = None,
+        clear_json: bool = False,
+        update_attr: bool = False,
+        use_cache: bool = True,
     ) -> pd.DataFrame:
+        """
+        Creates a contest style level df of all NFL contests. The df is served
+        from ContestRefs.cache unless use_cache is False.
+        """
+
         if headers is None:
             headers = self.auth_header
 
-        self.json["contest_styles"] = self.read_in_site_data(
-            ContestRefs.url_contest_styles, headers=self.auth_header
+        df = self._create_df_cached(
+            self.url_contest_styles, "contest_styles", schemas.CONTEST_STYLES, use_cache
         )
 
-        df = self.create_scraped_data_df(self.json["contest_styles"]["contest_styles"])
-
-        df = df.loc[df["sport_id"] == "NFL"]
-
         if update_attr:
             self.df_contest_styles = df
 
         if clear_json:
-            del self.json["contest_styles"]
+            self.json.pop("contest_styles", None)
+
+        return df
+
+    def _create_df_cached(
+        self, url: str, json_key: str, schema: schemas.Schema, use_cache: bool
+    ) -> pd.DataFrame:
+        """
+        Returns the cached df of the url if there is one. An expired df is
+        still returned right away while it's revalidated in the background so
+        the API is never waited on once the df has been pulled.
+        """
+
+        cached = ContestRefs.cache.get(url) if use_cache else None
+
+        if cached is None:
+            return self._pull_df_cached(url, json_key, schema).copy()
+
+        df, validators, is_fresh = cached
+
+        if not is_fresh and ContestRefs.cache.claim_revalidation(url):
+            thread = threading.Thread(
+                target=self._revalidate,
+                args=(url, json_key, schema),
+                daemon=True,
+            )
+            thread.start()
+
+        return df.copy()
+
+    def _revalidate(self, url: str, json_key: str, schema: schemas.Schema) -> None:
+        try:
+            self._pull_df_cached(url, json_key, schema, revalidate=True)
+        except Exception as e:
+            ContestRefs.cache.release_revalidation(url)
+            print(f"Failed to revalidate {url} - {e!r}")
+
+    def _pull_df_cached(
+        self,
+        url: str,
+        json_key: str,
+        schema: schemas.Schema,
+        revalidate: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Pulls the df and caches it along with the response's validators. When
+        revalidating, a conditional request is sent with the validators of the
+        cached df and it's kept if the API responds that it hasn't changed
+        (304). The cached entry is read once before the request so the df is
+        still returned if the entry is cleared in the meantime, and an
+        unconditional request is sent if it's already gone.
+        """
+
+        cached = ContestRefs.cache.get(url) if revalidate else None
+
+        headers = self.auth_header.copy()
+        if cached is not None:
+            cached_df, validators, is_fresh = cached
+            headers.update(get_conditional_headers(validators))
+
+        response = self.transport.get(url, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            ContestRefs.cache.refresh(url)
+            return cached_df
+
+        self.json[json_key], decode_time = self.json_decoder.decode_timed(response)
+        self.transport.record_decode(decode_time, len(response.content))
+
+        df = self.create_scraped_data_df(self.json[json_key][json_key], schema)
+        df = df.loc[df["sport_id"] == "NFL"]
+
+        ContestRefs.cache.set(
+            url,
+            df,
+            {
+                "etag": response.headers.get("etag"),
+                "last-modified": response.headers.get("last-modified"),
+            },
+        )
 
         return df
 
@@ -0,0 +1,234 @@
+"""
+Module is responsible for caching each user's headers (bearer token and
+user-agent) until the token expires. The token is a JWT, so its expiry is
+read from its 'exp' claim locally rather than checking it with a request to
+the API, and headers are only pulled with Selenium again when the token has
+expired.
+
+Tokens that are close to expiring are still used but are refreshed in a
+background thread so the next login doesn't have to wait on Selenium.
+"""
+
+import threading
+import time
+
+import jwt
+
+import UD_draft_model.scrapers.scrape_site.pull_bearer_token as pb
+from UD_draft_model.scrapers.scrape_site.token_store import get_token_store
+
+LOGIN_URL = "https://underdogfantasy.com/lobby"
+
+
+def get_token_expiry(headers: dict) -> float:
+    """
+    Reads the expiry (epoch seconds) from the 'exp' claim of the bearer
+    token. The signature isn't verified since the token is only being
+    inspected, not trusted for authentication. None is returned if the
+    token isn't a JWT or doesn't expire.
+    """
+
+    token = headers.get("authorization", "")
+    if token.startswith("Bearer "):
+        token = token[len("Bearer ") :]
+
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return None
+
+    exp = claims.get("exp")
+
+    return float(exp) if exp is not None else None
+
+
+class TokenCache:
+    def __init__(self, refresh_margin: float = 600.0, url: str = LOGIN_URL):
+        """
+        In-memory cache of every user's headers, backed by the process-wide
+        TokenStore that pull_bearer_token.save_headers writes to.
+
+        Parameters
+        ----------
+        refresh_margin : float, optional
+            Tokens that expire within this many seconds are refreshed in the
+            background, by default 600.
+        url : str, optional
+            Page logged in to when pulling new headers, by default LOGIN_URL.
+        """
+
+        self.refresh_margin = refresh_margin
+        self.url = url
+
+        # {username: headers}
+        self._headers = {}
+        self._lock = threading.Lock()
+
+        # Users with a background refresh in progress
+        self._refreshing = set()
+
+        self.stats = {"hits": 0, "validations": 0, "pulls": 0, "background_pulls": 0}
+
+    def get_headers(
+        self,
+        username: str,
+        password: str,
+        chromedriver_path: str,
+        save_headers: bool = False,
+    ) -> dict:
+        """
+        Returns the user's cached headers while the token hasn't expired.
+        Otherwise, the token store is checked for headers saved since they
+        were cached (e.g. by another process) and new headers are only
+        pulled with Selenium if those have expired too.
+
+        Headers whose token isn't a JWT fall back to being checked with
+        pull_bearer_token.test_headers.
+        """
+
+        headers = self._read(username)
+        if self._is_valid(username, headers, password, chromedriver_path, save_headers):
+            return headers
+
+        headers = self._read_store(username, headers)
+        if self._is_valid(username, headers, password, chromedriver_path, save_headers):
+            return headers
+
+        return self.refresh(username, password, chromedriver_path, save_headers)
+
+    def refresh(
+        self,
+        username: str,
+        password: str,
+        chromedriver_path: str,
+        save_headers: bool = False,
+    ) -> dict:
+        """Pulls new headers with Selenium and caches them"""
+
+        headers = pb.pull_required_headers(
+            self.url, chromedriver_path, username, password
+        )
+        self._update_stats(pulls=1)
+
+        with self._lock:
+            self._headers[username] = headers
+
+        if save_headers:
+            pb.save_headers(username, headers)
+
+        return headers
+
+    def clear(self) -> None:
+        with self._lock:
+            self._headers = {}
+
+    def _is_valid(
+        self,
+        username: str,
+        headers: dict,
+        password: str,
+        chromedriver_path: str,
+        save_headers: bool,
+    ) -> bool:
+        """
+        True if the headers' token hasn't expired. Tokens close to expiring
+        are refreshed in the background.
+        """
+
+        if headers is None:
+            return False
+
+        exp = get_token_expiry(headers)
+        now = time.time()
+
+        if exp is None:
+            self._update_stats(validations=1)
+            return pb.test_headers(headers)
+
+        if now >= exp:
+            return False
+
+        self._update_stats(hits=1)
+
+        if now >= exp - self.refresh_margin:
+            self._refresh_in_background(
+                username, password, chromedriver_path, save_headers
+            )
+
+        return True
+
+    def _read_store(self, username: str, cached_headers: dict) -> dict:
+        """
+        Reads the user's headers from the token store and caches them. None
+        is returned if they're missing or the same as cached_headers.
+        """
+
+        headers = get_token_store().get(username)
+
+        if headers is None or headers == cached_headers:
+            return None
+
+        with self._lock:
+            self._headers[username] = headers
+
+        return headers
+
+    def _read(self, username: str) -> dict:
+        """Reads the user's headers from memory, then from the token store"""
+
+        with self._lock:
+            if username in self._headers:
+                return self._headers[username]
+
+        headers = get_token_store().get(username)
+
+        if headers is not None:
+            with self._lock:
+                self._headers.setdefault(username, headers)
+
+        return headers
+
+    def _refresh_in_background(
+        self,
+        username: str,
+        password: str,
+        chromedriver_path: str,
+        save_headers: bool,
+    ) -> None:
+        with self._lock:
+            if username in self._refreshing:
+                return
+
+            self._refreshing.add(username)
+
+        def refresh():
+            try:
+                self.refresh(username, password, chromedriver_path, save_headers)
+                self._update_stats(background_pulls=1)
+            except Exception as e:
+                # The current token is still valid so the next call retries
+                print(f"Background token refresh for {username} failed - {e!r}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(username)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _update_stats(self, **increments) -> None:
+        with self._lock:
+            for stat, increment in increments.items():
+                self.stats[stat] += increment
+
+
+_token_cache = None
+
+
+def get_token_cache() -> TokenCache:
+    """Returns the process-wide TokenCache used by get_credentials"""
+
+    global _token_cache
+
+    if _token_cache is None:
+        _token_cache = TokenCache()
+
+    return _token_cache
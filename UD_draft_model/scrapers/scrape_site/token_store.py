@@ -0,0 +1,262 @@
+"""
+Module is responsible for storing every user's headers (bearer token and
+user-agent) in one json file that can be shared by concurrent app sessions.
+
+Writes hold an exclusive lock on a sidecar lock file, merge with what's on
+disk and replace the file in one step so it's never left half written. Reads
+are served from an in-memory index of the file that's only read again once
+the file changes (e.g. another process saved a refreshed token), so header
+lookups just stat the file.
+
+The file is stored in the user's cache folder
+(~/.cache/UD_draft_model/token.json) by default rather than inside the
+package or relative to the working directory. Set UD_TOKEN_PATH to move it.
+Tokens saved by older versions in the package's bearer_token folder are
+copied there the first time the store is used.
+"""
+
+from contextlib import contextmanager
+import glob
+import json
+import os
+import shutil
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+TOKEN_PATH = os.environ.get(
+    "UD_TOKEN_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "UD_draft_model", "token.json"),
+)
+
+# Where tokens were saved before TOKEN_PATH
+LEGACY_TOKEN_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "bearer_token", "token.json"
+)
+
+
+class TokenStore:
+    def __init__(self, path: str = None):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            Json file the headers are stored in, by default TOKEN_PATH.
+        """
+
+        if path is None:
+            path = TOKEN_PATH
+
+        self.path = path
+        self.lock_path = path + ".lock"
+
+        # {username: headers}, loaded from disk on the first read and again
+        # whenever the file changes
+        self._index = None
+        self._file_version = None
+        self._lock = threading.Lock()
+
+        self.stats = {"reads": 0, "disk_reads": 0, "writes": 0}
+
+    def get(self, username: str) -> dict:
+        """Returns the user's headers or None if they aren't stored"""
+
+        with self._lock:
+            self.stats["reads"] += 1
+
+            self._load_index()
+            headers = self._index.get(username)
+
+        return dict(headers) if headers is not None else None
+
+    def get_all(self) -> dict:
+        with self._lock:
+            self._load_index()
+
+            return {username: dict(h) for username, h in self._index.items()}
+
+    def set(self, username: str, headers: dict) -> None:
+        """
+        Stores the user's headers. Users written by other processes since the
+        file was read are kept.
+        """
+
+        with self._lock, self._lock_file():
+            data = self._read_file()
+            data[username] = dict(headers)
+
+            self._write_file(data)
+
+            self._index = data
+            self._file_version = self._get_file_version()
+            self.stats["writes"] += 1
+
+    def delete(self, username: str) -> None:
+        with self._lock, self._lock_file():
+            data = self._read_file()
+            data.pop(username, None)
+
+            self._write_file(data)
+
+            self._index = data
+            self._file_version = self._get_file_version()
+            self.stats["writes"] += 1
+
+    def migrate(self, legacy_path: str) -> bool:
+        """
+        Copies the tokens saved at legacy_path if the store's file doesn't
+        exist yet. The legacy file is left in place.
+
+        Returns
+        -------
+        bool
+            True if the tokens were copied.
+        """
+
+        with self._lock, self._lock_file():
+            if os.path.exists(self.path) or not os.path.exists(legacy_path):
+                return False
+
+            temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(legacy_path, temp_path)
+            os.replace(temp_path, self.path)
+
+            self._index = None
+
+        print(f"Copied the tokens saved at {legacy_path} to {self.path}")
+
+        return True
+
+    def reload(self) -> None:
+        """Drops the in-memory index so the next read picks up the file"""
+
+        with self._lock:
+            self._index = None
+
+    def _load_index(self) -> None:
+        """
+        Reads the file into the index if it changed since it was last read.
+        Must be called while holding the lock.
+        """
+
+        file_version = self._get_file_version()
+
+        if self._index is None or file_version != self._file_version:
+            self._index = self._read_file()
+            self._file_version = file_version
+
+    def _get_file_version(self):
+        """
+        Changes whenever the file is replaced or written. None if the file
+        doesn't exist.
+        """
+
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read_file(self) -> dict:
+        """Must be called while holding the lock"""
+
+        self.stats["disk_reads"] += 1
+
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except json.JSONDecodeError:
+            # Left by a writer from before writes were atomic
+            print(f"{self.path} is corrupt - starting from an empty token store")
+            data = {}
+
+        return data
+
+    def _write_file(self, data: dict) -> None:
+        """
+        Replaces the file in one step so it's never left half written. Must
+        be called while holding the file lock.
+        """
+
+        self._remove_temp_files()
+
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_path, self.path)
+
+    def _remove_temp_files(self) -> None:
+        """
+        Removes temp files left by writers that died before replacing the
+        file. Writes only happen under the file lock so none are in use.
+        """
+
+        for temp_path in glob.glob(glob.escape(self.path) + ".*.tmp"):
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def _lock_file(self):
+        """Exclusive lock across processes on the sidecar lock file"""
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        with open(self.lock_path, "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                _lock_windows(f.fileno())
+
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _lock_windows(fileno: int) -> None:
+    # LK_LOCK gives up after 10 attempts so it's retried until it's acquired
+    while True:
+        try:
+            os.lseek(fileno, 0, os.SEEK_SET)
+            msvcrt.locking(fileno, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            time.sleep(0.05)
+
+
+_token_store = None
+_token_store_lock = threading.Lock()
+
+
+def get_token_store() -> TokenStore:
+    """
+    Returns the process-wide TokenStore shared by every app session. The
+    tokens saved at LEGACY_TOKEN_PATH are copied to it on first use.
+    """
+
+    global _token_store
+
+    with _token_store_lock:
+        if _token_store is None:
+            _token_store = TokenStore()
+            _token_store.migrate(LEGACY_TOKEN_PATH)
+
+    return _token_store
@@ -0,0 +1,344 @@
+"""
+Module is responsible for the HTTP layer used to scrape the API. A single
+pooled session is shared by every scraper class so that connections are
+kept alive between requests.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from UD_draft_model.scrapers.scrape_site.archive import ResponseArchive
+from UD_draft_model.scrapers.scrape_site.concurrency import SingleFlight
+from UD_draft_model.scrapers.scrape_site.http_cache import HTTPCache
+from UD_draft_model.scrapers.scrape_site.instrumentation import (
+    Instrumentation,
+    get_instrumentation,
+)
+from UD_draft_model.scrapers.scrape_site.rate_limit import RateLimiter, RetryPolicy
+
+# Folder of the default transport's HTTP cache (e.g.
+# ~/.cache/UD_draft_model/http). The cache is off unless UD_HTTP_CACHE_DIR is
+# set.
+HTTP_CACHE_DIR = os.environ.get("UD_HTTP_CACHE_DIR", "")
+
+
+class Transport:
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        timeout: tuple = (5, 30),
+        gzip: bool = True,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        archive: ResponseArchive = None,
+        http_cache: HTTPCache = None,
+        coalesce: bool = True,
+        instrumentation: Instrumentation = None,
+    ):
+        """
+        Wraps a requests.Session with a connection pool that keeps
+        connections to the API hosts alive between requests.
+
+        Parameters
+        ----------
+        pool_connections : int, optional
+            Number of hosts to keep a connection pool for, by default 10.
+        pool_maxsize : int, optional
+            Max number of connections kept alive per host, by default 10.
+        timeout : tuple, optional
+            (connect, read) timeouts in seconds passed to every request,
+            by default (5, 30).
+        gzip : bool, optional
+            Requests gzip/deflate encoded responses, by default True.
+        rate_limiter : RateLimiter, optional
+            Paces every request sent, by default requests aren't paced.
+        retry_policy : RetryPolicy, optional
+            Determines which failed requests are retried and how long to back
+            off, by default failed requests aren't retried.
+        archive : ResponseArchive, optional
+            Records every response pulled from the API or, in replay mode,
+            serves every request from disk, by default nothing is archived.
+        http_cache : HTTPCache, optional
+            Sends conditional requests for the urls it caches and serves
+            304s from disk, by default nothing is cached.
+        coalesce : bool, optional
+            Identical requests (same url and authorization) sent while one is
+            already in flight share its response instead of being sent again,
+            by default True.
+        instrumentation : Instrumentation, optional
+            Records per-endpoint metrics of every request, by default the
+            process-wide instrumentation from get_instrumentation.
+        """
+
+        if instrumentation is None:
+            instrumentation = get_instrumentation()
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.gzip = gzip
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.archive = archive
+        self.http_cache = http_cache
+        self.coalesce = coalesce
+        self.instrumentation = instrumentation
+
+        # throttle_time is the seconds spent waiting on the rate limiter and
+        # retry backoffs. decode_time is the seconds the scrapers spent
+        # decoding the JSON of decoded_bytes worth of responses.
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "throttle_time": 0.0,
+            "coalesced": 0,
+            "decode_time": 0.0,
+            "decoded_bytes": 0,
+        }
+        self._single_flight = SingleFlight()
+        self._stats_lock = threading.Lock()
+
+        self.session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """
+        Creates the session and mounts the pooled adapter for both schemes.
+        """
+
+        session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        if self.gzip:
+            session.headers["accept-encoding"] = "gzip, deflate"
+
+        session.headers["connection"] = "keep-alive"
+
+        return session
+
+    def get(self, url: str, headers: dict = None) -> requests.Response:
+        """
+        Sends a GET request through the pooled session. Requests that time
+        out, fail to connect or return a retryable status (e.g. 429) are
+        retried according to the retry_policy. The last response is returned
+        once the retries run out.
+        """
+
+        if headers is None:
+            headers = {}
+
+        self.instrumentation.set_current_endpoint(url)
+
+        if self.archive is not None and self.archive.replay:
+            return self.archive.get_response(url)
+
+        if not self.coalesce:
+            return self._get_cached(url, headers)
+
+        response, shared = self._single_flight.do(
+            _get_request_key(url, headers), lambda: self._get_cached(url, headers)
+        )
+
+        if shared:
+            self._update_stats(coalesced=1)
+
+        return response
+
+    def _get_cached(self, url: str, headers: dict) -> requests.Response:
+        """Sends the request through the HTTP cache and archive"""
+
+        # Requests that are already conditional are left to the caller
+        use_cache = (
+            self.http_cache is not None
+            and self.http_cache.should_cache(url)
+            and "if-none-match" not in headers
+            and "if-modified-since" not in headers
+        )
+
+        if use_cache:
+            conditional_headers = self.http_cache.get_conditional_headers(url)
+            response = self._get(url, {**headers, **conditional_headers})
+            response = self._use_http_cache(url, headers, response)
+        else:
+            response = self._get(url, headers)
+
+        if self.archive is not None:
+            self.archive.record(url, response)
+
+        return response
+
+    def _get(self, url: str, headers: dict) -> requests.Response:
+        attempt = 0
+        while True:
+            self._wait_for_rate_limiter(url)
+
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self.instrumentation.record_request(url, time.perf_counter() - start, 0)
+
+                if not self._should_retry(attempt):
+                    raise
+
+                self._backoff(url, attempt)
+                attempt += 1
+                continue
+
+            self.instrumentation.record_request(
+                url,
+                time.perf_counter() - start,
+                len(response.content),
+                response.status_code,
+            )
+
+            if self._should_retry(attempt, response.status_code):
+                if response.status_code == 429 and self.rate_limiter is not None:
+                    self.rate_limiter.on_throttled()
+
+                self._backoff(url, attempt, response.headers.get("retry-after"))
+                attempt += 1
+                continue
+
+            # Only a success recovers the rate. A 429 that ran out of retries
+            # keeps slowing it down.
+            if self.rate_limiter is not None:
+                if response.status_code == 429:
+                    self.rate_limiter.on_throttled()
+                elif response.status_code < 400:
+                    self.rate_limiter.on_success()
+
+            return response
+
+    def _use_http_cache(
+        self, url: str, headers: dict, response: requests.Response
+    ) -> requests.Response:
+        """
+        Swaps a 304 for the cached response or caches a new response.
+        """
+
+        if response.status_code == 304:
+            cached_response = self.http_cache.get_response(url)
+
+            if cached_response is not None:
+                return cached_response
+
+            # The cached response was evicted after the request was sent so
+            # it's requested again without the validators
+            response = self._get(url, headers)
+
+        self.http_cache.store(url, response)
+
+        return response
+
+    def _should_retry(self, attempt: int, status_code: int = None) -> bool:
+        if self.retry_policy is None:
+            return False
+
+        return self.retry_policy.should_retry(attempt, status_code)
+
+    def _wait_for_rate_limiter(self, url: str) -> None:
+        waited = 0.0
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire()
+
+        self._update_stats(requests=1, throttle_time=waited)
+        self.instrumentation.record_throttle(url, waited)
+
+    def _backoff(self, url: str, attempt: int, retry_after: str = None) -> None:
+        wait = self.retry_policy.get_wait(attempt, retry_after)
+        time.sleep(wait)
+
+        self._update_stats(retries=1, throttle_time=wait)
+        self.instrumentation.record_retry(url, wait)
+
+    def _update_stats(self, **increments) -> None:
+        with self._stats_lock:
+            for stat, increment in increments.items():
+                self.stats[stat] += increment
+
+    def record_decode(self, seconds: float, num_bytes: int) -> None:
+        """
+        Adds the time spent decoding a response to the stats and to the
+        endpoint of the last request sent by the calling thread.
+        """
+
+        self._update_stats(decode_time=seconds, decoded_bytes=num_bytes)
+        self.instrumentation.record_decode(seconds)
+
+    @property
+    def throttle_time(self) -> float:
+        """Seconds spent waiting on the rate limiter and retry backoffs"""
+
+        return self.stats["throttle_time"]
+
+    def close(self) -> None:
+        """Closes all pooled connections and the archive being recorded to"""
+
+        self.session.close()
+
+        if self.archive is not None:
+            self.archive.close()
+
+
+def _get_request_key(url: str, headers: dict) -> tuple:
+    """
+    Identifies requests that can share a response - the same url sent on
+    behalf of the same user. The token is hashed so it isn't kept around.
+    Conditional requests only share with identical conditional requests
+    since they can return a 304.
+    """
+
+    authorization = headers.get("authorization", headers.get("Authorization", ""))
+    identity = hashlib.sha1(authorization.encode("utf-8")).hexdigest()
+
+    conditions = (headers.get("if-none-match"), headers.get("if-modified-since"))
+
+    return url, identity, conditions
+
+
+_default_transport = None
+
+
+def get_default_transport() -> Transport:
+    """
+    Returns the process-wide Transport that's used when a scraper class
+    isn't passed one directly. It only has an HTTP cache if
+    UD_HTTP_CACHE_DIR is set.
+    """
+
+    global _default_transport
+
+    if _default_transport is None:
+        http_cache = None
+        if HTTP_CACHE_DIR != "":
+            http_cache = HTTPCache(HTTP_CACHE_DIR)
+
+        _default_transport = Transport(
+            rate_limiter=RateLimiter(),
+            retry_policy=RetryPolicy(),
+            http_cache=http_cache,
+        )
+
+    return _default_transport
+
+
+def set_default_transport(transport: Transport) -> None:
+    """
+    Replaces the process-wide Transport (e.g. to change pool sizes or timeouts
+    for a large harvest job).
+    """
+
+    global _default_transport
+
+    _default_transport = transport
@@ -0,0 +1,118 @@
+"""
+Module is responsible for caching slow-changing reference data (e.g. the
+contest styles catalog) in memory for the life of the process. Each entry
+keeps the validators (ETag / Last-Modified) of the response it was built from
+so an expired entry can be revalidated with a conditional request instead of
+pulled again.
+"""
+
+import threading
+import time
+
+
+class TTLCache:
+    def __init__(self, ttl: float = 3600):
+        """
+        Thread-safe cache where each entry is fresh for ttl seconds after it's
+        set (or revalidated).
+
+        Parameters
+        ----------
+        ttl : float, optional
+            Seconds an entry is fresh for, by default 3600.
+        """
+
+        self.ttl = ttl
+
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0}
+
+        self._entries = {}
+        self._revalidating = set()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns
+        -------
+        tuple or None
+            (value, validators, is_fresh) of the entry or None if the key
+            isn't cached.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            is_fresh = time.monotonic() < entry["expires_at"]
+            self.stats["hits" if is_fresh else "stale"] += 1
+
+            return entry["value"], entry["validators"], is_fresh
+
+    def set(self, key, value, validators: dict = None) -> None:
+        """
+        Caches the value. validators are the response headers used to
+        revalidate it e.g. {'etag': ..., 'last-modified': ...}.
+        """
+
+        if validators is None:
+            validators = {}
+
+        with self._lock:
+            self._entries[key] = {
+                "value": value,
+                "validators": validators,
+                "expires_at": time.monotonic() + self.ttl,
+            }
+            self._revalidating.discard(key)
+
+    def refresh(self, key) -> None:
+        """Marks the entry as fresh again after the API confirmed it's unchanged"""
+
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]["expires_at"] = time.monotonic() + self.ttl
+                self.stats["revalidated"] += 1
+
+            self._revalidating.discard(key)
+
+    def claim_revalidation(self, key) -> bool:
+        """
+        Returns True if the caller should revalidate the key. Only one caller
+        is given the key until it's set, refreshed or released.
+        """
+
+        with self._lock:
+            if key in self._revalidating:
+                return False
+
+            self._revalidating.add(key)
+
+            return True
+
+    def release_revalidation(self, key) -> None:
+        """Lets another caller revalidate the key (e.g. after a failed request)"""
+
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._revalidating = set()
+
+
+def get_conditional_headers(validators: dict) -> dict:
+    """Creates the headers of a conditional request from the cached validators"""
+
+    headers = {}
+
+    if validators.get("etag") is not None:
+        headers["if-none-match"] = validators["etag"]
+
+    if validators.get("last-modified") is not None:
+        headers["if-modified-since"] = validators["last-modified"]
+
+    return headers
@@ -0,0 +1,36 @@
+import pytest
+
+import UD_draft_model.scrapers.scrape_site.scrape_league_data as scrape_site
+from UD_draft_model.scrapers.scrape_site.mock_api import MockPayloads, MockUnderdogAPI
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+
+@pytest.fixture
+def payloads() -> MockPayloads:
+    """Payloads served by the api fixture. Override it to change their size."""
+
+    return MockPayloads(num_players=50)
+
+
+@pytest.fixture
+def api(payloads, monkeypatch):
+    """
+    Mock API that every scraper class created during the test sends its
+    requests to. The base urls are restored after the test.
+    """
+
+    with MockUnderdogAPI(payloads) as api:
+        monkeypatch.setattr(scrape_site.BaseData, "api_base_url", api.url)
+        monkeypatch.setattr(scrape_site.BaseData, "stats_base_url", api.url)
+
+        yield api
+
+
+@pytest.fixture
+def transport():
+    """Transport of its own so no state is shared with other tests"""
+
+    transport = Transport()
+    yield transport
+
+    transport.close()
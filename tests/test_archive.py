@@ -0,0 +1,51 @@
+import gzip
+
+from UD_draft_model.scrapers.scrape_site.archive import ResponseArchive
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+
+def get_urls(api) -> list:
+    draft_ids = api.payloads.draft_ids("completed")[:3]
+
+    return [f"{api.url}/v2/drafts/{draft_id}" for draft_id in draft_ids]
+
+
+def test_replay_serves_recorded_responses(api, tmp_path):
+    archive_path = str(tmp_path / "responses.ndjson.gz")
+    urls = get_urls(api)
+
+    transport = Transport(archive=ResponseArchive(archive_path))
+    recorded = [transport.get(url).json() for url in urls]
+    transport.close()
+
+    num_requests = api.stats["requests"]
+
+    transport = Transport(archive=ResponseArchive(archive_path, mode="replay"))
+    replayed = [transport.get(url).json() for url in urls]
+    transport.close()
+
+    assert replayed == recorded
+    assert api.stats["requests"] == num_requests
+
+
+def test_record_appends_one_gzip_member_per_run(api, tmp_path):
+    archive_path = str(tmp_path / "responses.ndjson.gz")
+    urls = get_urls(api)
+
+    archive = ResponseArchive(archive_path)
+    transport = Transport(archive=archive)
+    for url in urls:
+        transport.get(url)
+
+    # Readable before it's closed, e.g. if the run is interrupted
+    assert len(list(archive.iter_records())) == len(urls)
+
+    transport.close()
+
+    with open(archive_path, "rb") as f:
+        data = f.read()
+
+    # Each gzip member starts with the magic bytes and the deflate method
+    assert data.count(b"\x1f\x8b\x08") == 1
+    with gzip.open(archive_path, "rt") as f:
+        assert len(f.readlines()) == len(urls)
@@ -0,0 +1,127 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("selenium")
+
+from selenium.common.exceptions import TimeoutException
+
+import UD_draft_model.scrapers.scrape_ranks.backfill_ranks as backfill_ranks
+import UD_draft_model.scrapers.scrape_ranks.scrape_ranks as scrape_ranks
+
+
+def write_ranks(export_folder, date: str, **columns) -> str:
+    df = pd.DataFrame(
+        {
+            "player": ["Jonathan Taylor"],
+            "pos": ["RB"],
+            "team": ["IND"],
+            "adp": [1.5],
+            "rank": [1],
+            "date": [date],
+            **columns,
+        }
+    )
+
+    file_path = scrape_ranks.create_ranks_path(str(export_folder), date)
+    df.to_csv(file_path, index=False)
+
+    return file_path
+
+
+def test_valid_ranks_file(tmp_path):
+    file_path = write_ranks(tmp_path, "2022-09-06")
+
+    assert backfill_ranks.is_valid_ranks_file(file_path, "2022-09-06")
+    assert not backfill_ranks.is_valid_ranks_file(file_path, "2022-09-07")
+
+
+def test_invalid_ranks_files(tmp_path):
+    missing_path = scrape_ranks.create_ranks_path(str(tmp_path), "2022-09-01")
+
+    empty_path = tmp_path / "empty.csv"
+    empty_path.write_text("")
+
+    no_rows_path = tmp_path / "no_rows.csv"
+    no_rows_path.write_text(",".join(scrape_ranks.RANK_COLS + ["date"]) + "\n")
+
+    no_rank_path = write_ranks(tmp_path, "2022-09-02")
+    pd.read_csv(no_rank_path).drop(columns="rank").to_csv(no_rank_path, index=False)
+
+    for file_path, date in [
+        (missing_path, "2022-09-01"),
+        (str(empty_path), "2022-09-01"),
+        (str(no_rows_path), "2022-09-01"),
+        (no_rank_path, "2022-09-02"),
+    ]:
+        assert not backfill_ranks.is_valid_ranks_file(file_path, date)
+
+
+def test_manifest_round_trip(tmp_path):
+    assert backfill_ranks.read_manifest(str(tmp_path)) == {"done": [], "failed": {}}
+
+    manifest = {
+        "done": ["2022-09-06"],
+        "failed": {"2022-09-07": {"attempts": 1, "error": "TimeoutException()"}},
+    }
+    backfill_ranks.save_manifest(str(tmp_path), manifest)
+
+    assert backfill_ranks.read_manifest(str(tmp_path)) == manifest
+    assert sorted(p.name for p in tmp_path.iterdir()) == [backfill_ranks.MANIFEST_NAME]
+
+
+def test_corrupt_manifest_starts_over(tmp_path):
+    (tmp_path / backfill_ranks.MANIFEST_NAME).write_text('{"done": [')
+
+    assert backfill_ranks.read_manifest(str(tmp_path)) == {"done": [], "failed": {}}
+
+
+def test_select_pending_dates(tmp_path):
+    write_ranks(tmp_path, "2022-09-01")
+
+    manifest = {
+        # 2022-09-02's csv was deleted after it was exported
+        "done": ["2022-09-02"],
+        "failed": {
+            "2022-09-03": {"attempts": 3, "error": "TimeoutException()"},
+            "2022-09-04": {"attempts": 1, "error": "TimeoutException()"},
+        },
+    }
+    dates = scrape_ranks.create_date_list("2022-09-01", "2022-09-05")
+
+    pending = backfill_ranks.select_pending_dates(
+        dates, str(tmp_path), manifest, max_attempts=3
+    )
+
+    assert pending == ["2022-09-02", "2022-09-04", "2022-09-05"]
+    assert manifest["done"] == ["2022-09-01"]
+
+
+class FailingDriver:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def get(self, url):
+        raise self.error
+
+    def quit(self):
+        pass
+
+
+def test_export_date_records_browser_errors(tmp_path, monkeypatch):
+    driver = FailingDriver(TimeoutException("table didn't load"))
+    monkeypatch.setattr(backfill_ranks, "_get_driver", lambda: driver)
+
+    task = ("url", "2022-09-06", str(tmp_path), 400, True)
+    date, error = backfill_ranks._export_date(task)
+
+    assert date == "2022-09-06"
+    assert "TimeoutException" in error
+
+
+def test_export_date_raises_other_errors(tmp_path, monkeypatch):
+    driver = FailingDriver(ValueError("bug"))
+    monkeypatch.setattr(backfill_ranks, "_get_driver", lambda: driver)
+
+    task = ("url", "2022-09-06", str(tmp_path), 400, True)
+    with pytest.raises(ValueError, match="bug"):
+        backfill_ranks._export_date(task)
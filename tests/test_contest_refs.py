@@ -0,0 +1,51 @@
+import pytest
+
+import UD_draft_model.scrapers.scrape_site.scrape_league_data as scrape_site
+import UD_draft_model.scrapers.scrape_site.schemas as schemas
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+
+@pytest.fixture
+def refs(api, transport: Transport) -> scrape_site.ContestRefs:
+    scrape_site.ContestRefs.cache.clear()
+    yield scrape_site.ContestRefs({"user-agent": "test"}, transport=transport)
+    scrape_site.ContestRefs.cache.clear()
+
+
+def revalidate_contest_styles(refs: scrape_site.ContestRefs):
+    return refs._pull_df_cached(
+        refs.url_contest_styles,
+        "contest_styles",
+        schemas.CONTEST_STYLES,
+        revalidate=True,
+    )
+
+
+def test_revalidation_keeps_df_on_304(api, refs):
+    df = refs.create_df_contest_styles()
+
+    assert revalidate_contest_styles(refs).equals(df)
+    assert api.stats["not_modified"] == 1
+
+
+def test_revalidation_of_cleared_entry_pulls_again(api, refs):
+    df = refs.create_df_contest_styles()
+    scrape_site.ContestRefs.cache.clear()
+
+    assert revalidate_contest_styles(refs).equals(df)
+    assert api.stats["not_modified"] == 0
+
+
+def test_revalidation_survives_entry_cleared_during_request(api, refs, monkeypatch):
+    df = refs.create_df_contest_styles()
+
+    get = refs.transport.get
+
+    def clear_then_get(url, headers=None):
+        scrape_site.ContestRefs.cache.clear()
+        return get(url, headers=headers)
+
+    monkeypatch.setattr(refs.transport, "get", clear_then_get)
+
+    assert revalidate_contest_styles(refs).equals(df)
+    assert api.stats["not_modified"] == 1
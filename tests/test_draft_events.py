@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from UD_draft_model.scrapers.scrape_site.draft_events import (
+    DraftEventSource,
+    PollingEventSource,
+)
+from UD_draft_model.scrapers.scrape_site.mock_api import MockUnderdogAPI
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+
+def create_source(
+    api: MockUnderdogAPI, transport: Transport, idle_timeout: float, **kwargs
+) -> PollingEventSource:
+    draft_id = api.payloads.draft_ids("completed")[0]
+
+    return PollingEventSource(
+        draft_id,
+        {"user-agent": "test"},
+        interval=0.05,
+        transport=transport,
+        idle_timeout=idle_timeout,
+        **kwargs,
+    )
+
+
+def test_base_source_is_abstract():
+    with pytest.raises(TypeError):
+        DraftEventSource("draft")
+
+
+def test_source_stops_when_picks_arent_read(api, transport):
+    source = create_source(api, transport, idle_timeout=0.2).start()
+    time.sleep(0.5)
+
+    assert not source.running
+
+
+def test_source_runs_while_picks_are_read(api, transport):
+    source = create_source(api, transport, idle_timeout=0.2).start()
+
+    picks = []
+    for i in range(5):
+        picks += source.get_picks(timeout=0.1)
+
+    assert source.running
+    assert len(picks) > 0
+
+    source.stop()
+
+
+def test_source_stops_once_draft_is_complete(api, transport):
+    num_picks = api.payloads.num_teams * api.payloads.num_rounds
+    source = create_source(
+        api, transport, idle_timeout=None, num_picks=num_picks
+    ).start()
+
+    picks = source.get_picks(timeout=1)
+    time.sleep(0.2)
+
+    assert len(picks) == num_picks
+    assert source.complete
+    assert not source.running
+
+
+def test_source_backs_off_when_nothing_changes(api, transport):
+    source = create_source(api, transport, idle_timeout=None, max_interval=0.4)
+    source.start()
+    time.sleep(1)
+    source.stop()
+
+    # 0.05s apart with no backoff would be ~20 requests. Doubling from 0.1 up
+    # to 0.4 gives 5.
+    assert api.stats["requests"] <= 6
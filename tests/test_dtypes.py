@@ -0,0 +1,60 @@
+import gc
+
+import pandas as pd
+
+import UD_draft_model.scrapers.scrape_site.dtypes as dtypes
+import UD_draft_model.scrapers.scrape_site.scrape_league_data as scrape_site
+from UD_draft_model.scrapers.scrape_site.mock_api import MockUnderdogAPI
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+
+def create_drafts_detail(
+    api: MockUnderdogAPI, transport: Transport
+) -> scrape_site.DraftsDetail:
+    payloads = api.payloads
+
+    return scrape_site.DraftsDetail(
+        payloads.draft_ids("completed")[:2],
+        {"user-agent": "test"},
+        transport=transport,
+        dtype_policy=dtypes.DtypePolicy.for_slate(payloads.slate_id),
+    )
+
+
+def test_coded_picks_join_to_coded_entries(api, transport):
+    drafts_detail = create_drafts_detail(api, transport)
+
+    df_picks = drafts_detail.create_df_drafts()
+    df_entries = drafts_detail.create_df_draft_entries()
+
+    assert pd.api.types.is_integer_dtype(df_entries["id"])
+
+    df = pd.merge(
+        df_picks,
+        df_entries[["id", "pick_order"]],
+        how="left",
+        left_on="draft_entry_id",
+        right_on="id",
+    )
+    assert df["pick_order"].notna().all()
+
+
+def test_weekly_scores_are_compacted(api, transport):
+    df = create_drafts_detail(api, transport).create_df_weekly_scores()
+
+    assert isinstance(df["status"].dtype, pd.CategoricalDtype)
+
+
+def test_slate_id_dictionary_is_shared_while_used():
+    policy = dtypes.DtypePolicy.for_slate("slate")
+    codes = policy.id_dictionary.encode(["a", "b"])
+
+    assert dtypes.get_slate_id_dictionary("slate") is policy.id_dictionary
+    assert list(dtypes.DtypePolicy.for_slate("slate").id_dictionary.encode(["b"])) == [
+        codes[1]
+    ]
+
+    del policy
+    gc.collect()
+
+    assert "slate" not in dtypes._slate_id_dictionaries
@@ -0,0 +1,79 @@
+import os
+
+import pandas as pd
+import pytest
+
+import UD_draft_model.scrapers.scrape_site.harvest as harvest
+from UD_draft_model.scrapers.scrape_site.mock_api import MockPayloads
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+
+@pytest.fixture
+def payloads() -> MockPayloads:
+    return MockPayloads(num_drafts=12, num_players=50, page_size=5)
+
+
+def create_harvester(output_dir, transport: Transport) -> harvest.Harvester:
+    return harvest.Harvester(
+        {"user-agent": "test"},
+        output_dir=str(output_dir),
+        transport=transport,
+        batch_size=4,
+    )
+
+
+def test_harvest_resumes_after_failed_write(api, transport, tmp_path, monkeypatch):
+    # Not written by the harvester so it must be left alone
+    other_path = tmp_path / "other" / "part-00000.parquet"
+    other_path.parent.mkdir()
+    pd.DataFrame({"a": [1]}).to_parquet(other_path)
+
+    write_parquet = harvest._write_parquet
+    calls = []
+
+    def fail_third_part(df, file_path):
+        calls.append(file_path)
+        if len(calls) == 6:
+            raise OSError("disk full")
+
+        write_parquet(df, file_path)
+
+    monkeypatch.setattr(harvest, "_write_parquet", fail_third_part)
+
+    with pytest.raises(OSError, match="disk full"):
+        create_harvester(tmp_path, transport).harvest()
+
+    monkeypatch.setattr(harvest, "_write_parquet", write_parquet)
+
+    create_harvester(tmp_path, transport).harvest()
+    assert create_harvester(tmp_path, transport).harvest() == 0
+
+    df_league_info = harvest.read_harvest(str(tmp_path), "2022", "df_league_info")
+    num_drafts = (1 + api.payloads.num_tourney_rounds) * api.payloads.num_drafts
+
+    assert len(df_league_info) == num_drafts
+    assert df_league_info["id"].nunique() == num_drafts
+    assert os.path.exists(other_path)
+
+
+def test_harvest_resume_finds_drafts_added_to_the_lists(
+    api, transport, tmp_path, monkeypatch
+):
+    create_harvester(tmp_path, transport).harvest()
+
+    # New drafts are listed first so every earlier draft moves down the pages
+    draft_ids = api.payloads.draft_ids
+    monkeypatch.setattr(
+        api.payloads,
+        "draft_ids",
+        lambda source: [f"new-{source}-{i}" for i in range(3)] + draft_ids(source),
+    )
+
+    num_sources = 1 + api.payloads.num_tourney_rounds
+    assert create_harvester(tmp_path, transport).harvest() == 3 * num_sources
+
+    df_league_info = harvest.read_harvest(str(tmp_path), "2022", "df_league_info")
+    num_drafts = num_sources * (api.payloads.num_drafts + 3)
+
+    assert len(df_league_info) == num_drafts
+    assert df_league_info["id"].nunique() == num_drafts
@@ -0,0 +1,43 @@
+from UD_draft_model.scrapers.scrape_site.http_cache import HTTPCache
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+
+def test_cached_response_keeps_validators(api, tmp_path):
+    http_cache = HTTPCache(str(tmp_path))
+    transport = Transport(http_cache=http_cache, coalesce=False)
+    url = api.url + "/v1/teams"
+
+    response = transport.get(url)
+    cached_response = transport.get(url)
+
+    assert api.stats["not_modified"] == 1
+    assert cached_response.headers["etag"] == response.headers["etag"]
+    assert http_cache.stats["hits"] == 1
+    assert http_cache.stats["misses"] == 1
+
+
+def test_refetch_after_eviction_is_stored(api, tmp_path):
+    http_cache = HTTPCache(str(tmp_path))
+    transport = Transport(http_cache=http_cache, coalesce=False)
+    url = api.url + "/v1/teams"
+
+    transport.get(url)
+
+    # Evicts the response after the conditional request is sent
+    get = transport._get
+
+    def get_then_clear(url, headers):
+        response = get(url, headers)
+        http_cache.clear()
+        transport._get = get
+
+        return response
+
+    transport._get = get_then_clear
+
+    response = transport.get(url)
+
+    assert response.status_code == 200
+    assert http_cache.get_conditional_headers(url) == {
+        "if-none-match": response.headers["etag"]
+    }
@@ -0,0 +1,33 @@
+import pytest
+import requests
+
+from UD_draft_model.scrapers.scrape_site.json_decode import (
+    JSONDecodeError,
+    JSONDecoder,
+    get_available_backends,
+)
+
+
+def create_response(content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.encoding = "utf-8"
+
+    return response
+
+
+@pytest.mark.parametrize("backend", get_available_backends())
+@pytest.mark.parametrize("from_bytes", [True, False])
+@pytest.mark.parametrize("content", [b"<html><body>Forbidden</body></html>", b"\xff"])
+def test_invalid_body_raises_json_decode_error(backend, from_bytes, content):
+    decoder = JSONDecoder(backend, from_bytes=from_bytes)
+
+    with pytest.raises(JSONDecodeError):
+        decoder.decode(create_response(content))
+
+
+def test_valid_body():
+    decoder = JSONDecoder()
+
+    assert decoder.decode(create_response(b'{"a": [1]}')) == {"a": [1]}
@@ -0,0 +1,44 @@
+import pytest
+
+import UD_draft_model.scrapers.scrape_site.scrape_league_data as scrape_site
+import UD_draft_model.scrapers.scrape_site.schemas as schemas
+from UD_draft_model.scrapers.scrape_site.mock_api import MockUnderdogAPI
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+
+def create_refs(
+    api: MockUnderdogAPI, transport: Transport
+) -> scrape_site.ReferenceData:
+    payloads = api.payloads
+
+    return scrape_site.ReferenceData(
+        {"user-agent": "test"},
+        payloads.slate_id,
+        payloads.scoring_type_id,
+        transport=transport,
+    )
+
+
+def test_player_scores_columns(api, transport):
+    df = create_refs(api, transport).create_df_player_scores(1, 2)
+
+    expected = ["index"] + schemas.PLAYER_SCORES_COLUMNS + ["week_number"]
+    assert list(df.columns) == expected
+    assert sorted(df["week_number"].unique()) == [1, 2]
+
+
+def test_player_scores_empty_weeks(api, transport):
+    api.payloads.appearances = lambda week=None: {"appearances": []}
+
+    df = create_refs(api, transport).create_df_player_scores(1, 3)
+
+    assert len(df) == 0
+    assert list(df.columns) == (
+        ["index"] + schemas.PLAYER_SCORES_COLUMNS + ["week_number"]
+    )
+
+
+@pytest.mark.parametrize("first_week, last_week", [(0, 3), (5, 18), (4, 2)])
+def test_player_scores_invalid_weeks(api, transport, first_week, last_week):
+    with pytest.raises(ValueError):
+        create_refs(api, transport).create_df_player_scores(first_week, last_week)
@@ -0,0 +1,127 @@
+import json
+import time
+
+import pytest
+import requests
+
+pytest.importorskip("selenium")
+
+import UD_draft_model.scrapers.scrape_site.pull_bearer_token as pb
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+BEARER_TOKEN = "Bearer abc.def.ghi"
+USER_AGENT = "Mozilla/5.0"
+
+
+class FakeLogDriver:
+    def __init__(self, batches: list):
+        """
+        Stand-in for a webdriver that returns scripted performance log
+        entries. Each call to get_log returns the next batch, then empty
+        batches once they run out.
+        """
+
+        self.batches = list(batches)
+        self.calls = 0
+
+    def get_log(self, log_type: str) -> list:
+        self.calls += 1
+
+        if len(self.batches) == 0:
+            return []
+
+        return self.batches.pop(0)
+
+    def close(self) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
+
+def create_log_entry(method: str, params: dict) -> dict:
+    """Creates a performance log entry in the format Chrome logs them"""
+
+    message = json.dumps({"message": {"method": method, "params": params}})
+
+    return {"level": "INFO", "message": message, "timestamp": int(time.time() * 1000)}
+
+
+def create_request_entry(headers: dict) -> dict:
+    return create_log_entry(
+        "Network.requestWillBeSent",
+        {"request": {"url": "/v1/user", "headers": headers}},
+    )
+
+
+def test_capture_on_first_matching_batch():
+    driver = FakeLogDriver(
+        [
+            [
+                create_log_entry("Page.loadEventFired", {"timestamp": 1}),
+                create_request_entry(
+                    {"Authorization": BEARER_TOKEN, "User-Agent": USER_AGENT}
+                ),
+            ],
+            [create_request_entry({"user-agent": "later"})],
+        ]
+    )
+
+    capture = pb.capture_headers(driver, timeout=1, poll_interval=0.01)
+
+    assert capture.headers == {"authorization": BEARER_TOKEN, "user-agent": USER_AGENT}
+    assert driver.calls == 1
+
+
+def test_non_network_entries_are_skipped():
+    headers = {"authorization": BEARER_TOKEN, "user-agent": USER_AGENT}
+    logs = [
+        create_log_entry("Page.frameNavigated", {"headers": headers}),
+        create_log_entry("Runtime.consoleAPICalled", {"request": {"headers": headers}}),
+    ]
+
+    capture = pb.HeaderCapture()
+
+    assert not capture.feed(logs)
+    assert capture.stats == {"entries": 2, "parsed": 0}
+    assert capture.bearer_token is None
+
+
+def test_timeout_on_empty_logs():
+    with pytest.raises(pb.HeaderCaptureTimeout):
+        pb.capture_headers(FakeLogDriver([]), timeout=0.1, poll_interval=0.01)
+
+
+def test_pull_logs_keeps_entries(monkeypatch):
+    batches = [
+        [create_log_entry("Page.loadEventFired", {"timestamp": 1})],
+        [create_request_entry({"authorization": BEARER_TOKEN})],
+        [create_request_entry({"user-agent": USER_AGENT})],
+    ]
+    logs = [log for batch in batches for log in batch]
+
+    monkeypatch.setattr(pb, "create_webdriver", lambda *args: FakeLogDriver(batches))
+
+    assert pb.pull_logs("url", "chromedriver", "user", "password") == logs
+
+
+def test_pull_logs_timeout(monkeypatch):
+    monkeypatch.setattr(pb, "create_webdriver", lambda *args: FakeLogDriver([]))
+
+    with pytest.raises(pb.HeaderCaptureTimeout):
+        pb.pull_logs("url", "chromedriver", "user", "password", timeout=0.1)
+
+
+def test_headers_html_body(monkeypatch):
+    # The API sends back an HTML page when the user-agent is wrong
+    def get(self, url, headers=None):
+        response = requests.Response()
+        response.status_code = 403
+        response._content = b"<html><body>Forbidden</body></html>"
+        response.encoding = "utf-8"
+
+        return response
+
+    monkeypatch.setattr(Transport, "get", get)
+
+    assert not pb.test_headers({"user-agent": "wrong"})
@@ -0,0 +1,21 @@
+import UD_draft_model.scrapers.scrape_site.schemas as schemas
+from UD_draft_model.scrapers.scrape_site.mock_api import MockPayloads
+
+
+def test_appearances_column_order():
+    appearances = MockPayloads().appearances()["appearances"]
+
+    df = schemas.build_df(appearances, schemas.APPEARANCES)
+
+    assert list(df.columns) == [
+        "id",
+        "player_id",
+        "position_id",
+        "team_id",
+        "adp",
+        "season_projected_points",
+        "position_rank",
+    ]
+    assert df["season_projected_points"].iloc[0] == (
+        appearances[0]["projection"]["points"]
+    )
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import UD_draft_model.scrapers.scrape_ranks.scrape_ranks as scrape_ranks
+
+# First page of the ranks table of 2022-09-06, written with create_ranks_fixture
+PAGE_PATH = os.path.join(os.path.dirname(__file__), "data", "ranks_page.html")
+
+
+class FakeElement:
+    def clear(self):
+        pass
+
+    def send_keys(self, keys):
+        pass
+
+
+class FakeDriver:
+    def __init__(self, page_path: str):
+        with open(page_path) as f:
+            self.page_source = f.read()
+
+    def find_elements_by_class_name(self, name):
+        return [FakeElement(), FakeElement()]
+
+
+def test_extract_page_ranks_from_source():
+    df = scrape_ranks.extract_page_ranks_from_source(FakeDriver(PAGE_PATH))
+
+    assert list(df.columns) == scrape_ranks.RANK_COLS
+    assert len(df) == 20
+    assert df.iloc[0].tolist() == ["Jonathan Taylor", "RB", "IND", "1.5", "1"]
+
+
+def test_extract_day_ranks_from_source():
+    df = scrape_ranks.extract_day_ranks(
+        FakeDriver(PAGE_PATH), "2022-09-06", num_ranks=20, from_source=True
+    )
+
+    assert list(df.columns) == scrape_ranks.RANK_COLS + ["date"]
+    assert len(df) == 20
+    assert (df["date"] == "2022-09-06").all()
@@ -0,0 +1,64 @@
+import time
+
+import jwt
+import pytest
+
+pytest.importorskip("selenium")
+
+import UD_draft_model.scrapers.scrape_site.pull_bearer_token as pb
+import UD_draft_model.scrapers.scrape_site.token_cache as token_cache
+from UD_draft_model.scrapers.scrape_site.token_store import TokenStore
+
+
+def create_headers(expires_in: float) -> dict:
+    token = jwt.encode(
+        {"exp": int(time.time() + expires_in)},
+        "a-test-secret-that-is-at-least-32-bytes",
+    )
+
+    return {"authorization": "Bearer " + token, "user-agent": "test"}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> TokenStore:
+    store = TokenStore(str(tmp_path / "token.json"))
+    monkeypatch.setattr(token_cache, "get_token_store", lambda: store)
+
+    return store
+
+
+@pytest.fixture
+def pulls(monkeypatch) -> list:
+    pulls = []
+
+    def pull_required_headers(url, chromedriver_path, username, password):
+        pulls.append(username)
+        return create_headers(expires_in=3600)
+
+    monkeypatch.setattr(pb, "pull_required_headers", pull_required_headers)
+
+    return pulls
+
+
+def test_expired_token_is_replaced_from_the_store(store, pulls):
+    cache = token_cache.TokenCache()
+
+    store.set("user", create_headers(expires_in=-60))
+    cache.get_headers("user", "password", "chromedriver")
+    assert pulls == ["user"]
+
+    # e.g. another process refreshed the token after this one cached it
+    cache._headers["user"] = create_headers(expires_in=-60)
+    saved_headers = create_headers(expires_in=3600)
+    store.set("user", saved_headers)
+
+    assert cache.get_headers("user", "password", "chromedriver") == saved_headers
+    assert pulls == ["user"]
+
+
+def test_expired_token_in_the_store_is_pulled_again(store, pulls):
+    store.set("user", create_headers(expires_in=-60))
+
+    token_cache.TokenCache().get_headers("user", "password", "chromedriver")
+
+    assert pulls == ["user"]
@@ -0,0 +1,64 @@
+from UD_draft_model.scrapers.scrape_site.token_store import TokenStore
+
+
+def test_get_sees_tokens_saved_by_another_store(tmp_path):
+    path = str(tmp_path / "token.json")
+    store = TokenStore(path)
+    other_store = TokenStore(path)
+
+    store.set("user", {"authorization": "Bearer old"})
+    assert store.get("user") == {"authorization": "Bearer old"}
+
+    # e.g. another app process refreshing the token
+    other_store.set("user", {"authorization": "Bearer new"})
+
+    assert store.get("user") == {"authorization": "Bearer new"}
+
+
+def test_get_only_reads_the_file_when_it_changes(tmp_path):
+    store = TokenStore(str(tmp_path / "token.json"))
+    store.set("user", {"authorization": "Bearer token"})
+
+    disk_reads = store.stats["disk_reads"]
+    for i in range(3):
+        store.get("user")
+
+    assert store.stats["disk_reads"] == disk_reads
+
+
+def test_set_removes_stale_temp_files(tmp_path):
+    path = tmp_path / "token.json"
+    stale_path = tmp_path / "token.json.1234.5678.tmp"
+    stale_path.write_text("{")
+
+    TokenStore(str(path)).set("user", {"authorization": "Bearer token"})
+
+    assert not stale_path.exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "token.json",
+        "token.json.lock",
+    ]
+
+
+def test_migrate_copies_legacy_tokens(tmp_path):
+    legacy_path = tmp_path / "bearer_token" / "token.json"
+    legacy_path.parent.mkdir()
+    legacy_path.write_text('{"user": {"authorization": "Bearer old"}}')
+
+    store = TokenStore(str(tmp_path / "cache" / "token.json"))
+
+    assert store.migrate(str(legacy_path))
+    assert store.get("user") == {"authorization": "Bearer old"}
+    assert legacy_path.exists()
+
+
+def test_migrate_keeps_existing_tokens(tmp_path):
+    legacy_path = tmp_path / "legacy.json"
+    legacy_path.write_text('{"user": {"authorization": "Bearer old"}}')
+
+    store = TokenStore(str(tmp_path / "token.json"))
+    store.set("user", {"authorization": "Bearer new"})
+
+    assert not store.migrate(str(legacy_path))
+    assert not store.migrate(str(tmp_path / "missing.json"))
+    assert store.get("user") == {"authorization": "Bearer new"}
@@ -0,0 +1,46 @@
+from UD_draft_model.scrapers.scrape_site.mock_api import MockPayloads, MockUnderdogAPI
+from UD_draft_model.scrapers.scrape_site.rate_limit import RateLimiter, RetryPolicy
+from UD_draft_model.scrapers.scrape_site.transport import Transport
+
+
+def create_transport(rate_limiter: RateLimiter, max_retries: int) -> Transport:
+    return Transport(
+        rate_limiter=rate_limiter,
+        retry_policy=RetryPolicy(max_retries=max_retries, backoff_factor=0.01),
+        coalesce=False,
+    )
+
+
+def test_exhausted_throttle_slows_rate():
+    rate_limiter = RateLimiter(rate=100, recovery=10)
+    transport = create_transport(rate_limiter, max_retries=1)
+
+    with MockUnderdogAPI(MockPayloads(), throttle_rate=1.0, retry_after=0) as api:
+        response = transport.get(api.url + "/v1/teams")
+
+    assert response.status_code == 429
+    assert rate_limiter.rate == 25
+
+
+def test_exhausted_server_error_does_not_recover_rate():
+    rate_limiter = RateLimiter(rate=100, recovery=10)
+    rate_limiter.rate = 50
+    transport = create_transport(rate_limiter, max_retries=1)
+
+    with MockUnderdogAPI(MockPayloads(), error_rate=1.0) as api:
+        response = transport.get(api.url + "/v1/teams")
+
+    assert response.status_code == 503
+    assert rate_limiter.rate == 50
+
+
+def test_success_recovers_rate():
+    rate_limiter = RateLimiter(rate=100, recovery=10)
+    rate_limiter.rate = 50
+    transport = create_transport(rate_limiter, max_retries=1)
+
+    with MockUnderdogAPI(MockPayloads()) as api:
+        response = transport.get(api.url + "/v1/teams")
+
+    assert response.status_code == 200
+    assert rate_limiter.rate == 60